@@ -0,0 +1,107 @@
+"""
+Benchmark of the speech codecs clients can negotiate.
+
+Prepares the same sentence in every transport and codec combination, the way
+`TTSTaskManager` does for a client, and reports the size of the WebSocket
+message per second of speech and the CPU time spent preparing it (decoding,
+encoding and the volume envelope) per second of speech.
+
+Usage:
+    uv run python scripts/benchmark_audio_codecs.py --seconds 6 --repeat 20
+    uv run python scripts/benchmark_audio_codecs.py --audio path/to/speech.wav
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.tts.tts_interface import TTSAudio
+from src.open_llm_vtuber.utils.stream_audio import (
+    AudioStreamFormat,
+    load_audio,
+    opus_available,
+    prepare_audio_frame,
+    prepare_audio_payload,
+)
+
+
+def make_speech_like_audio(seconds: float, sample_rate: int) -> TTSAudio:
+    """A 16 bit mono voiced signal with syllables, pauses and some noise"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 180 * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    pauses = (np.sin(2 * np.pi * 0.4 * t) > -0.8).astype(float)
+    signal = voiced * syllables * pauses + 0.01 * rng.standard_normal(len(t))
+    samples = (signal / np.abs(signal).max() * 20000).astype("<i2")
+    return TTSAudio(samples=samples, sample_rate=sample_rate)
+
+
+def message_size(message) -> int:
+    if isinstance(message, bytes):
+        return len(message)
+    return len(json.dumps(message).encode("utf-8"))
+
+
+def main(audio_file: str, seconds: float, sample_rate: int, repeat: int, bitrate: int):
+    audio = audio_file or make_speech_like_audio(seconds, sample_rate)
+    segment = load_audio(audio)
+    duration = len(segment) / 1000
+    print(
+        f"{duration:.1f}s of {segment.frame_rate} Hz speech, "
+        f"{segment.channels} channel(s), Opus at {bitrate} kbit/s"
+    )
+
+    formats = [("json", "wav"), ("binary", "pcm"), ("binary", "wav")]
+    if opus_available():
+        formats += [("json", "opus"), ("binary", "opus")]
+    else:
+        print("libsndfile cannot encode Opus, skipping the opus codec")
+
+    baseline = None
+    for transport, codec in formats:
+        audio_format = AudioStreamFormat(
+            transport=transport, codec=codec, bitrate_kbps=bitrate
+        )
+        if audio_format.is_binary:
+
+            def prepare():
+                return prepare_audio_frame(audio, audio_format=audio_format)
+        else:
+
+            def prepare():
+                return prepare_audio_payload(audio, audio_format=audio_format)
+
+        size = message_size(prepare())
+        start = time.process_time()
+        for _ in range(repeat):
+            prepare()
+        cpu = (time.process_time() - start) / repeat
+
+        baseline = baseline or size
+        print(
+            f"{transport + '/' + codec:>12}: {size / duration / 1000:8.1f} kB/s of "
+            f"speech ({size / baseline:5.1%} of json/wav), "
+            f"{cpu / duration * 1000:6.2f} ms CPU per second of speech"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speech codec benchmark")
+    parser.add_argument("--audio", help="Audio file to use instead of a test signal")
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bitrate", type=int, default=32, help="Opus kbit/s")
+    args = parser.parse_args()
+    main(args.audio, args.seconds, args.sample_rate, args.repeat, args.bitrate)
@@ -0,0 +1,86 @@
+"""
+Benchmark of appending messages to a chat history.
+
+Stores messages one by one into a single history with `store_message`, in a
+temporary `chat_history` directory, and reports the mean time per append for
+every block of messages. Each message is appended to the JSONL file as one
+record and the history index is updated in place, so the time per append
+should stay flat as the history grows instead of growing with its length.
+
+Usage:
+    uv run python scripts/benchmark_chat_history.py
+    uv run python scripts/benchmark_chat_history.py --messages 100000 --block 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber import chat_history_manager
+
+MESSAGES = [
+    "Hi! How was your day?",
+    "Pretty good, I finished the new song and recorded a short demo of it.",
+    "That sounds great, can you tell me a bit more about it?",
+    "It is a slow ballad about the sea, with a piano intro and soft strings.",
+]
+
+
+def main(num_messages: int, block: int) -> None:
+    # Only warnings, the debug line of every append would dominate the timing
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The history manager stores everything under ./chat_history
+        os.chdir(directory)
+        try:
+            conf_uid = "benchmark"
+            history_uid = chat_history_manager.create_new_history(conf_uid)
+
+            first_mean = None
+            for block_start in range(0, num_messages, block):
+                block_end = min(block_start + block, num_messages)
+                start = time.perf_counter()
+                for index in range(block_start, block_end):
+                    chat_history_manager.store_message(
+                        conf_uid,
+                        history_uid,
+                        "human" if index % 2 == 0 else "ai",
+                        MESSAGES[index % len(MESSAGES)],
+                    )
+                elapsed = time.perf_counter() - start
+                mean_us = elapsed / (block_end - block_start) * 1e6
+                first_mean = first_mean or mean_us
+                print(
+                    f"messages {block_start + 1:>7}-{block_end:<7}: "
+                    f"{mean_us:7.1f} us per append "
+                    f"({mean_us / first_mean:4.2f}x the first block)"
+                )
+
+            history_path = chat_history_manager._resolve_history_path(
+                conf_uid, history_uid
+            )
+            entry = chat_history_manager.get_history_list(conf_uid)[0]
+            print(
+                f"History file: {os.path.getsize(history_path) / 1e6:.1f} MB, "
+                f"latest message in the index: {entry['latest_message']['content']!r}"
+            )
+        finally:
+            os.chdir(project_root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat history append benchmark")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--block", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.messages, args.block)
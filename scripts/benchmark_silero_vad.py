@@ -0,0 +1,138 @@
+"""
+Benchmark of the Silero VAD detection path.
+
+Feeds the same audio in microphone-sized chunks through two paths on a single
+core (`torch.set_num_threads(1)`):
+
+- the previous path: one `torch.Tensor` and one call of the JIT model per
+  512 sample window, with the level and the int16 bytes computed per window
+- `VADEngine.detect_speech`: the model batched over all windows of a chunk,
+  only its LSTM cell stepping window by window
+
+It reports windows per second per core and checks that both paths yield the
+same speech segments.
+
+Usage:
+    uv run python scripts/benchmark_silero_vad.py --seconds 30 --chunk 4096
+    uv run python scripts/benchmark_silero_vad.py --audio path/to/speech.wav
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.stream_audio import load_audio
+from src.open_llm_vtuber.vad.silero import StateMachine, VADEngine
+
+
+def make_speech_like_audio(seconds: float, sample_rate: int) -> np.ndarray:
+    """Float mono voiced signal with syllables, long pauses and some noise"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 180 * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    pauses = (np.sin(2 * np.pi * 0.2 * t) > -0.3).astype(float)
+    signal = voiced * syllables * pauses + 0.005 * rng.standard_normal(len(t))
+    return (0.5 * signal / np.abs(signal).max()).astype(np.float32)
+
+
+def read_audio(path: str, sample_rate: int) -> np.ndarray:
+    segment = load_audio(path).set_channels(1).set_frame_rate(sample_rate)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    return samples / float(1 << (8 * segment.sample_width - 1))
+
+
+def per_window_detect_speech(engine: VADEngine, audio_data: list[float]):
+    """The detection loop before batching, for comparison"""
+    audio_np = np.array(audio_data, dtype=np.float32)
+    for i in range(0, len(audio_np), engine.window_size_samples):
+        chunk_np = audio_np[i : i + engine.window_size_samples]
+        if len(chunk_np) < engine.window_size_samples:
+            break
+        with torch.no_grad():
+            speech_prob = engine.model(
+                torch.Tensor(chunk_np), engine.config.target_sr
+            ).item()
+        if speech_prob:
+            int_chunk_np = chunk_np * 32767
+            chunk_bytes = int_chunk_np.astype(np.int16).tobytes()
+            db = StateMachine.calculate_db(int_chunk_np)
+            for _, _, chunk in engine.state.get_result(speech_prob, db, chunk_bytes):
+                yield bytes(chunk)
+
+
+def reset(engine: VADEngine) -> None:
+    engine.model.reset_states()
+    engine.reset_states()
+    engine.state = StateMachine(engine.config)
+
+
+def run_path(name: str, engine: VADEngine, detect, chunks, windows, seconds):
+    # Warm up (JIT profiling runs) outside of the measurement
+    for chunk in chunks[:4]:
+        list(detect(chunk))
+    reset(engine)
+
+    outputs = []
+    start = time.process_time()
+    for chunk in chunks:
+        outputs.extend(detect(chunk))
+    cpu = time.process_time() - start
+    segments = sum(1 for out in outputs if out not in (b"<|PAUSE|>", b"<|RESUME|>"))
+    print(
+        f"{name:>10}: {windows / cpu:8.0f} windows/s per core, "
+        f"{seconds / cpu:6.1f}x real time, {segments} speech segments"
+    )
+    return outputs
+
+
+def main(audio_file: str, seconds: float, sample_rate: int, chunk_size: int):
+    torch.set_num_threads(1)
+    if audio_file:
+        audio = read_audio(audio_file, sample_rate)
+    else:
+        audio = make_speech_like_audio(seconds, sample_rate)
+    chunks = [
+        audio[i : i + chunk_size].tolist() for i in range(0, len(audio), chunk_size)
+    ]
+
+    engine = VADEngine(orig_sr=sample_rate, target_sr=sample_rate)
+    windows = sum(len(chunk) // engine.window_size_samples for chunk in chunks)
+    seconds = len(audio) / sample_rate
+    print(
+        f"{seconds:.1f}s of audio at {sample_rate} Hz in chunks of {chunk_size} "
+        f"samples, {windows} windows of {engine.window_size_samples} samples"
+    )
+
+    previous = run_path(
+        "per window",
+        engine,
+        lambda chunk: per_window_detect_speech(engine, chunk),
+        chunks,
+        windows,
+        seconds,
+    )
+    batched = run_path(
+        "batched", engine, engine.detect_speech, chunks, windows, seconds
+    )
+    print(f"Identical output: {previous == batched}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Silero VAD benchmark")
+    parser.add_argument("--audio", help="Audio file to use instead of a test signal")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--sample-rate", type=int, default=16000, choices=[8000, 16000])
+    parser.add_argument("--chunk", type=int, default=4096, help="Samples per chunk")
+    args = parser.parse_args()
+    main(args.audio, args.seconds, args.sample_rate, args.chunk)
@@ -0,0 +1,123 @@
+"""
+Benchmark of streaming transcription against transcribing whole utterances.
+
+Takes the ASR engine configured in conf.yaml with `streaming` turned on and
+feeds it the voice clips of the Haru model in microphone-sized chunks, each
+followed by the silence the VAD waits for before it ends an utterance. For
+every clip it reports how long the final transcription took after the last
+chunk (`ASRStream.finalize`), which is the delay left once the user stopped
+speaking, next to the time `transcribe_np` takes for the whole utterance, as
+before. It also reports the slowest `feed`, which has to stay under the
+chunk duration for the partial transcriptions to keep up with the speech.
+
+Only faster_whisper and sherpa_onnx_asr (transducer or paraformer models) can
+stream.
+
+Usage:
+    uv run python scripts/benchmark_streaming_asr.py
+    uv run python scripts/benchmark_streaming_asr.py --config conf.yaml --chunk 0.256
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.asr.asr_factory import ASRFactory
+from src.open_llm_vtuber.asr.asr_interface import ASRInterface
+from src.open_llm_vtuber.config_manager.utils import read_yaml, validate_config
+from src.open_llm_vtuber.utils.stream_audio import load_audio
+
+SAMPLE_RATE = ASRInterface.SAMPLE_RATE
+CLIPS = os.path.join(
+    project_root, "live2d-models", "Haru", "runtime", "sounds", "*.wav"
+)
+# required_misses of the Silero VAD, 24 windows of 32 ms
+VAD_END_SILENCE_SECONDS = 0.768
+
+
+def load_utterances() -> list:
+    """The Haru clips as 16 kHz float mono, with the silence ending them"""
+    silence = np.zeros(int(VAD_END_SILENCE_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    utterances = []
+    for path in sorted(glob.glob(CLIPS)):
+        segment = load_audio(path).set_channels(1).set_frame_rate(SAMPLE_RATE)
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+        samples /= float(1 << (8 * segment.sample_width - 1))
+        audio = np.concatenate([samples, silence])
+        utterances.append((os.path.basename(path), audio))
+    return utterances
+
+
+def stream_utterance(engine: ASRInterface, audio: np.ndarray, chunk: int):
+    """Feed an utterance chunk by chunk, timing the slowest feed and finalize"""
+    stream = engine.start_stream()
+    slowest_feed = 0.0
+    for start in range(0, len(audio), chunk):
+        begin = time.perf_counter()
+        stream.feed(audio[start : start + chunk])
+        slowest_feed = max(slowest_feed, time.perf_counter() - begin)
+    begin = time.perf_counter()
+    text = stream.finalize()
+    return text, time.perf_counter() - begin, slowest_feed
+
+
+def main(config_path: str, chunk_seconds: float) -> None:
+    asr_config = validate_config(read_yaml(config_path)).character_config.asr_config
+    engine_config = getattr(asr_config, asr_config.asr_model).model_dump()
+    engine_config["streaming"] = True
+    engine = ASRFactory.get_asr_system(asr_config.asr_model, **engine_config)
+    if engine.start_stream() is None:
+        logger.error(f"{asr_config.asr_model} cannot stream")
+        sys.exit(1)
+
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    utterances = load_utterances()
+    logger.info(
+        f"Benchmarking {asr_config.asr_model}: {len(utterances)} utterances "
+        f"in chunks of {chunk_seconds * 1000:.0f} ms"
+    )
+
+    # Warm up, so model loading is not part of the measurement
+    engine.transcribe_np(utterances[0][1])
+    stream_utterance(engine, utterances[0][1], chunk)
+
+    finals, wholes = [], []
+    for name, audio in utterances:
+        text, final, slowest_feed = stream_utterance(engine, audio, chunk)
+        begin = time.perf_counter()
+        whole_text = engine.transcribe_np(audio)
+        whole = time.perf_counter() - begin
+        finals.append(final)
+        wholes.append(whole)
+        if text.strip() != whole_text.strip():
+            text = f"{text.strip()!r} vs {whole_text.strip()!r}"
+        logger.info(
+            f"{name}: {len(audio) / SAMPLE_RATE:.1f}s, final after "
+            f"{final * 1000:.0f} ms (whole utterance {whole * 1000:.0f} ms), "
+            f"slowest feed {slowest_feed * 1000:.0f} ms | {text.strip()}"
+        )
+
+    logger.info(
+        f"Mean delay after the end of speech: streaming "
+        f"{np.mean(finals) * 1000:.0f} ms, whole utterance "
+        f"{np.mean(wholes) * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming ASR latency benchmark")
+    parser.add_argument("--config", default=os.path.join(project_root, "conf.yaml"))
+    parser.add_argument(
+        "--chunk", type=float, default=0.256, help="Seconds of audio per feed"
+    )
+    args = parser.parse_args()
+    main(args.config, args.chunk)
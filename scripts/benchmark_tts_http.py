@@ -0,0 +1,143 @@
+"""
+Benchmark of the HTTP transport of API-based TTS engines.
+
+Starts a local stub of the XTTS API server (`/tts_to_audio`) that answers
+every request with a short WAV after a fixed delay, then synthesizes the
+same sentences with the x_tts engine twice:
+
+- the previous path: blocking `requests` calls in `asyncio.to_thread`,
+  one new connection per sentence
+- the shared `httpx.AsyncClient` with keep-alive, natively async
+
+It reports per-sentence latency, how many connections the stub server
+accepted and how many jobs went to the default thread pool.
+
+Usage:
+    uv run python scripts/benchmark_tts_http.py --sentences 50 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.tts.http_client import close_http_clients
+from src.open_llm_vtuber.tts.x_tts import TTSEngine as XTTSEngine
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Default executor that counts the jobs submitted to it"""
+
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        CountingExecutor.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def make_wav(seconds: float = 1.0, sample_rate: int = 24000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\0\0" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+async def start_stub_server(port: int, delay: float) -> tuple[web.AppRunner, dict]:
+    """Run a fake XTTS server, counting the connections it accepts"""
+    audio = make_wav()
+    stats = {"connections": set()}
+
+    async def tts_to_audio(request: web.Request) -> web.Response:
+        # Every connection has its own client port
+        stats["connections"].add(request.transport.get_extra_info("peername"))
+        await request.json()
+        await asyncio.sleep(delay)
+        return web.Response(body=audio, content_type="audio/wav")
+
+    app = web.Application()
+    app.router.add_post("/tts_to_audio", tts_to_audio)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    return runner, stats
+
+
+async def run_path(name: str, synthesize, sentences: list, concurrency: int, stats):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text: str) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            audio = await synthesize(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert audio is not None
+
+    # Warm up (client creation, imports) outside of the measurement
+    await synthesize(sentences[0])
+    stats["connections"].clear()
+    CountingExecutor.submitted = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in sentences))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    logger.info(
+        f"{name:>16}: {len(sentences)} sentences in {elapsed:.2f}s, latency median "
+        f"{statistics.median(latencies):.1f} ms, p95 "
+        f"{latencies[int(len(latencies) * 0.95) - 1]:.1f} ms, "
+        f"{len(stats['connections'])} connections, "
+        f"{CountingExecutor.submitted} thread pool jobs"
+    )
+
+
+async def main(sentences: int, concurrency: int, delay: float, port: int):
+    asyncio.get_running_loop().set_default_executor(CountingExecutor())
+    runner, stats = await start_stub_server(port, delay)
+    engine = XTTSEngine(api_url=f"http://127.0.0.1:{port}/tts_to_audio")
+    engine.max_concurrency = concurrency
+    texts = [f"This is test sentence number {i}." for i in range(sentences)]
+
+    try:
+        await run_path(
+            "requests+thread",
+            lambda text: asyncio.to_thread(engine.generate_audio_data, text),
+            texts,
+            concurrency,
+            stats,
+        )
+        await run_path(
+            "httpx async",
+            engine.async_generate_audio_data,
+            texts,
+            concurrency,
+            stats,
+        )
+    finally:
+        await close_http_clients()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TTS HTTP transport benchmark")
+    parser.add_argument("--sentences", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.02, help="Stub server delay")
+    parser.add_argument("--port", type=int, default=18020)
+    args = parser.parse_args()
+    asyncio.run(main(args.sentences, args.concurrency, args.delay, args.port))
@@ -0,0 +1,110 @@
+"""
+Benchmark of the TTS execution backends.
+
+Synthesizes the same sentences with the TTS engine configured in conf.yaml,
+once through the default thread path (`asyncio.to_thread`) and once through
+the worker process pool, and reports sentences per second and how late a
+10 ms timer on the event loop fires while synthesis is running. The lag is
+what the web server and the VAD loop experience under TTS load.
+
+Usage:
+    uv run python scripts/benchmark_tts_process_pool.py --workers 4 --sentences 40
+    uv run python scripts/benchmark_tts_process_pool.py --config conf.yaml --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from loguru import logger
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.config_manager.utils import read_yaml, validate_config
+from src.open_llm_vtuber.tts.tts_factory import TTSFactory
+from src.open_llm_vtuber.tts.tts_interface import TTSInterface
+from src.open_llm_vtuber.tts.tts_process_pool import ProcessPoolTTSEngine
+
+SENTENCES = [
+    "Hello there, it is nice to see you again.",
+    "The weather today is calm, with a light breeze from the west.",
+    "Let me think about that for a second.",
+    "That is a really interesting question.",
+    "I have been practicing a new song all week.",
+    "Thanks for staying with the stream tonight!",
+]
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> list:
+    """Record how late a periodic timer fires, in milliseconds"""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+    return lags
+
+
+async def run_backend(
+    name: str, engine: TTSInterface, sentences: list, concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def synthesize(text: str) -> bool:
+        async with semaphore:
+            return await engine.async_generate_audio_data(text) is not None
+
+    # Warm up, so model loading is not part of the measurement
+    await asyncio.gather(*(synthesize(text) for text in SENTENCES[:concurrency]))
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(synthesize(text) for text in sentences))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = sorted(await lag_task)
+
+    logger.info(
+        f"{name:>8}: {sum(results)}/{len(sentences)} sentences in {elapsed:.2f}s "
+        f"({len(sentences) / elapsed:.2f}/s), loop lag mean "
+        f"{statistics.mean(lags):.1f} ms, p95 {lags[int(len(lags) * 0.95) - 1]:.1f} ms, "
+        f"max {lags[-1]:.1f} ms"
+    )
+
+
+async def main(config_path: str, sentences: int, workers: int, concurrency: int):
+    tts_config = validate_config(read_yaml(config_path)).character_config.tts_config
+    engine_config = getattr(tts_config, tts_config.tts_model.lower()).model_dump()
+    texts = [SENTENCES[i % len(SENTENCES)] + f" ({i})" for i in range(sentences)]
+    logger.info(
+        f"Benchmarking {tts_config.tts_model}: {sentences} sentences, "
+        f"{concurrency} at a time, {workers} worker processes"
+    )
+
+    thread_engine = TTSFactory.get_tts_engine(tts_config.tts_model, **engine_config)
+    await run_backend("threads", thread_engine, texts, concurrency)
+    del thread_engine
+
+    pool_engine = ProcessPoolTTSEngine(
+        tts_config.tts_model, engine_config, workers=workers
+    )
+    try:
+        await run_backend("processes", pool_engine, texts, concurrency)
+    finally:
+        pool_engine.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TTS thread vs process benchmark")
+    parser.add_argument("--config", default=os.path.join(project_root, "conf.yaml"))
+    parser.add_argument("--sentences", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.config, args.sentences, args.workers, args.concurrency))
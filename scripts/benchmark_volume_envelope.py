@@ -0,0 +1,78 @@
+"""
+Micro-benchmark for the lip-sync volume envelope.
+
+Compares the NumPy envelope used by `prepare_audio_payload` against the
+previous implementation, which built one pydub AudioSegment per chunk with
+`make_chunks` and read `.rms` on each of them.
+
+Usage:
+    uv run python scripts/benchmark_volume_envelope.py --seconds 8 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.utils import make_chunks
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.stream_audio import _get_volume_by_chunks
+
+
+def pydub_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
+    """The previous implementation, kept here as the baseline"""
+    chunks = make_chunks(audio, chunk_length_ms)
+    volumes = [chunk.rms for chunk in chunks]
+    max_volume = max(volumes)
+    return [volume / max_volume for volume in volumes]
+
+
+def make_speech_like_audio(seconds: float, sample_rate: int) -> AudioSegment:
+    """A 16 bit mono tone with a syllable-like amplitude envelope"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    samples = (np.sin(2 * np.pi * 220 * t) * envelope * 20000).astype("<i2")
+    return AudioSegment(
+        samples.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1
+    )
+
+
+def main(seconds: float, sample_rate: int, chunk_length_ms: int, repeat: int):
+    audio = make_speech_like_audio(seconds, sample_rate)
+
+    baseline = pydub_volume_by_chunks(audio, chunk_length_ms)
+    vectorized = _get_volume_by_chunks(audio, chunk_length_ms)
+    max_error = max(abs(a - b) for a, b in zip(baseline, vectorized))
+    print(
+        f"{seconds}s of {sample_rate} Hz audio, {len(vectorized)} chunks of "
+        f"{chunk_length_ms} ms (same count: {len(baseline) == len(vectorized)}, "
+        f"max difference {max_error:.2e})"
+    )
+
+    results = {}
+    for name, func in [
+        ("pydub make_chunks", pydub_volume_by_chunks),
+        ("numpy envelope", _get_volume_by_chunks),
+    ]:
+        total = timeit.timeit(lambda: func(audio, chunk_length_ms), number=repeat)
+        results[name] = total / repeat * 1000
+        print(f"{name:>18}: {results[name]:8.3f} ms per sentence")
+
+    speedup = results["pydub make_chunks"] / results["numpy envelope"]
+    print(f"{'speedup':>18}: {speedup:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Volume envelope micro-benchmark")
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--chunk-length-ms", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.seconds, args.sample_rate, args.chunk_length_ms, args.repeat)
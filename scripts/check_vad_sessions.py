@@ -0,0 +1,128 @@
+"""
+Check that concurrent VAD sessions segment speech independently.
+
+Creates N sessions on one Silero VAD model with `VADEngine.new_session()` and
+feeds N different speech streams, made of the voice clips of the Haru model,
+to them interleaved: a chunk of one stream after a chunk of the next, the way
+the server receives microphone audio from several clients. Every stream has
+to come out with exactly the speech segments it gets when it runs alone. The
+same streams are then fed to one shared engine, as every session used
+before, to show the corruption.
+
+Exits with status 1 if a session's segments differ from its solo run.
+
+Usage:
+    uv run python scripts/check_vad_sessions.py --streams 8 --seconds 20
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path to enable imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from src.open_llm_vtuber.utils.stream_audio import load_audio
+from src.open_llm_vtuber.vad.silero import VADEngine
+
+SAMPLE_RATE = 16000
+CLIPS = os.path.join(
+    project_root, "live2d-models", "Haru", "runtime", "sounds", "*.wav"
+)
+
+
+def load_clips() -> list:
+    """The speech clips shipped with the Haru model, as 16 kHz float mono"""
+    clips = []
+    for path in sorted(glob.glob(CLIPS)):
+        segment = load_audio(path).set_channels(1).set_frame_rate(SAMPLE_RATE)
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+        clips.append(samples / np.abs(samples).max())
+    return clips
+
+
+def make_stream(clips: list, seconds: float, seed: int) -> np.ndarray:
+    """Clips in a random order and loudness, with random pauses between them"""
+    rng = np.random.default_rng(seed)
+    parts, length = [], 0
+    while length < seconds * SAMPLE_RATE:
+        pause = int(rng.uniform(0.2, 2.5) * SAMPLE_RATE)
+        parts.append(0.003 * rng.standard_normal(pause))
+        parts.append(clips[rng.integers(len(clips))] * rng.uniform(0.1, 0.9))
+        length += pause + len(parts[-1])
+    parts.append(0.003 * rng.standard_normal(2 * SAMPLE_RATE))
+    return np.concatenate(parts).astype(np.float32)
+
+
+def make_chunks(audio: np.ndarray, seed: int) -> list:
+    """Split a stream into microphone chunks of varying size"""
+    rng = np.random.default_rng(seed)
+    chunks, start = [], 0
+    while start < len(audio):
+        size = int(rng.integers(1024, 8192))
+        chunks.append(audio[start : start + size].tolist())
+        start += size
+    return chunks
+
+
+def feed_interleaved(engines: list, streams: list) -> list:
+    """Feed one chunk per stream in turn, collecting each engine's output"""
+    outputs = [[] for _ in streams]
+    for position in range(max(len(chunks) for chunks in streams)):
+        for index, chunks in enumerate(streams):
+            if position < len(chunks):
+                outputs[index].extend(engines[index].detect_speech(chunks[position]))
+    return outputs
+
+
+def count_segments(output: list) -> int:
+    return sum(1 for out in output if out not in (b"<|PAUSE|>", b"<|RESUME|>"))
+
+
+def main(num_streams: int, seconds: float) -> bool:
+    model = VADEngine(orig_sr=SAMPLE_RATE, target_sr=SAMPLE_RATE)
+    clips = load_clips()
+    streams = [
+        make_chunks(make_stream(clips, seconds, seed), seed)
+        for seed in range(num_streams)
+    ]
+
+    expected = [[] for _ in streams]
+    for index, chunks in enumerate(streams):
+        solo = model.new_session()
+        for chunk in chunks:
+            expected[index].extend(solo.detect_speech(chunk))
+
+    sessions = [model.new_session() for _ in streams]
+    assert all(session.model is model.model for session in sessions)
+    outputs = feed_interleaved(sessions, streams)
+
+    ok = True
+    for index, (output, solo) in enumerate(zip(outputs, expected)):
+        matches = output == solo
+        ok = ok and matches
+        print(
+            f"stream {index}: {count_segments(solo)} segments alone, "
+            f"{count_segments(output)} interleaved, "
+            f"{'identical' if matches else 'DIFFERENT'}"
+        )
+
+    shared_engine = model.new_session()
+    shared = feed_interleaved([shared_engine] * num_streams, streams)
+    corrupted = sum(output != solo for output, solo in zip(shared, expected))
+    print(f"One shared engine instead: {corrupted}/{num_streams} streams corrupted")
+
+    print("Sessions are independent" if ok else "Sessions interfere")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VAD session isolation check")
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    args = parser.parse_args()
+    sys.exit(0 if main(args.streams, args.seconds) else 1)
@@ -0,0 +1,119 @@
+"""
+Load test for concurrent client sessions.
+
+Opens N WebSocket sessions against a running server, sends one text input per
+session at the same time and reports how long each conversation turn took.
+Every session asks the agent to remember a different code word and then to
+repeat it, so memory leaking between sessions shows up as mismatched answers.
+
+Usage:
+    uv run python scripts/load_test_sessions.py --sessions 50
+    uv run python scripts/load_test_sessions.py --url ws://localhost:12393/client-ws
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from loguru import logger
+from websockets.asyncio.client import ClientConnection, connect
+
+
+async def run_turn(ws: ClientConnection, text: str) -> tuple[float, str]:
+    """Send one text input and wait until the conversation chain ends.
+
+    Returns:
+        tuple: (seconds until the chain ended, the text the AI displayed)
+    """
+    start = time.perf_counter()
+    await ws.send(json.dumps({"type": "text-input", "text": text}))
+
+    displayed = []
+    async for msg in ws:
+        if not isinstance(msg, str):
+            # Binary audio frames
+            continue
+        data = json.loads(msg)
+        msg_type = data.get("type")
+        if msg_type == "audio":
+            display_text = data.get("display_text") or {}
+            if display_text.get("text"):
+                displayed.append(display_text["text"])
+        elif msg_type == "backend-synth-complete":
+            # Pretend the audio was played right away
+            await ws.send(json.dumps({"type": "frontend-playback-complete"}))
+        elif msg_type == "control" and data.get("text") == "conversation-chain-end":
+            break
+    return time.perf_counter() - start, " ".join(displayed)
+
+
+async def run_session(url: str, index: int, start_event: asyncio.Event) -> dict:
+    """Run a two-turn conversation in one session"""
+    code_word = uuid.uuid4().hex[:6]
+    async with connect(url, max_size=None) as ws:
+        # Wait for the initial messages so every session is fully set up
+        async for msg in ws:
+            data = json.loads(msg)
+            if data.get("type") == "control" and data.get("text") == "start-mic":
+                break
+
+        await start_event.wait()
+        first, _ = await run_turn(
+            ws, f"Remember the code word {code_word}. Just answer OK."
+        )
+        second, answer = await run_turn(
+            ws, "What is the code word? Answer with the code word only."
+        )
+
+    return {
+        "index": index,
+        "turn_seconds": [first, second],
+        "isolated": code_word in answer,
+    }
+
+
+async def main(url: str, sessions: int) -> None:
+    start_event = asyncio.Event()
+    tasks = [
+        asyncio.create_task(run_session(url, i, start_event))
+        for i in range(sessions)
+    ]
+    # Give every session time to connect before starting all turns together
+    await asyncio.sleep(1)
+    logger.info(f"Starting {sessions} concurrent sessions")
+    wall_start = time.perf_counter()
+    start_event.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    wall = time.perf_counter() - wall_start
+
+    failed = [r for r in results if isinstance(r, BaseException)]
+    done = [r for r in results if not isinstance(r, BaseException)]
+    for error in failed:
+        logger.error(f"Session failed: {error!r}")
+    if not done:
+        return
+
+    turns = sorted(t for r in done for t in r["turn_seconds"])
+    leaked = [r["index"] for r in done if not r["isolated"]]
+    logger.info(
+        f"{len(done)}/{sessions} sessions completed in {wall:.1f}s, "
+        f"turn latency median {statistics.median(turns):.2f}s, "
+        f"p95 {turns[int(len(turns) * 0.95) - 1]:.2f}s, max {turns[-1]:.2f}s"
+    )
+    if leaked:
+        logger.warning(
+            f"{len(leaked)} sessions did not get their own code word back: {leaked}"
+        )
+    else:
+        logger.info("Every session got its own code word back")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent session load test")
+    parser.add_argument("--url", default="ws://localhost:12393/client-ws")
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.sessions))
@@ -79,6 +79,10 @@ class AgentFactory:
                 segment_method=basic_memory_settings.get("segment_method", "pysbd"),
                 use_mcpp=basic_memory_settings.get("use_mcpp", False),
                 interrupt_method=interrupt_method,
+                memory_max_turns=basic_memory_settings.get("memory_max_turns"),
+                memory_max_tokens=basic_memory_settings.get("memory_max_tokens"),
+                memory_token_budget=basic_memory_settings.get("memory_token_budget"),
+                summarize_memory=basic_memory_settings.get("summarize_memory", True),
                 tool_prompts=tool_prompts,
                 tool_manager=tool_manager,
                 tool_executor=tool_executor,
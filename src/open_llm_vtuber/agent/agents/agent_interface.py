@@ -52,3 +52,31 @@ class AgentInterface(ABC):
             history_uid: str - History ID
         """
         pass
+
+    async def async_set_memory_from_history(
+        self, conf_uid: str, history_uid: str
+    ) -> None:
+        """
+        Load the agent's working memory from chat history, called on the event
+        loop. Agents that read history files override this to read them off
+        the event loop, while still changing their own state on it.
+
+        Args:
+            conf_uid: str - Configuration ID
+            history_uid: str - History ID
+        """
+        self.set_memory_from_history(conf_uid, history_uid)
+
+    def new_session(self) -> "AgentInterface":
+        """
+        Get an agent instance for a new client session.
+
+        Agents that keep conversation state locally (memory, interrupt flags)
+        should override this to return a new instance that shares the expensive
+        resources (LLM clients, loaded models) but not the conversation state.
+        By default the agent is shared between sessions.
+
+        Returns:
+            AgentInterface - The agent to use for the new session
+        """
+        return self
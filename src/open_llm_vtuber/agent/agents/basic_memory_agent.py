@@ -1,3 +1,5 @@
+import asyncio
+import copy
 from typing import (
     AsyncIterator,
     List,
@@ -7,6 +9,7 @@ from typing import (
     Literal,
     Union,
     Optional,
+    Tuple,
 )
 from loguru import logger
 from .agent_interface import AgentInterface
@@ -14,7 +17,12 @@ from ..output_types import SentenceOutput, DisplayText
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ..stateless_llm.claude_llm import AsyncLLM as ClaudeAsyncLLM
 from ..stateless_llm.openai_compatible_llm import AsyncLLM as OpenAICompatibleAsyncLLM
-from ...chat_history_manager import get_history
+from ...chat_history_manager import (
+    estimate_tokens,
+    get_metadata,
+    get_recent_history,
+)
+from ...chat_history_service import chat_history_service
 from ..transformers import (
     sentence_divider,
     actions_extractor,
@@ -49,10 +57,13 @@ class BasicMemoryAgent(AgentInterface):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        memory_max_turns: Optional[int] = None,
+        memory_max_tokens: Optional[int] = None,
+        memory_token_budget: Optional[int] = None,
+        summarize_memory: bool = True,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
-        self._memory = []
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
@@ -60,13 +71,18 @@ class BasicMemoryAgent(AgentInterface):
         self._use_mcpp = use_mcpp
         self.interrupt_method = interrupt_method
         self._tool_prompts = tool_prompts or {}
-        self._interrupt_handled = False
-        self.prompt_mode_flag = False
+        self._memory_max_turns = memory_max_turns
+        self._memory_max_tokens = memory_max_tokens
+
+        # Rolling memory: once the memory exceeds the token budget, the oldest
+        # messages are dropped and summarized in the background
+        self._memory_token_budget = memory_token_budget
+        self._summarize_memory = summarize_memory
 
         self._tool_manager = tool_manager
         self._tool_executor = tool_executor
         self._mcp_prompt_string = mcp_prompt_string
-        self._json_detector = StreamJSONDetector()
+        self._init_session_state()
 
         self._formatted_tools_openai = []
         self._formatted_tools_claude = []
@@ -111,6 +127,37 @@ class BasicMemoryAgent(AgentInterface):
 
         logger.info("BasicMemoryAgent initialized.")
 
+    def _init_session_state(self) -> None:
+        """Initialize the state that belongs to a single conversation session."""
+        self._memory = []
+        self._interrupt_handled = False
+        self.prompt_mode_flag = False
+        self._json_detector = StreamJSONDetector()
+
+        self._memory_tokens = 0
+        self._memory_summary = ""
+        self._evicted_messages: List[Dict[str, Any]] = []
+        self._summary_task: Optional[asyncio.Task] = None
+        # Bumped whenever the memory is replaced, so a summary of an old
+        # history finishing late is discarded
+        self._memory_generation = 0
+        self._conf_uid: Optional[str] = None
+        self._history_uid: Optional[str] = None
+
+    def new_session(self) -> "BasicMemoryAgent":
+        """Create an agent for another client session.
+
+        The new agent shares the stateless LLM (and with it the HTTP client and
+        connection pool or the loaded local model), the Live2D model and the MCP
+        components with this agent, but has its own memory and interrupt state.
+        This is cheap enough to do for every connection.
+        """
+        session_agent = copy.copy(self)
+        session_agent._init_session_state()
+        # The chat pipeline closes over the agent, so it has to be rebuilt
+        session_agent.chat = session_agent._chat_function_factory()
+        return session_agent
+
     def _set_llm(self, llm: StatelessLLMInterface):
         """Set the LLM for chat completion."""
         self._llm = llm
@@ -172,10 +219,193 @@ class BasicMemoryAgent(AgentInterface):
             return
 
         self._memory.append(message_data)
+        self._memory_tokens += self._message_tokens(message_data)
+        self._trim_memory()
+
+    @staticmethod
+    def _message_tokens(message: Dict[str, Any]) -> int:
+        """Estimate the number of tokens in a memory message."""
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(
+                item.get("text", "") for item in content if isinstance(item, dict)
+            )
+        return estimate_tokens(str(content))
+
+    def _recount_memory_tokens(self) -> None:
+        """Recompute the token estimate of the whole memory."""
+        self._memory_tokens = sum(self._message_tokens(msg) for msg in self._memory)
+
+    def _trim_memory(self) -> None:
+        """Keep the memory within the token budget.
+
+        When the budget is exceeded, the oldest turns are dropped until the
+        memory is back to 3/4 of the budget, so trimming (and summarizing) does
+        not happen on every turn. Whole turns are dropped, so the memory still
+        starts with a user message, which some providers require, and the
+        newest turn is always kept. Dropped messages are summarized in the
+        background.
+        """
+        budget = self._memory_token_budget
+        if not budget or self._memory_tokens <= budget:
+            return
+
+        target = budget * 3 // 4
+        # The newest turn starts at the last user message
+        newest_turn = next(
+            (
+                index
+                for index in range(len(self._memory) - 1, -1, -1)
+                if self._memory[index]["role"] == "user"
+            ),
+            len(self._memory) - 1,
+        )
+        evicted = []
+        while len(evicted) < newest_turn and (
+            self._memory_tokens > target or self._memory[0]["role"] != "user"
+        ):
+            message = self._memory.pop(0)
+            self._memory_tokens -= self._message_tokens(message)
+            evicted.append(message)
+        logger.debug(
+            f"Memory over token budget ({budget}), dropped {len(evicted)} oldest messages."
+        )
+
+        if self._summarize_memory and evicted:
+            self._evicted_messages.extend(evicted)
+            self._schedule_summary()
+
+    def _schedule_summary(self) -> None:
+        """Start the background summary task unless one is already running."""
+        if self._summary_task and not self._summary_task.done():
+            # The running task picks up newly evicted messages when it is done
+            return
+        try:
+            self._summary_task = asyncio.get_running_loop().create_task(
+                self._summarize_evicted()
+            )
+        except RuntimeError:
+            # No running event loop (e.g. called from a worker thread). The
+            # evicted messages are summarized on the next trim.
+            pass
+
+    async def _summarize_evicted(self) -> None:
+        """Fold evicted messages into the running summary, off the critical path."""
+        while self._evicted_messages:
+            generation = self._memory_generation
+            evicted, self._evicted_messages = self._evicted_messages, []
+            try:
+                summary = await self._generate_summary(evicted)
+            except Exception as e:
+                logger.error(
+                    f"Failed to summarize {len(evicted)} evicted messages: {e}"
+                )
+                return
+
+            if generation != self._memory_generation or not summary:
+                continue
+
+            self._memory_summary = summary
+            logger.info(f"Updated memory summary ({estimate_tokens(summary)} tokens).")
+            if self._conf_uid and self._history_uid:
+                # Cached in the history metadata so reloading the history does
+                # not summarize it again
+                chat_history_service.update_metadate(
+                    self._conf_uid,
+                    self._history_uid,
+                    {"memory_summary": summary},
+                )
+
+    async def _generate_summary(self, messages: List[Dict[str, Any]]) -> str:
+        """Ask the LLM for a summary that merges the old summary and `messages`."""
+        prompt_name = self._tool_prompts.get(
+            "memory_summary_prompt", "memory_summary_prompt"
+        )
+        conversation = "\n".join(
+            f"{msg['role']}: {msg['content']}"
+            for msg in messages
+            if isinstance(msg.get("content"), str)
+        )
+        prompt = prompt_loader.load_util(prompt_name).format(
+            summary=self._memory_summary or "(none)",
+            conversation=conversation,
+            max_words=max(50, self._memory_token_budget // 6),
+        )
+
+        summary = ""
+        async for event in self._llm.chat_completion(
+            [{"role": "user", "content": prompt}],
+            "You write concise, factual summaries of conversations.",
+        ):
+            if isinstance(event, dict) and event.get("type") == "text_delta":
+                summary += event.get("text", "")
+            elif isinstance(event, str):
+                summary += event
+        return summary.strip()
+
+    def _system_prompt(self) -> str:
+        """The system prompt, with the summary of forgotten turns appended."""
+        if not self._memory_summary:
+            return self._system
+        return (
+            f"{self._system}\n\n"
+            f"Summary of the earlier conversation:\n{self._memory_summary}"
+        )
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
-        """Load memory from chat history."""
-        messages = get_history(conf_uid, history_uid)
+        """Load memory from chat history, keeping only the configured window.
+
+        With a token budget, only about a budget's worth of recent messages is
+        loaded and the summary of older messages is restored from the history
+        metadata.
+        """
+        messages, summary = self._read_history(conf_uid, history_uid)
+        self._load_memory(conf_uid, history_uid, messages, summary)
+
+    async def async_set_memory_from_history(
+        self, conf_uid: str, history_uid: str
+    ) -> None:
+        """Like `set_memory_from_history`, reading the history files on the
+        chat history thread. The memory itself is replaced on the event loop,
+        where conversations append to it."""
+        messages, summary = await chat_history_service.run(
+            self._read_history, conf_uid, history_uid
+        )
+        self._load_memory(conf_uid, history_uid, messages, summary)
+
+    def _read_history(
+        self, conf_uid: str, history_uid: str
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Read the recent messages and the cached summary of a chat history.
+        Blocking file reads only, the agent state is left untouched."""
+        max_tokens = self._memory_max_tokens
+        if self._memory_token_budget:
+            max_tokens = min(
+                max_tokens or self._memory_token_budget, self._memory_token_budget
+            )
+        messages = get_recent_history(
+            conf_uid,
+            history_uid,
+            max_turns=self._memory_max_turns,
+            max_tokens=max_tokens,
+        )
+        summary = ""
+        if self._memory_token_budget and self._summarize_memory:
+            summary = get_metadata(conf_uid, history_uid).get("memory_summary", "")
+        return messages, summary
+
+    def _load_memory(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        messages: List[Dict[str, Any]],
+        summary: str,
+    ) -> None:
+        """Replace the memory with messages read from a chat history"""
+        self._memory_generation += 1
+        self._conf_uid = conf_uid
+        self._history_uid = history_uid
+        self._evicted_messages = []
 
         self._memory = []
         for msg in messages:
@@ -190,7 +420,13 @@ class BasicMemoryAgent(AgentInterface):
                 )
             else:
                 logger.warning(f"Skipping invalid message from history: {msg}")
-        logger.info(f"Loaded {len(self._memory)} messages from history.")
+        self._recount_memory_tokens()
+
+        self._memory_summary = summary
+        logger.info(
+            f"Loaded {len(self._memory)} messages from history"
+            f"{' with a cached summary' if self._memory_summary else ''}."
+        )
 
     def handle_interrupt(self, heard_response: str) -> None:
         """Handle user interruption."""
@@ -220,6 +456,8 @@ class BasicMemoryAgent(AgentInterface):
                 "content": "[Interrupted by user]",
             }
         )
+        self._recount_memory_tokens()
+        self._trim_memory()
         logger.info(f"Handled interrupt with role '{interrupt_role}'.")
 
     def _to_text_prompt(self, input_data: BatchInput) -> str:
@@ -309,7 +547,9 @@ class BasicMemoryAgent(AgentInterface):
         current_assistant_message_content = []
 
         while True:
-            stream = self._llm.chat_completion(messages, self._system, tools=tools)
+            stream = self._llm.chat_completion(
+                messages, self._system_prompt(), tools=tools
+            )
             pending_tool_calls.clear()
             current_assistant_message_content.clear()
 
@@ -419,20 +659,21 @@ class BasicMemoryAgent(AgentInterface):
         messages = initial_messages.copy()
         current_turn_text = ""
         pending_tool_calls: Union[List[ToolCallObject], List[Dict[str, Any]]] = []
-        current_system_prompt = self._system
+        system_prompt = self._system_prompt()
+        current_system_prompt = system_prompt
 
         while True:
             if self.prompt_mode_flag:
                 if self._mcp_prompt_string:
                     current_system_prompt = (
-                        f"{self._system}\n\n{self._mcp_prompt_string}"
+                        f"{system_prompt}\n\n{self._mcp_prompt_string}"
                     )
                 else:
                     logger.warning("Prompt mode active but mcp_prompt_string is empty!")
-                    current_system_prompt = self._system
+                    current_system_prompt = system_prompt
                 tools_for_api = None
             else:
-                current_system_prompt = self._system
+                current_system_prompt = system_prompt
                 tools_for_api = tools
 
             stream = self._llm.chat_completion(
@@ -653,7 +894,9 @@ class BasicMemoryAgent(AgentInterface):
                 return
             else:
                 logger.info("Starting simple chat completion.")
-                token_stream = self._llm.chat_completion(messages, self._system)
+                token_stream = self._llm.chat_completion(
+                    messages, self._system_prompt()
+                )
                 complete_response = ""
                 async for event in token_stream:
                     text_chunk = ""
@@ -704,6 +947,7 @@ class BasicMemoryAgent(AgentInterface):
                 human_name=human_name, other_ais=other_ais
             )
             self._memory.append({"role": "user", "content": group_context})
+            self._recount_memory_tokens()
         except FileNotFoundError:
             logger.error(f"Group conversation prompt file not found: {prompt_name}")
         except KeyError as e:
@@ -9,7 +9,8 @@ from pathlib import Path
 from .agent_interface import AgentInterface
 from ..output_types import AudioOutput, Actions, DisplayText
 from ..input_types import BatchInput
-from ...chat_history_manager import get_metadata, update_metadate
+from ...chat_history_manager import get_metadata
+from ...chat_history_service import chat_history_service
 
 
 class HumeAIAgent(AgentInterface):
@@ -87,7 +88,7 @@ class HumeAIAgent(AgentInterface):
                 new_chat_group_id = data.get("chat_group_id")
 
                 if not resume_chat_group_id and self._current_history_uid:
-                    update_metadate(
+                    chat_history_service.update_metadate(
                         self._current_conf_uid,
                         self._current_history_uid,
                         {"resume_id": new_chat_group_id, "agent_type": self.AGENT_TYPE},
@@ -127,11 +128,21 @@ class HumeAIAgent(AgentInterface):
             conf_uid: Configuration ID
             history_uid: History ID
         """
+        self._set_chat_group(conf_uid, history_uid, get_metadata(conf_uid, history_uid))
+
+    async def async_set_memory_from_history(
+        self, conf_uid: str, history_uid: str
+    ) -> None:
+        """Like `set_memory_from_history`, reading the metadata on the chat
+        history thread"""
+        metadata = await chat_history_service.get_metadata(conf_uid, history_uid)
+        self._set_chat_group(conf_uid, history_uid, metadata)
+
+    def _set_chat_group(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        """Resume the chat group stored in the metadata of a history"""
         self._current_conf_uid = conf_uid
         self._current_history_uid = history_uid
 
-        metadata = get_metadata(conf_uid, history_uid)
-
         agent_type = metadata.get("agent_type")
         if agent_type and agent_type != self.AGENT_TYPE:
             logger.warning(
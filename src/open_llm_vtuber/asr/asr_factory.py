@@ -14,7 +14,8 @@ class ASRFactory:
                 language=kwargs.get("language"),
                 device=kwargs.get("device"),
                 compute_type=kwargs.get("compute_type"),
-                prompt=kwargs.get("prompt", None)
+                prompt=kwargs.get("prompt", None),
+                streaming=kwargs.get("streaming", False),
             )
         elif system_name == "whisper_cpp":
             from .whisper_cpp_asr import VoiceRecognition as WhisperCPPASR
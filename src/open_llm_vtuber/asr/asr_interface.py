@@ -1,6 +1,32 @@
 import abc
 import numpy as np
 import asyncio
+from typing import Optional
+
+
+class ASRStream(metaclass=abc.ABCMeta):
+    """Incremental transcription of one utterance, see `ASRInterface.start_stream`.
+
+    The methods block while decoding, callers run them in a worker thread,
+    one call at a time.
+    """
+
+    @abc.abstractmethod
+    def feed(self, audio: np.ndarray) -> Optional[str]:
+        """Add the next float32 samples of the utterance.
+
+        Args:
+            audio: The numpy array of the audio data, at `SAMPLE_RATE`.
+
+        Returns:
+            Optional[str]: The partial transcription if it changed, else None.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def finalize(self) -> str:
+        """End the utterance and return its final transcription."""
+        raise NotImplementedError
 
 
 class ASRInterface(metaclass=abc.ABCMeta):
@@ -33,6 +59,18 @@ class ASRInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def start_stream(self) -> Optional[ASRStream]:
+        """Start transcribing an utterance while it is still being spoken.
+
+        Engines that can decode audio incrementally override this. By default
+        streaming is not supported and the utterance is transcribed with
+        `async_transcribe_np` once it has ended.
+
+        Returns:
+            Optional[ASRStream]: A stream for the new utterance, or None.
+        """
+        return None
+
     def nparray_to_audio_file(
         self, audio: np.ndarray, sample_rate: int, file_path: str
     ) -> None:
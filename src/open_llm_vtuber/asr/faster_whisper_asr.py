@@ -1,6 +1,8 @@
+from typing import Callable, List, Optional
+
 import numpy as np
 from faster_whisper import WhisperModel
-from .asr_interface import ASRInterface
+from .asr_interface import ASRInterface, ASRStream
 
 
 class VoiceRecognition(ASRInterface):
@@ -15,10 +17,12 @@ class VoiceRecognition(ASRInterface):
         device: str = "auto",
         compute_type: str = "int8",
         prompt: str = None,
+        streaming: bool = False,
     ) -> None:
         self.MODEL_PATH = model_path
         self.LANG = language
         self.prompt = prompt
+        self.streaming = streaming
         self.model = WhisperModel(
             model_size_or_path=model_path,
             download_root=download_root,
@@ -26,25 +30,106 @@ class VoiceRecognition(ASRInterface):
             compute_type=compute_type,
         )
 
+    def _transcribe_segments(self, audio: np.ndarray) -> list:
+        segments, info = self.model.transcribe(
+            audio,
+            beam_size=5 if self.BEAM_SEARCH else 1,
+            language=self.LANG if self.LANG else None,
+            condition_on_previous_text=False,
+            initial_prompt=self.prompt if self.prompt else None,
+        )
+        return list(segments)
+
     def transcribe_np(self, audio: np.ndarray) -> str:
-        if self.prompt:
-            segments, info = self.model.transcribe(
-                audio,
-                beam_size=5 if self.BEAM_SEARCH else 1,
-                language=self.LANG if self.LANG else None,
-                condition_on_previous_text=False,
-                prompt=self.prompt
-            )
-        else:
-            segments, info = self.model.transcribe(
-                audio,
-                beam_size=5 if self.BEAM_SEARCH else 1,
-                language=self.LANG if self.LANG else None,
-                condition_on_previous_text=False,
-            )
-        text = [segment.text for segment in segments]
+        text = [segment.text for segment in self._transcribe_segments(audio)]
 
         if not text:
             return ""
         else:
             return "".join(text)
+
+    def start_stream(self) -> Optional[ASRStream]:
+        if not self.streaming:
+            return None
+        return RedecodeASRStream(self._transcribe_segments, self.SAMPLE_RATE)
+
+
+class RedecodeASRStream(ASRStream):
+    """
+    Streaming emulated for Whisper, which only decodes whole utterances.
+
+    The audio is decoded again as it grows, at most once per `interval_seconds`
+    of new audio. Segments before the last one that come out the same in two
+    decodes in a row are committed: their text is kept and their audio
+    dropped, so decodes stay short and `finalize` only decodes the last
+    segments. If nothing but silence arrived since the last decode, such as
+    the silence the VAD waits for before ending the utterance, `finalize`
+    returns the last decode right away.
+    """
+
+    # Level (in [-1, 1] floats) that every window of the audio after the last
+    # decode must stay under for it not to be decoded again at the end, well
+    # below speech for the VAD. A quiet last word is still louder than this in
+    # its own windows, even if the level of the whole tail is lower.
+    SILENCE_RMS = 0.01
+    SILENCE_WINDOW_SECONDS = 0.03
+
+    def __init__(
+        self,
+        transcribe_segments: Callable[[np.ndarray], list],
+        sample_rate: int,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        self.transcribe_segments = transcribe_segments
+        self.sample_rate = sample_rate
+        self.interval_samples = int(interval_seconds * sample_rate)
+        self.audio = np.empty(0, dtype=np.float32)
+        self.undecoded_samples = 0
+        self.committed = ""
+        self.previous_texts: List[str] = []
+        self.decoded = False
+        self.text = ""
+
+    def _decode(self) -> str:
+        segments = self.transcribe_segments(self.audio) if len(self.audio) else []
+        texts = [segment.text for segment in segments]
+
+        agreed = 0
+        while (
+            agreed < min(len(texts) - 1, len(self.previous_texts))
+            and texts[agreed] == self.previous_texts[agreed]
+        ):
+            agreed += 1
+        if agreed:
+            self.committed += "".join(texts[:agreed])
+            self.audio = self.audio[int(segments[agreed - 1].end * self.sample_rate) :]
+            texts = texts[agreed:]
+
+        self.previous_texts = texts
+        self.undecoded_samples = 0
+        self.decoded = True
+        self.text = self.committed + "".join(texts)
+        return self.text
+
+    def feed(self, audio: np.ndarray) -> Optional[str]:
+        self.audio = np.concatenate([self.audio, audio.astype(np.float32)])
+        self.undecoded_samples += len(audio)
+        if self.undecoded_samples < self.interval_samples:
+            return None
+        previous_text = self.text
+        text = self._decode()
+        return text if text != previous_text else None
+
+    def finalize(self) -> str:
+        if self.decoded:
+            tail = self.audio[len(self.audio) - self.undecoded_samples :]
+            if self._is_silent(tail):
+                return self.text
+        return self._decode()
+
+    def _is_silent(self, audio: np.ndarray) -> bool:
+        """Whether no window of the audio reaches the silence level"""
+        window = max(1, int(self.SILENCE_WINDOW_SECONDS * self.sample_rate))
+        padded = np.pad(audio, (0, -len(audio) % window))
+        levels = np.sqrt(np.mean(np.square(padded.reshape(-1, window)), axis=1))
+        return not len(levels) or bool(levels.max() < self.SILENCE_RMS)
@@ -2,7 +2,7 @@ import os
 import numpy as np
 import sherpa_onnx
 from loguru import logger
-from .asr_interface import ASRInterface
+from .asr_interface import ASRInterface, ASRStream
 from .utils import download_and_extract, check_and_extract_local_file
 import onnxruntime
 
@@ -37,6 +37,7 @@ class VoiceRecognition(ASRInterface):
         feature_dim: int = 80,  # Feature dimension
         use_itn: bool = True,  # Use ITN for SenseVoice models
         provider: str = "cpu",  # Provider for inference (cpu or cuda)
+        streaming: bool = False,  # Use a streaming (online) transducer or paraformer
     ) -> None:
         self.model_type = model_type
         self.encoder = encoder
@@ -64,6 +65,7 @@ class VoiceRecognition(ASRInterface):
         self.SAMPLE_RATE = sample_rate
         self.feature_dim = feature_dim
         self.use_itn = use_itn
+        self.streaming = streaming
 
         # we need to find a way to get cuda version of sherpa-onnx before we can
         # use the gpu provider.
@@ -83,6 +85,9 @@ class VoiceRecognition(ASRInterface):
         self.recognizer = self._create_recognizer()
 
     def _create_recognizer(self):
+        if self.streaming:
+            return self._create_online_recognizer()
+
         if self.model_type == "transducer":
             recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
                 encoder=self.encoder,
@@ -198,8 +203,87 @@ class VoiceRecognition(ASRInterface):
 
         return recognizer
 
+    def _create_online_recognizer(self):
+        if self.model_type == "transducer":
+            return sherpa_onnx.OnlineRecognizer.from_transducer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                joiner=self.joiner,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                hotwords_file=self.hotwords_file,
+                hotwords_score=self.hotwords_score,
+                modeling_unit=self.modeling_unit,
+                bpe_vocab=self.bpe_vocab,
+                blank_penalty=self.blank_penalty,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        elif self.model_type == "paraformer":
+            return sherpa_onnx.OnlineRecognizer.from_paraformer(
+                tokens=self.tokens,
+                encoder=self.encoder,
+                decoder=self.decoder,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        raise ValueError(f"Streaming is not supported for model type: {self.model_type}")
+
+    def start_stream(self) -> ASRStream | None:
+        if not self.streaming:
+            return None
+        return OnlineASRStream(self.recognizer, self.SAMPLE_RATE)
+
     def transcribe_np(self, audio: np.ndarray) -> str:
+        if self.streaming:
+            stream = self.start_stream()
+            stream.feed(audio)
+            return stream.finalize()
+
         stream = self.recognizer.create_stream()
         stream.accept_waveform(self.SAMPLE_RATE, audio)
         self.recognizer.decode_streams([stream])
         return stream.result.text
+
+
+class OnlineASRStream(ASRStream):
+    """An utterance decoded chunk by chunk by a sherpa-onnx online recognizer"""
+
+    # Silence appended at the end, so the model emits the last tokens
+    TAIL_PADDING_SECONDS = 0.66
+
+    def __init__(self, recognizer, sample_rate: int) -> None:
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.stream = recognizer.create_stream()
+        self.text = ""
+
+    def _decode(self) -> str:
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
+        return self.recognizer.get_result(self.stream)
+
+    def feed(self, audio: np.ndarray) -> str | None:
+        self.stream.accept_waveform(self.sample_rate, audio)
+        text = self._decode()
+        if text == self.text:
+            return None
+        self.text = text
+        return text
+
+    def finalize(self) -> str:
+        # Only the audio of the last chunk and the padding is left to decode
+        tail_padding = np.zeros(
+            int(self.TAIL_PADDING_SECONDS * self.sample_rate), dtype=np.float32
+        )
+        self.stream.accept_waveform(self.sample_rate, tail_padding)
+        self.stream.input_finished()
+        self.text = self._decode()
+        return self.text
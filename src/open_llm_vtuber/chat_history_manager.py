@@ -2,10 +2,27 @@ import os
 import re
 import json
 import uuid
+import threading
 from datetime import datetime
-from typing import Literal, List, TypedDict, Optional
+from typing import Literal, List, TypedDict, Optional, Dict
 from loguru import logger
 
+# Messages are stored one JSON record per line so that storing a message is a
+# constant-time append. Metadata lives in a separate small file.
+HISTORY_SUFFIX = ".jsonl"
+METADATA_SUFFIX = ".meta.json"
+# Histories written by older versions: one JSON array with metadata first
+LEGACY_SUFFIX = ".json"
+# Per-conf append-only log of history summaries, used to list histories
+# without reading message bodies
+INDEX_FILENAME = "_index.jsonl"
+# Compact the index log once it holds this many stale lines
+INDEX_COMPACT_THRESHOLD = 256
+
+_index_lock = threading.RLock()
+# conf_dir -> {"size": index file size, "lines": line count, "entries": {uid: entry}}
+_index_cache: Dict[str, dict] = {}
+
 
 class HistoryMessage(TypedDict):
     role: Literal["human", "ai"]
@@ -49,17 +66,372 @@ def _ensure_conf_dir(conf_uid: str) -> str:
     return base_dir
 
 
-def _get_safe_history_path(conf_uid: str, history_uid: str) -> str:
+def _get_safe_history_path(
+    conf_uid: str, history_uid: str, suffix: str = HISTORY_SUFFIX
+) -> str:
     """Get sanitized path for history file"""
     safe_conf_uid = _sanitize_path_component(conf_uid)
     safe_history_uid = _sanitize_path_component(history_uid)
     base_dir = os.path.join("chat_history", safe_conf_uid)
-    full_path = os.path.normpath(os.path.join(base_dir, f"{safe_history_uid}.json"))
+    full_path = os.path.normpath(os.path.join(base_dir, f"{safe_history_uid}{suffix}"))
     if not full_path.startswith(base_dir):
         raise ValueError("Invalid path: Path traversal detected")
     return full_path
 
 
+def _get_safe_metadata_path(conf_uid: str, history_uid: str) -> str:
+    """Get sanitized path for the metadata file of a history"""
+    return _get_safe_history_path(conf_uid, history_uid, METADATA_SUFFIX)
+
+
+def _encode_record(record: dict) -> bytes:
+    """Serialize a single history record as one JSONL line"""
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _append_record(filepath: str, record: dict) -> None:
+    """Append one record to a JSONL history file.
+
+    The record is written with a single call so that a crash can at most leave a
+    torn trailing line. If the previous write was torn, a newline is inserted
+    first so the new record starts on its own line.
+    """
+    line = _encode_record(record)
+    with open(filepath, "ab+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+
+
+def _read_records(filepath: str) -> List[dict]:
+    """Read all records from a JSONL history file, skipping torn lines"""
+    records = []
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupted line {line_no} in {filepath}")
+    return records
+
+
+def _iter_records_reverse(f, end: Optional[int] = None):
+    """Iterate over the records of an open binary JSONL file, newest first.
+
+    Reads backwards in blocks starting at byte offset `end` (the end of the file
+    by default), so the cost depends only on how many records are consumed,
+    not on the length of the history. Torn or corrupted lines are skipped.
+
+    Yields:
+        tuple: (byte offset where the record starts, the decoded record)
+    """
+    f.seek(0, os.SEEK_END)
+    pos = f.tell() if end is None else min(end, f.tell())
+    block_size = 4096
+    buffer = b""
+    while pos > 0:
+        read_size = min(block_size, pos)
+        pos -= read_size
+        f.seek(pos)
+        buffer = f.read(read_size) + buffer
+
+        line_end = len(buffer)
+        while True:
+            line_start = buffer.rfind(b"\n", 0, line_end) + 1
+            if line_start == 0 and pos > 0:
+                # The line may continue before the buffer, read another block
+                break
+            line = buffer[line_start:line_end]
+            if line.strip():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                if record is not None:
+                    yield pos + line_start, record
+            if line_start == 0:
+                break
+            line_end = line_start - 1
+        buffer = buffer[:line_end]
+
+
+def _find_last_record(f) -> tuple[int, dict | None]:
+    """Locate the last valid record of an open binary JSONL file.
+
+    Returns:
+        tuple: (byte offset where the last record starts, the decoded record).
+            The record is None if the file holds no valid record.
+    """
+    return next(_iter_records_reverse(f), (0, None))
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of LLM tokens in a text.
+
+    Counts about four characters per token for ASCII text and one token per
+    character otherwise (CJK characters are usually a token each). This is only
+    used to budget how much history to load, so it does not need a tokenizer.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _write_metadata(filepath: str, metadata: dict) -> None:
+    """Atomically replace the metadata file of a history"""
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, filepath)
+
+
+def _migrate_legacy_history(conf_uid: str, history_uid: str) -> bool:
+    """Convert a legacy ``<history_uid>.json`` file to the JSONL layout.
+
+    Legacy files store the metadata as the first element of a JSON array and
+    the messages after it. They are split into ``<history_uid>.jsonl`` and
+    ``<history_uid>.meta.json``, and the legacy file is removed afterwards.
+
+    Returns:
+        bool: True if a legacy file was migrated
+    """
+    legacy_path = _get_safe_history_path(conf_uid, history_uid, LEGACY_SUFFIX)
+    filepath = _get_safe_history_path(conf_uid, history_uid)
+    if not os.path.exists(legacy_path) or os.path.exists(filepath):
+        return False
+
+    try:
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            history_data = json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load legacy history file {legacy_path}: {e}")
+        return False
+
+    metadata = None
+    messages = []
+    for item in history_data:
+        if item.get("role") == "metadata":
+            metadata = item
+        else:
+            messages.append(item)
+
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        for message in messages:
+            f.write(_encode_record(message))
+    os.replace(tmp_path, filepath)
+
+    if metadata is not None:
+        _write_metadata(_get_safe_metadata_path(conf_uid, history_uid), metadata)
+
+    os.remove(legacy_path)
+    _update_index_entry(
+        conf_uid,
+        history_uid,
+        latest_message=messages[-1] if messages else None,
+        message_count=len(messages),
+        created_at=(metadata or {}).get("timestamp"),
+    )
+    logger.info(f"Migrated legacy history file {legacy_path} to {filepath}")
+    return True
+
+
+def migrate_legacy_histories(conf_uid: str) -> int:
+    """Migrate every legacy JSON history file of a conf to the JSONL layout
+
+    Returns:
+        int: Number of migrated histories
+    """
+    if not conf_uid:
+        return 0
+
+    conf_dir = _ensure_conf_dir(conf_uid)
+    migrated = 0
+    for filename in os.listdir(conf_dir):
+        if (
+            not filename.endswith(LEGACY_SUFFIX)
+            or filename.endswith(METADATA_SUFFIX)
+            or filename == INDEX_FILENAME
+        ):
+            continue
+        try:
+            if _migrate_legacy_history(conf_uid, filename[: -len(LEGACY_SUFFIX)]):
+                migrated += 1
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy history file {filename}: {e}")
+    return migrated
+
+
+def _resolve_history_path(conf_uid: str, history_uid: str) -> str:
+    """Get the JSONL path of a history, migrating a legacy file first if needed"""
+    _migrate_legacy_history(conf_uid, history_uid)
+    return _get_safe_history_path(conf_uid, history_uid)
+
+
+# ==== History index
+
+
+def _get_index_path(conf_uid: str) -> str:
+    """Get the path of the history index of a conf"""
+    return os.path.join(_ensure_conf_dir(conf_uid), INDEX_FILENAME)
+
+
+def _build_index_entry(conf_uid: str, history_uid: str) -> dict:
+    """Build an index entry by reading a history file. Only used when the
+    index has no entry for the history yet."""
+    filepath = _get_safe_history_path(conf_uid, history_uid)
+    messages = _read_records(filepath) if os.path.exists(filepath) else []
+    metadata_path = _get_safe_metadata_path(conf_uid, history_uid)
+    created_at = None
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                created_at = json.load(f).get("timestamp")
+        except Exception as e:
+            logger.error(f"Failed to read metadata of {history_uid}: {e}")
+    latest_message = messages[-1] if messages else None
+    return {
+        "uid": history_uid,
+        "latest_message": latest_message,
+        "timestamp": latest_message.get("timestamp") if latest_message else None,
+        "message_count": len(messages),
+        "created_at": created_at,
+    }
+
+
+def _write_index(index_path: str, entries: Dict[str, dict]) -> None:
+    """Atomically rewrite the index log with one line per live entry"""
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for entry in entries.values():
+            f.write(_encode_record(entry))
+    os.replace(tmp_path, index_path)
+    _index_cache[os.path.dirname(index_path)] = {
+        "size": os.path.getsize(index_path),
+        "lines": len(entries),
+        "entries": entries,
+    }
+
+
+def _rebuild_index(conf_uid: str) -> Dict[str, dict]:
+    """Rebuild the index of a conf by scanning its history files"""
+    conf_dir = _ensure_conf_dir(conf_uid)
+    entries = {}
+    for filename in os.listdir(conf_dir):
+        if not filename.endswith(HISTORY_SUFFIX) or filename == INDEX_FILENAME:
+            continue
+        history_uid = filename[: -len(HISTORY_SUFFIX)]
+        try:
+            entries[history_uid] = _build_index_entry(conf_uid, history_uid)
+        except Exception as e:
+            logger.error(f"Error indexing history file {filename}: {e}")
+    _write_index(_get_index_path(conf_uid), entries)
+    logger.info(f"Rebuilt history index for {conf_uid} ({len(entries)} histories)")
+    return entries
+
+
+def _load_index(conf_uid: str) -> Dict[str, dict]:
+    """Load the index of a conf, using the in-memory copy if it is current"""
+    index_path = _get_index_path(conf_uid)
+    with _index_lock:
+        if not os.path.exists(index_path):
+            return _rebuild_index(conf_uid)
+
+        size = os.path.getsize(index_path)
+        cached = _index_cache.get(os.path.dirname(index_path))
+        if cached and cached["size"] == size:
+            return cached["entries"]
+
+        entries = {}
+        records = _read_records(index_path)
+        for record in records:
+            if record.get("deleted"):
+                entries.pop(record["uid"], None)
+            else:
+                entries[record["uid"]] = record
+        _index_cache[os.path.dirname(index_path)] = {
+            "size": size,
+            "lines": len(records),
+            "entries": entries,
+        }
+        return entries
+
+
+def _append_index_record(conf_uid: str, record: dict) -> None:
+    """Append a record to the index log and apply it to the in-memory copy"""
+    index_path = _get_index_path(conf_uid)
+    with _index_lock:
+        entries = _load_index(conf_uid)
+        _append_record(index_path, record)
+        if record.get("deleted"):
+            entries.pop(record["uid"], None)
+        else:
+            entries[record["uid"]] = record
+
+        cached = _index_cache[os.path.dirname(index_path)]
+        cached["size"] = os.path.getsize(index_path)
+        cached["lines"] += 1
+        if cached["lines"] - len(entries) > INDEX_COMPACT_THRESHOLD:
+            _write_index(index_path, entries)
+
+
+def _update_index_entry(
+    conf_uid: str,
+    history_uid: str,
+    added_message: dict | None = None,
+    **fields,
+) -> None:
+    """Update the index entry of a history.
+
+    Args:
+        conf_uid: Configuration unique identifier
+        history_uid: History unique identifier
+        added_message: A message that was just appended to the history
+        **fields: Entry fields to overwrite
+    """
+    try:
+        with _index_lock:
+            entries = _load_index(conf_uid)
+            entry = entries.get(history_uid)
+            if entry is None:
+                # The history file already reflects the change, index it as is
+                entry = _build_index_entry(conf_uid, history_uid)
+            else:
+                entry = dict(entry)
+                if added_message is not None:
+                    fields["latest_message"] = added_message
+                    fields["message_count"] = entry.get("message_count", 0) + 1
+                entry.update(fields)
+            if "latest_message" in fields:
+                latest_message = entry["latest_message"]
+                entry["timestamp"] = (
+                    latest_message.get("timestamp") if latest_message else None
+                )
+            _append_index_record(conf_uid, entry)
+    except Exception as e:
+        logger.error(f"Failed to update history index for {history_uid}: {e}")
+
+
+def _remove_index_entry(conf_uid: str, history_uid: str) -> None:
+    """Mark a history as deleted in the index"""
+    try:
+        with _index_lock:
+            if history_uid in _load_index(conf_uid):
+                _append_index_record(conf_uid, {"uid": history_uid, "deleted": True})
+    except Exception as e:
+        logger.error(f"Failed to remove {history_uid} from history index: {e}")
+
+
+# ==== Public API
+
+
 def create_new_history(conf_uid: str) -> str:
     """Create a new history file with a unique ID and return the history_uid"""
     if not conf_uid:
@@ -69,23 +441,24 @@ def create_new_history(conf_uid: str) -> str:
     # Use uuid.uuid4().hex to generate a UUID without hyphens
     # New format: UUID_YYYY-MM-DD_HH-MM-SS
     history_uid = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{uuid.uuid4().hex}"
-    conf_dir = _ensure_conf_dir(conf_uid)  # conf_uid is sanitized here
+    _ensure_conf_dir(conf_uid)  # conf_uid is sanitized here
 
-    # Create history file with empty metadata
+    # Create an empty message file and the metadata file
     try:
-        filepath = os.path.join(conf_dir, f"{history_uid}.json")
-        initial_data = [
+        filepath = _get_safe_history_path(conf_uid, history_uid)
+        open(filepath, "wb").close()
+        _write_metadata(
+            _get_safe_metadata_path(conf_uid, history_uid),
             {
                 "role": "metadata",
                 "timestamp": datetime.now().isoformat(timespec="seconds"),
-            }
-        ]
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(initial_data, f, ensure_ascii=False, indent=2)
+            },
+        )
     except Exception as e:
         logger.error(f"Failed to create new history file: {e}")
         return ""
 
+    _update_index_entry(conf_uid, history_uid)
     logger.debug(f"Created new history file with empty metadata: {filepath}")
     return history_uid
 
@@ -100,6 +473,9 @@ def store_message(
 ):
     """Store a message in a specific history file
 
+    The message is appended as a single JSONL record, so the cost does not
+    depend on the length of the history.
+
     Args:
         conf_uid: Configuration unique identifier
         history_uid: History unique identifier
@@ -115,18 +491,10 @@ def store_message(
             logger.warning("Missing history_uid")
         return
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    _ensure_conf_dir(conf_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     logger.debug(f"Storing {role} message to {filepath}")
 
-    history_data = []
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                history_data = json.load(f)
-        except Exception:
-            logger.error(f"Failed to load history file: {filepath}")
-            pass
-
     now_str = datetime.now().isoformat(timespec="seconds")
     new_item = {
         "role": role,
@@ -140,10 +508,8 @@ def store_message(
     if avatar is not None:
         new_item["avatar"] = avatar
 
-    history_data.append(new_item)
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=2)
+    _append_record(filepath, new_item)
+    _update_index_entry(conf_uid, history_uid, added_message=new_item)
     logger.debug(f"Successfully stored {role} message")
 
 
@@ -152,16 +518,14 @@ def get_metadata(conf_uid: str, history_uid: str) -> dict:
     if not conf_uid or not history_uid:
         return {}
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
-    if not os.path.exists(filepath):
+    _resolve_history_path(conf_uid, history_uid)
+    metadata_path = _get_safe_metadata_path(conf_uid, history_uid)
+    if not os.path.exists(metadata_path):
         return {}
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            return history_data[0]
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception as e:
         logger.error(f"Failed to get metadata: {e}")
     return {}
@@ -176,28 +540,26 @@ def update_metadate(conf_uid: str, history_uid: str, metadata: dict) -> bool:
     if not conf_uid or not history_uid:
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     if not os.path.exists(filepath):
         return False
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if history_data and history_data[0]["role"] == "metadata":
-            # Update existing metadata while preserving other fields
-            history_data[0].update(metadata)
-        else:
+        existing_metadata = get_metadata(conf_uid, history_uid)
+        if not existing_metadata:
             # Create new metadata with timestamp if none exists
-            new_metadata = {
+            existing_metadata = {
                 "role": "metadata",
                 "timestamp": datetime.now().isoformat(timespec="seconds"),
             }
-            new_metadata.update(metadata)  # Add new fields
-            history_data.insert(0, new_metadata)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
+        # Update existing metadata while preserving other fields
+        existing_metadata.update(metadata)
+        _write_metadata(
+            _get_safe_metadata_path(conf_uid, history_uid), existing_metadata
+        )
+        _update_index_entry(
+            conf_uid, history_uid, created_at=existing_metadata.get("timestamp")
+        )
 
         logger.debug(f"Updated metadata for history {history_uid}")
         return True
@@ -215,21 +577,120 @@ def get_history(conf_uid: str, history_uid: str) -> List[HistoryMessage]:
             logger.warning("Missing history_uid")
         return []
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
 
     if not os.path.exists(filepath):
         logger.warning(f"History file not found: {filepath}")
         return []
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-            # Filter out metadata
-            return [msg for msg in history_data if msg["role"] != "metadata"]
+        return _read_records(filepath)
     except Exception:
         return []
 
 
+def get_history_page(
+    conf_uid: str,
+    history_uid: str,
+    cursor: Optional[int] = None,
+    limit: int = 50,
+    include_system: bool = True,
+) -> tuple[List[HistoryMessage], Optional[int]]:
+    """Read one page of a chat history, newest messages first.
+
+    Args:
+        conf_uid: Configuration ID
+        history_uid: History ID
+        cursor: Cursor returned with the previous page, or None for the newest page
+        limit: Maximum number of messages in the page
+        include_system: Whether system messages are returned. Skipped messages
+            do not count toward the limit.
+
+    Returns:
+        tuple: (messages from newest to oldest, cursor of the next (older) page).
+            The cursor is None when there are no older messages.
+    """
+    if not conf_uid or not history_uid or limit <= 0:
+        return [], None
+
+    filepath = _resolve_history_path(conf_uid, history_uid)
+    if not os.path.exists(filepath):
+        logger.warning(f"History file not found: {filepath}")
+        return [], None
+
+    messages = []
+    oldest_offset = None
+    next_cursor = None
+    try:
+        with open(filepath, "rb") as f:
+            for offset, record in _iter_records_reverse(f, end=cursor):
+                if not include_system and record.get("role") == "system":
+                    continue
+                if len(messages) == limit:
+                    # The next page ends where the oldest returned message starts
+                    next_cursor = oldest_offset
+                    break
+                messages.append(record)
+                oldest_offset = offset
+    except Exception as e:
+        logger.error(f"Failed to read history page: {e}")
+        return [], None
+    return messages, next_cursor
+
+
+def get_recent_history(
+    conf_uid: str,
+    history_uid: str,
+    max_turns: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> List[HistoryMessage]:
+    """Read only the tail of a chat history, in chronological order.
+
+    The file is read backwards, so the cost depends on the size of the window
+    rather than on the length of the history. With no limits set this is
+    equivalent to `get_history`.
+
+    Args:
+        conf_uid: Configuration ID
+        history_uid: History ID
+        max_turns: Keep at most this many turns. A turn starts at a human message
+            and includes every message after it up to the next human message.
+        max_tokens: Keep at most about this many tokens of message content.
+            The newest message is always kept.
+    """
+    if not max_turns and not max_tokens:
+        return get_history(conf_uid, history_uid)
+    if not conf_uid or not history_uid:
+        return []
+
+    filepath = _resolve_history_path(conf_uid, history_uid)
+    if not os.path.exists(filepath):
+        logger.warning(f"History file not found: {filepath}")
+        return []
+
+    messages = []
+    turns = 0
+    tokens = 0
+    try:
+        with open(filepath, "rb") as f:
+            for _, record in _iter_records_reverse(f):
+                if max_tokens:
+                    tokens += estimate_tokens(str(record.get("content", "")))
+                    if tokens > max_tokens and messages:
+                        break
+                messages.append(record)
+                if record.get("role") == "human":
+                    turns += 1
+                    if max_turns and turns >= max_turns:
+                        break
+    except Exception as e:
+        logger.error(f"Failed to read recent history: {e}")
+        return []
+
+    messages.reverse()
+    return messages
+
+
 def delete_history(conf_uid: str, history_uid: str) -> bool:
     """Delete a specific history file"""
     if not conf_uid or not history_uid:
@@ -237,9 +698,18 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
         return False
 
     filepath = _get_safe_history_path(conf_uid, history_uid)
+    legacy_path = _get_safe_history_path(conf_uid, history_uid, LEGACY_SUFFIX)
+    metadata_path = _get_safe_metadata_path(conf_uid, history_uid)
     try:
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        deleted = False
+        for path in (filepath, legacy_path):
+            if os.path.exists(path):
+                os.remove(path)
+                deleted = True
+        if os.path.exists(metadata_path):
+            os.remove(metadata_path)
+        _remove_index_entry(conf_uid, history_uid)
+        if deleted:
             logger.debug(f"Successfully deleted history file: {filepath}")
             return True
     except Exception as e:
@@ -248,52 +718,37 @@ def delete_history(conf_uid: str, history_uid: str) -> bool:
 
 
 def get_history_list(conf_uid: str) -> List[dict]:
-    """Get list of histories with their latest messages"""
+    """Get list of histories with their latest messages.
+
+    Answered from the per-conf history index, so no message file is read.
+    """
     if not conf_uid:
         return []
 
     histories = []
-    conf_dir = _ensure_conf_dir(conf_uid)
     empty_history_uids = []
 
     try:
-        for filename in os.listdir(conf_dir):
-            if not filename.endswith(".json"):
-                continue
-
-            history_uid = filename[:-5]
-            filepath = os.path.join(conf_dir, filename)
+        migrate_legacy_histories(conf_uid)
 
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    messages = json.load(f)
-
-                    # Filter out metadata for checking if history is empty
-                    actual_messages = [
-                        msg for msg in messages if msg["role"] != "metadata"
-                    ]
-                    if not actual_messages:
-                        empty_history_uids.append(history_uid)
-                        continue
-
-                    latest_message = actual_messages[-1]
-                    history_info = {
-                        "uid": history_uid,
-                        "latest_message": latest_message,
-                        "timestamp": (
-                            latest_message["timestamp"] if latest_message else None
-                        ),
-                    }
-                    histories.append(history_info)
-            except Exception as e:
-                logger.error(f"Error reading history file {filename}: {e}")
+        for history_uid, entry in list(_load_index(conf_uid).items()):
+            if not entry.get("message_count") or not entry.get("latest_message"):
+                empty_history_uids.append(history_uid)
                 continue
 
+            histories.append(
+                {
+                    "uid": history_uid,
+                    "latest_message": entry["latest_message"],
+                    "timestamp": entry.get("timestamp"),
+                }
+            )
+
         # Clean up empty histories if there are other non-empty ones
-        if len(empty_history_uids) > 0 and len(os.listdir(conf_dir)) > 1:
+        if len(empty_history_uids) > 0 and len(empty_history_uids) + len(histories) > 1:
             for uid in empty_history_uids:
                 try:
-                    os.remove(os.path.join(conf_dir, f"{uid}.json"))
+                    delete_history(conf_uid, uid)
                     logger.info(f"Removed empty history file: {uid}")
                 except Exception as e:
                     logger.error(f"Failed to remove empty history file {uid}: {e}")
@@ -319,30 +774,32 @@ def modify_latest_message(
         logger.warning("Missing conf_uid or history_uid")
         return False
 
-    filepath = _get_safe_history_path(conf_uid, history_uid)
+    filepath = _resolve_history_path(conf_uid, history_uid)
     if not os.path.exists(filepath):
         logger.warning(f"History file not found: {filepath}")
         return False
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            history_data = json.load(f)
-
-        if not history_data:
-            logger.warning("History is empty")
-            return False
-
-        latest_message = history_data[-1]
-        if latest_message["role"] != role:
-            logger.warning(
-                f"Latest message role ({latest_message['role']}) doesn't match requested role ({role})"
-            )
-            return False
-
-        latest_message["content"] = new_content
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(history_data, f, ensure_ascii=False, indent=2)
-
+        with open(filepath, "rb+") as f:
+            offset, latest_message = _find_last_record(f)
+
+            if not latest_message:
+                logger.warning("History is empty")
+                return False
+
+            if latest_message["role"] != role:
+                logger.warning(
+                    f"Latest message role ({latest_message['role']}) doesn't match requested role ({role})"
+                )
+                return False
+
+            # Only the last line is rewritten
+            latest_message["content"] = new_content
+            f.seek(offset)
+            f.truncate()
+            f.write(_encode_record(latest_message))
+
+        _update_index_entry(conf_uid, history_uid, latest_message=latest_message)
         logger.debug(f"Successfully modified latest {role} message")
         return True
 
@@ -359,12 +816,18 @@ def rename_history_file(
         logger.warning("Missing required parameters for rename")
         return False
 
-    old_filepath = _get_safe_history_path(conf_uid, old_history_uid)
+    old_filepath = _resolve_history_path(conf_uid, old_history_uid)
     new_filepath = _get_safe_history_path(conf_uid, new_history_uid)
+    old_metadata_path = _get_safe_metadata_path(conf_uid, old_history_uid)
+    new_metadata_path = _get_safe_metadata_path(conf_uid, new_history_uid)
 
     try:
         if os.path.exists(old_filepath):
             os.rename(old_filepath, new_filepath)
+            if os.path.exists(old_metadata_path):
+                os.rename(old_metadata_path, new_metadata_path)
+            _remove_index_entry(conf_uid, old_history_uid)
+            _update_index_entry(conf_uid, new_history_uid)
             logger.info(
                 f"Renamed history file from {old_history_uid} to {new_history_uid}"
             )
@@ -372,3 +835,23 @@ def rename_history_file(
     except Exception as e:
         logger.error(f"Failed to rename history file: {e}")
     return False
+
+
+def sync_history_files(conf_uid: str, history_uid: str) -> None:
+    """Flush the message, metadata and index files of a history to disk"""
+    if not conf_uid or not history_uid:
+        return
+
+    paths = [
+        _get_safe_history_path(conf_uid, history_uid),
+        _get_safe_metadata_path(conf_uid, history_uid),
+        _get_index_path(conf_uid),
+    ]
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "ab") as f:
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"Failed to sync history file {path}: {e}")
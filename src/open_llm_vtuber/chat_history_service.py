@@ -0,0 +1,264 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple
+
+from loguru import logger
+
+from . import chat_history_manager as history_store
+
+
+@dataclass
+class _HistoryOperation:
+    """A chat history call waiting to be executed by the writer task"""
+
+    func: Callable
+    kwargs: Dict[str, Any]
+    is_write: bool
+    future: Optional[asyncio.Future] = None
+    result: Any = None
+    error: Optional[BaseException] = field(default=None, repr=False)
+
+
+class ChatHistoryService:
+    """Runs all chat history file I/O off the event loop.
+
+    A single writer task owns the history files. Operations are queued and
+    executed in order in a worker thread, a batch at a time, so reads always
+    observe the writes queued before them. Written files are fsynced at most
+    once per `sync_interval` seconds instead of after every message.
+
+    Message persistence is fire-and-forget: `store_message` only enqueues the
+    write and returns immediately, so conversation code never waits on disk.
+    """
+
+    def __init__(self, sync_interval: float = 1.0, max_batch_size: int = 64):
+        self._sync_interval = sync_interval
+        self._max_batch_size = max_batch_size
+        self._queue: asyncio.Queue[_HistoryOperation] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        # (conf_uid, history_uid) pairs written since the last fsync
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._dirty_lock = threading.Lock()
+        self._last_sync = 0.0
+
+    # ==== Writes
+
+    def store_message(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        role: Literal["human", "ai", "system"],
+        content: str,
+        name: str | None = None,
+        avatar: str | None = None,
+    ) -> None:
+        """Queue a message to be stored without waiting for the write"""
+        if not conf_uid or not history_uid:
+            return
+        self._submit(
+            history_store.store_message,
+            is_write=True,
+            conf_uid=conf_uid,
+            history_uid=history_uid,
+            role=role,
+            content=content,
+            name=name,
+            avatar=avatar,
+        )
+
+    def update_metadate(self, conf_uid: str, history_uid: str, metadata: dict) -> None:
+        """Queue a metadata update without waiting for the write"""
+        self._submit(
+            history_store.update_metadate,
+            is_write=True,
+            conf_uid=conf_uid,
+            history_uid=history_uid,
+            metadata=metadata,
+        )
+
+    def modify_latest_message(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        role: Literal["human", "ai", "system"],
+        new_content: str,
+    ) -> None:
+        """Queue a change of the latest message without waiting for the write"""
+        self._submit(
+            history_store.modify_latest_message,
+            is_write=True,
+            conf_uid=conf_uid,
+            history_uid=history_uid,
+            role=role,
+            new_content=new_content,
+        )
+
+    async def create_new_history(self, conf_uid: str) -> str:
+        """Create a new history and return its history_uid"""
+        return await self._call(
+            history_store.create_new_history, is_write=True, conf_uid=conf_uid
+        )
+
+    async def delete_history(self, conf_uid: str, history_uid: str) -> bool:
+        """Delete a history after all previously queued writes are done"""
+        return await self._call(
+            history_store.delete_history,
+            is_write=True,
+            conf_uid=conf_uid,
+            history_uid=history_uid,
+        )
+
+    # ==== Reads
+
+    async def get_history(
+        self, conf_uid: str, history_uid: str
+    ) -> List[history_store.HistoryMessage]:
+        """Read a chat history, including all previously queued messages"""
+        return await self._call(
+            history_store.get_history, conf_uid=conf_uid, history_uid=history_uid
+        )
+
+    async def get_history_page(
+        self,
+        conf_uid: str,
+        history_uid: str,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+        include_system: bool = True,
+    ) -> Tuple[List[history_store.HistoryMessage], Optional[int]]:
+        """Read one page of a chat history, newest messages first"""
+        return await self._call(
+            history_store.get_history_page,
+            conf_uid=conf_uid,
+            history_uid=history_uid,
+            cursor=cursor,
+            limit=limit,
+            include_system=include_system,
+        )
+
+    async def get_history_list(self, conf_uid: str) -> List[dict]:
+        """Get the list of histories of a conf"""
+        return await self._call(history_store.get_history_list, conf_uid=conf_uid)
+
+    async def get_metadata(self, conf_uid: str, history_uid: str) -> dict:
+        """Get the metadata of a history"""
+        return await self._call(
+            history_store.get_metadata, conf_uid=conf_uid, history_uid=history_uid
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run an arbitrary blocking history read (such as loading agent memory)
+        on the writer thread, after all previously queued writes."""
+        return await self._call(lambda: func(*args, **kwargs))
+
+    async def flush(self) -> None:
+        """Wait until every queued operation is done and fsync written files"""
+        await self._queue.join()
+        if self._dirty:
+            await asyncio.to_thread(self._sync_dirty)
+
+    async def close(self) -> None:
+        """Flush pending operations and stop the writer task"""
+        if self._writer_task and not self._writer_task.done():
+            await self.flush()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self._writer_task = None
+
+    # ==== Internals
+
+    def _submit(
+        self,
+        func: Callable,
+        is_write: bool = False,
+        future: Optional[asyncio.Future] = None,
+        **kwargs,
+    ) -> None:
+        self._ensure_writer_running()
+        self._queue.put_nowait(
+            _HistoryOperation(func=func, kwargs=kwargs, is_write=is_write, future=future)
+        )
+
+    async def _call(self, func: Callable, is_write: bool = False, **kwargs) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._submit(func, is_write=is_write, future=future, **kwargs)
+        return await future
+
+    def _ensure_writer_running(self) -> None:
+        if not self._writer_task or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _writer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            timeout = None
+            if self._dirty:
+                timeout = max(0.0, self._last_sync + self._sync_interval - loop.time())
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._sync_dirty)
+                self._last_sync = loop.time()
+                continue
+
+            batch = [first]
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await asyncio.to_thread(self._run_batch, batch)
+            finally:
+                for operation in batch:
+                    self._resolve(operation)
+                    self._queue.task_done()
+
+            if self._dirty and loop.time() - self._last_sync >= self._sync_interval:
+                await asyncio.to_thread(self._sync_dirty)
+                self._last_sync = loop.time()
+
+    def _run_batch(self, batch: List[_HistoryOperation]) -> None:
+        """Execute a batch of operations in order. Runs in a worker thread."""
+        for operation in batch:
+            try:
+                operation.result = operation.func(**operation.kwargs)
+            except Exception as e:
+                logger.error(f"Chat history operation {operation.func} failed: {e}")
+                operation.error = e
+                continue
+
+            if operation.is_write:
+                conf_uid = operation.kwargs.get("conf_uid")
+                history_uid = operation.kwargs.get("history_uid")
+                if history_uid is None and isinstance(operation.result, str):
+                    # create_new_history returns the new history_uid
+                    history_uid = operation.result
+                if conf_uid and history_uid:
+                    with self._dirty_lock:
+                        self._dirty.add((conf_uid, history_uid))
+
+    @staticmethod
+    def _resolve(operation: _HistoryOperation) -> None:
+        future = operation.future
+        if future is None or future.done():
+            return
+        if operation.error is not None:
+            future.set_exception(operation.error)
+        else:
+            future.set_result(operation.result)
+
+    def _sync_dirty(self) -> None:
+        """fsync every history written since the last sync"""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        for conf_uid, history_uid in dirty:
+            history_store.sync_history_files(conf_uid, history_uid)
+
+
+chat_history_service = ChatHistoryService()
@@ -43,6 +43,7 @@ from .vad import (
     SileroVADConfig,
 )
 from .tts_preprocessor import TTSPreprocessorConfig, TranslatorConfig, DeepLXConfig
+from .backchannel import BackchannelConfig
 from .i18n import I18nMixin, Description, MultiLingualString
 from .agent import (
     AgentConfig,
@@ -112,6 +113,8 @@ __all__ = [
     "TTSPreprocessorConfig",
     "TranslatorConfig",
     "DeepLXConfig",
+    # Backchannel related classes
+    "BackchannelConfig",
     # i18n related classes
     "I18nMixin",
     "Description",
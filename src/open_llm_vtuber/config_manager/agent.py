@@ -33,6 +33,10 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    memory_max_turns: Optional[int] = Field(None, alias="memory_max_turns")
+    memory_max_tokens: Optional[int] = Field(None, alias="memory_max_tokens")
+    memory_token_budget: Optional[int] = Field(None, alias="memory_token_budget")
+    summarize_memory: Optional[bool] = Field(True, alias="summarize_memory")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
@@ -55,6 +59,22 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "memory_max_turns": Description(
+            en="Only load the last N conversation turns of a chat history into memory (0 or empty: no limit)",
+            zh="从聊天记录加载到记忆中时只保留最近 N 轮对话（0 或留空：不限制）",
+        ),
+        "memory_max_tokens": Description(
+            en="Only load about the last N tokens of a chat history into memory (0 or empty: no limit)",
+            zh="从聊天记录加载到记忆中时只保留最近约 N 个 token（0 或留空：不限制）",
+        ),
+        "memory_token_budget": Description(
+            en="Approximate token budget of the agent memory. Older messages beyond it are dropped from the prompt (0 or empty: no limit)",
+            zh="智能体记忆的大致 token 预算，超出部分的旧消息会从提示词中移除（0 或留空：不限制）",
+        ),
+        "summarize_memory": Description(
+            en="Summarize messages dropped by the token budget in the background and keep the summary in the system prompt (default: True)",
+            zh="在后台总结因 token 预算被移除的消息，并将总结保留在系统提示词中（默认：True）",
+        ),
     }
 
 
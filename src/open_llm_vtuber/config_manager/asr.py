@@ -35,6 +35,7 @@ class FasterWhisperConfig(I18nMixin):
     compute_type: Literal["int8", "float16", "float32"] = Field(
         "int8", alias="compute_type"
     )
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_path": Description(
@@ -55,6 +56,10 @@ class FasterWhisperConfig(I18nMixin):
             en="Compute type for the model (int8, float16, or float32)",
             zh="模型的计算类型（int8、float16 或 float32）",
         ),
+        "streaming": Description(
+            en="Show partial transcriptions while the user speaks, by decoding the audio again as it grows",
+            zh="用户说话时随音频增长重复解码，显示部分识别结果",
+        ),
     }
 
 
@@ -195,18 +200,19 @@ class SherpaOnnxASRConfig(I18nMixin):
     num_threads: int = Field(4, alias="num_threads")
     use_itn: bool = Field(True, alias="use_itn")
     provider: Literal["cpu", "cuda", "rocm"] = Field("cpu", alias="provider")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_type": Description(
             en="Type of ASR model to use", zh="要使用的 ASR 模型类型"
         ),
         "encoder": Description(
-            en="Path to encoder model (for transducer)",
-            zh="编码器模型路径（用于 transducer）",
+            en="Path to encoder model (for transducer and streaming paraformer)",
+            zh="编码器模型路径（用于 transducer 和流式 paraformer）",
         ),
         "decoder": Description(
-            en="Path to decoder model (for transducer)",
-            zh="解码器模型路径（用于 transducer）",
+            en="Path to decoder model (for transducer and streaming paraformer)",
+            zh="解码器模型路径（用于 transducer 和流式 paraformer）",
         ),
         "joiner": Description(
             en="Path to joiner model (for transducer)",
@@ -236,17 +242,31 @@ class SherpaOnnxASRConfig(I18nMixin):
             en="Provider for inference (cpu or cuda) (cuda option needs additional settings. Please check our docs)",
             zh="推理平台（cpu 或 cuda）(cuda 需要额外配置，请参考文档)",
         ),
+        "streaming": Description(
+            en="Use a streaming model to transcribe while the user is still speaking (transducer or paraformer)",
+            zh="使用流式模型在用户说话时就开始识别（transducer 或 paraformer）",
+        ),
     }
 
     @model_validator(mode="after")
     def check_model_paths(cls, values: "SherpaOnnxASRConfig", info: ValidationInfo):
         model_type = values.model_type
 
+        if values.streaming and model_type not in ("transducer", "paraformer"):
+            raise ValueError(
+                "streaming is only supported for the transducer and paraformer model types"
+            )
+
         if model_type == "transducer":
             if not all([values.encoder, values.decoder, values.joiner, values.tokens]):
                 raise ValueError(
                     "encoder, decoder, joiner, and tokens must be provided for transducer model type"
                 )
+        elif model_type == "paraformer" and values.streaming:
+            if not all([values.encoder, values.decoder, values.tokens]):
+                raise ValueError(
+                    "encoder, decoder, and tokens must be provided for streaming paraformer models"
+                )
         elif model_type == "paraformer":
             if not all([values.paraformer, values.tokens]):
                 raise ValueError(
@@ -0,0 +1,32 @@
+# config_manager/backchannel.py
+from typing import ClassVar, Dict, List
+
+from pydantic import Field
+
+from .i18n import I18nMixin, Description
+
+
+class BackchannelConfig(I18nMixin):
+    """Configuration of filler clips played while the reply is being prepared."""
+
+    enabled: bool = Field(False, alias="enabled")
+    delay_ms: int = Field(1500, alias="delay_ms")
+    fillers: List[str] = Field(
+        default_factory=lambda: ["Hmm...", "Let me think.", "Well..."],
+        alias="fillers",
+    )
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Play a short filler clip when the reply takes a while to start",
+            zh="回复迟迟未开始时播放一段简短的填充语音",
+        ),
+        "delay_ms": Description(
+            en="Milliseconds without reply audio after the conversation starts before a filler is played",
+            zh="对话开始后多少毫秒仍没有回复音频时播放填充语音",
+        ),
+        "fillers": Description(
+            en="Filler lines, synthesized at startup. Emotion keywords like [joy] set the Live2D expression",
+            zh="填充语句，在启动时合成。[joy] 等情绪关键词用于设置 Live2D 表情",
+        ),
+    }
@@ -6,6 +6,7 @@ from .asr import ASRConfig
 from .tts import TTSConfig
 from .vad import VADConfig
 from .tts_preprocessor import TTSPreprocessorConfig
+from .backchannel import BackchannelConfig
 
 from .agent import AgentConfig
 
@@ -27,6 +28,9 @@ class CharacterConfig(I18nMixin):
     tts_preprocessor_config: TTSPreprocessorConfig = Field(
         ..., alias="tts_preprocessor_config"
     )
+    backchannel_config: BackchannelConfig = Field(
+        default_factory=BackchannelConfig, alias="backchannel_config"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_name": Description(
@@ -61,6 +65,10 @@ class CharacterConfig(I18nMixin):
             en="Configuration for Text-to-Speech Preprocessor",
             zh="语音合成预处理器配置",
         ),
+        "backchannel_config": Description(
+            en="Configuration for filler clips played before the reply",
+            zh="回复前播放的填充语音配置",
+        ),
         "human_name": Description(
             en="Name of the human user in conversation", zh="对话中人类用户的名字"
         ),
@@ -1,6 +1,6 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, Literal
 from .i18n import I18nMixin, Description
 
 
@@ -13,6 +13,16 @@ class SystemConfig(I18nMixin):
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
     enable_proxy: bool = Field(False, alias="enable_proxy")
+    tts_cache_memory_mb: float = Field(64, alias="tts_cache_memory_mb")
+    tts_cache_disk_mb: float = Field(512, alias="tts_cache_disk_mb")
+    tts_cache_dir: str = Field("tts_cache", alias="tts_cache_dir")
+    audio_codec: Literal["wav", "opus"] = Field("wav", alias="audio_codec")
+    opus_bitrate_kbps: int = Field(32, alias="opus_bitrate_kbps")
+    warm_up: bool = Field(True, alias="warm_up")
+    mic_buffer_max_seconds: float = Field(60.0, alias="mic_buffer_max_seconds")
+    mic_buffer_overflow: Literal["drop_oldest", "drop_newest"] = Field(
+        "drop_oldest", alias="mic_buffer_overflow"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -29,6 +39,41 @@ class SystemConfig(I18nMixin):
             en="Enable proxy mode for multiple clients",
             zh="启用代理模式以支持多个客户端使用一个 ws 连接",
         ),
+        "tts_cache_memory_mb": Description(
+            en="Size of the in-memory TTS audio cache in MB (0 to disable)",
+            zh="内存中 TTS 音频缓存的大小（MB，0 表示禁用）",
+        ),
+        "tts_cache_disk_mb": Description(
+            en="Size of the on-disk TTS audio cache in MB (0 to disable)",
+            zh="磁盘上 TTS 音频缓存的大小（MB，0 表示禁用）",
+        ),
+        "tts_cache_dir": Description(
+            en="Directory of the on-disk TTS audio cache, kept across restarts",
+            zh="磁盘 TTS 音频缓存的目录，重启后保留",
+        ),
+        "audio_codec": Description(
+            en=(
+                "Codec of speech for clients that negotiate without naming one: "
+                "wav or opus. Clients that never negotiate get wav"
+            ),
+            zh="协商格式但未指定编码的客户端使用的语音编码：wav 或 opus，从不协商的客户端收到 wav",
+        ),
+        "opus_bitrate_kbps": Description(
+            en="Bitrate of Opus encoded speech in kbit/s per channel",
+            zh="Opus 编码语音的码率（每声道 kbit/s）",
+        ),
+        "warm_up": Description(
+            en="Run a short request through the ASR, TTS and VAD engines when they are loaded",
+            zh="加载 ASR、TTS 和 VAD 引擎时先运行一次简短的请求进行预热",
+        ),
+        "mic_buffer_max_seconds": Description(
+            en="Longest utterance of microphone audio kept for speech recognition, in seconds",
+            zh="为语音识别保留的单次麦克风语音的最长时长（秒）",
+        ),
+        "mic_buffer_overflow": Description(
+            en="Audio kept of longer utterances: drop_oldest keeps the end, drop_newest the start",
+            zh="更长的语音保留哪部分：drop_oldest 保留结尾，drop_newest 保留开头",
+        ),
     }
 
     @model_validator(mode="after")
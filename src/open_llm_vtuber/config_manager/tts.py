@@ -410,6 +410,11 @@ class TTSConfig(I18nMixin):
         "spark_tts",
         "minimax_tts",
     ] = Field(..., alias="tts_model")
+    max_concurrency: int = Field(2, alias="max_concurrency")
+    lookahead: int = Field(3, alias="lookahead")
+    process_workers: int = Field(0, alias="process_workers")
+    coalesce_max_chars: int = Field(60, alias="coalesce_max_chars")
+    coalesce_deadline_ms: int = Field(200, alias="coalesce_deadline_ms")
 
     azure_tts: Optional[AzureTTSConfig] = Field(None, alias="azure_tts")
     bark_tts: Optional[BarkTTSConfig] = Field(None, alias="bark_tts")
@@ -432,6 +437,26 @@ class TTSConfig(I18nMixin):
         "tts_model": Description(
             en="Text-to-speech model to use", zh="要使用的文本转语音模型"
         ),
+        "max_concurrency": Description(
+            en="Maximum number of sentences synthesized at the same time",
+            zh="同时合成的最大句子数",
+        ),
+        "lookahead": Description(
+            en="Sentences that may be synthesized ahead of the next one to be sent (0 for no limit)",
+            zh="可提前于下一句待发送句子合成的句子数（0 表示不限制）",
+        ),
+        "process_workers": Description(
+            en="Run local TTS engines in this many worker processes instead of threads (0 to disable, ignored for API engines)",
+            zh="在多少个工作进程中运行本地 TTS 引擎，而不是线程（0 表示禁用，API 引擎会忽略此项）",
+        ),
+        "coalesce_max_chars": Description(
+            en="Merge consecutive short sentences into one TTS request of up to this many characters (0 to disable)",
+            zh="将连续的短句合并为一次最多包含这么多字符的 TTS 请求（0 表示禁用）",
+        ),
+        "coalesce_deadline_ms": Description(
+            en="Longest time in milliseconds a sentence waits to be merged with the next one, the first sentence of a reply does not wait",
+            zh="句子等待与下一句合并的最长时间（毫秒），回复的第一句不会等待",
+        ),
         "azure_tts": Description(en="Configuration for Azure TTS", zh="Azure TTS 配置"),
         "bark_tts": Description(en="Configuration for Bark TTS", zh="Bark TTS 配置"),
         "edge_tts": Description(en="Configuration for Edge TTS", zh="Edge TTS 配置"),
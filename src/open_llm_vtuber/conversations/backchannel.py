@@ -0,0 +1,88 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import List, Optional
+
+from loguru import logger
+
+from ..agent.output_types import Actions, DisplayText
+from ..live2d_model import Live2dModel
+from ..tts.tts_interface import TTSAudio, TTSInterface
+
+
+@dataclass
+class FillerClip:
+    """A filler line with its synthesized audio"""
+
+    display_text: DisplayText
+    actions: Optional[Actions]
+    audio: TTSAudio
+
+
+class BackchannelBank:
+    """
+    Filler clips ("hmm", "let me think") of one character, synthesized ahead
+    of time so one can be played instantly while the reply is being prepared.
+    """
+
+    def __init__(self, clips: List[FillerClip], source: tuple):
+        self.clips = clips
+        # What the clips were made from, to know when to build them again
+        self.source = source
+        self._last: Optional[FillerClip] = None
+
+    def pick(self) -> Optional[FillerClip]:
+        """Pick a random clip, avoiding the one picked last time"""
+        choices = [clip for clip in self.clips if clip is not self._last]
+        if not choices:
+            choices = self.clips
+        if not choices:
+            return None
+        self._last = random.choice(choices)
+        return self._last
+
+    @classmethod
+    async def build(
+        cls,
+        fillers: List[str],
+        tts_engine: TTSInterface,
+        live2d_model: Optional[Live2dModel],
+        character_name: str,
+        avatar: Optional[str],
+        source: tuple,
+    ) -> "BackchannelBank":
+        """
+        Synthesize the filler lines with the TTS engine of the character.
+
+        Emotion keywords in a line become the expressions of its clip. Lines
+        that fail to synthesize are left out.
+        """
+        clips = []
+        for line in fillers:
+            expressions = live2d_model.extract_emotion(line) if live2d_model else []
+            text = (
+                live2d_model.remove_emotion_keywords(line) if live2d_model else line
+            ).strip()
+            if not text:
+                continue
+            try:
+                # The synchronous API: this runs before the server's event loop
+                # exists, see ServiceContext.warm_up
+                audio = await asyncio.to_thread(tts_engine.generate_audio_data, text)
+            except Exception as e:
+                logger.warning(f"Failed to synthesize filler '{text}': {e}")
+                continue
+            if audio is None:
+                logger.warning(f"Failed to synthesize filler '{text}'")
+                continue
+            clips.append(
+                FillerClip(
+                    display_text=DisplayText(
+                        text=text, name=character_name, avatar=avatar
+                    ),
+                    actions=Actions(expressions=expressions) if expressions else None,
+                    audio=audio,
+                )
+            )
+        logger.info(f"Synthesized {len(clips)}/{len(fillers)} filler clips")
+        return cls(clips, source)
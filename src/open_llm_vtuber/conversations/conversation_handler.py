@@ -7,11 +7,13 @@ from fastapi import WebSocket
 from loguru import logger
 
 from ..chat_group import ChatGroupManager
-from ..chat_history_manager import store_message
+from ..chat_history_service import chat_history_service
 from ..service_context import ServiceContext
+from ..utils.audio_buffer import AudioBuffer
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
 from .conversation_utils import EMOJI_LIST
+from .partial_transcription import PartialTranscriber
 from .types import GroupConversationState
 from prompts import prompt_loader
 
@@ -25,7 +27,8 @@ async def handle_conversation_trigger(
     client_contexts: Dict[str, ServiceContext],
     client_connections: Dict[str, WebSocket],
     chat_group_manager: ChatGroupManager,
-    received_data_buffers: Dict[str, np.ndarray],
+    received_data_buffers: Dict[str, AudioBuffer],
+    partial_transcribers: Dict[str, PartialTranscriber],
     current_conversation_tasks: Dict[str, Optional[asyncio.Task]],
     broadcast_to_group: Callable,
 ) -> None:
@@ -65,8 +68,10 @@ async def handle_conversation_trigger(
     elif msg_type == "text-input":
         user_input = data.get("text", "")
     else:  # mic-audio-end
-        user_input = received_data_buffers[client_uid]
-        received_data_buffers[client_uid] = np.array([])
+        # A view of the utterance, the buffer starts a new one
+        audio = received_data_buffers[client_uid].take()
+        transcriber = partial_transcribers.pop(client_uid, None)
+        user_input = transcriber.end_utterance(audio) if transcriber else audio
 
     images = data.get("images")
     session_emoji = np.random.choice(EMOJI_LIST)
@@ -94,6 +99,9 @@ async def handle_conversation_trigger(
                     metadata=metadata,
                 )
             )
+        elif isinstance(user_input, PartialTranscriber):
+            # The group is busy and the utterance is dropped
+            user_input.cancel()
     else:
         # Use client_uid as task key for individual conversations
         current_conversation_tasks[client_uid] = asyncio.create_task(
@@ -127,7 +135,7 @@ async def handle_individual_interrupt(
             logger.error(f"Error handling interrupt: {e}")
 
         if context.history_uid:
-            store_message(
+            chat_history_service.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
@@ -135,7 +143,7 @@ async def handle_individual_interrupt(
                 name=context.character_config.character_name,
                 avatar=context.character_config.avatar,
             )
-            store_message(
+            chat_history_service.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="system",
@@ -187,7 +195,7 @@ async def handle_group_interrupt(
                 try:
                     member_ctx = client_contexts[member_uid]
                     member_ctx.agent_engine.handle_interrupt(heard_response)
-                    store_message(
+                    chat_history_service.store_message(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="ai",
@@ -195,7 +203,7 @@ async def handle_group_interrupt(
                         name=context.character_config.character_name,
                         avatar=context.character_config.avatar,
                     )
-                    store_message(
+                    chat_history_service.store_message(
                         conf_uid=member_ctx.character_config.conf_uid,
                         history_uid=member_ctx.history_uid,
                         role="system",
@@ -8,6 +8,7 @@ from loguru import logger
 from ..message_handler import message_handler
 from .types import WebSocketSend, BroadcastContext
 from .tts_manager import TTSTaskManager
+from .partial_transcription import PartialTranscriber
 from ..agent.output_types import SentenceOutput, AudioOutput
 from ..agent.input_types import BatchInput, TextData, ImageData, TextSource, ImageSource
 from ..asr.asr_interface import ASRInterface
@@ -146,11 +147,18 @@ async def send_conversation_start_signals(websocket_send: WebSocketSend) -> None
 
 
 async def process_user_input(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, PartialTranscriber],
     asr_engine: ASRInterface,
     websocket_send: WebSocketSend,
 ) -> str:
     """Process user input, converting audio to text if needed"""
+    if isinstance(user_input, PartialTranscriber):
+        # Most of the utterance was transcribed while it was spoken
+        input_text = await user_input.transcribe()
+        await websocket_send(
+            json.dumps({"type": "user-input-transcription", "text": input_text})
+        )
+        return input_text
     if isinstance(user_input, np.ndarray):
         logger.info("Transcribing audio input...")
         input_text = await asr_engine.async_transcribe_np(user_input)
@@ -168,6 +176,7 @@ async def finalize_conversation_turn(
     broadcast_ctx: Optional[BroadcastContext] = None,
 ) -> None:
     """Finalize a conversation turn"""
+    await tts_manager.flush()
     if tts_manager.task_list:
         await asyncio.gather(*tts_manager.task_list)
         await websocket_send(json.dumps({"type": "backend-synth-complete"}))
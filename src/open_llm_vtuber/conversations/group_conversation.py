@@ -15,6 +15,7 @@ from .conversation_utils import (
     cleanup_conversation,
     EMOJI_LIST,
 )
+from .partial_transcription import PartialTranscriber
 from .types import (
     BroadcastFunc,
     GroupConversationState,
@@ -22,7 +23,7 @@ from .types import (
     WebSocketSend,
 )
 from ..service_context import ServiceContext
-from ..chat_history_manager import store_message
+from ..chat_history_service import chat_history_service
 from .tts_manager import TTSTaskManager
 
 
@@ -32,7 +33,7 @@ async def process_group_conversation(
     broadcast_func: BroadcastFunc,
     group_members: List[str],
     initiator_client_uid: str,
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, PartialTranscriber],
     images: Optional[List[Dict[str, Any]]] = None,
     session_emoji: str = np.random.choice(EMOJI_LIST),
     metadata: Optional[Dict[str, Any]] = None,
@@ -51,7 +52,20 @@ async def process_group_conversation(
         metadata: Optional metadata for special processing flags
     """
     # Create TTSTaskManager for each member
-    tts_managers = {uid: TTSTaskManager() for uid in group_members}
+    tts_managers = {
+        uid: TTSTaskManager(
+            audio_format=client_contexts[uid].audio_stream_format,
+            websocket_send_bytes=client_connections[uid].send_bytes,
+            lookahead=client_contexts[uid].character_config.tts_config.lookahead,
+            coalesce_max_chars=client_contexts[
+                uid
+            ].character_config.tts_config.coalesce_max_chars,
+            coalesce_deadline_ms=client_contexts[
+                uid
+            ].character_config.tts_config.coalesce_deadline_ms,
+        )
+        for uid in group_members
+    }
 
     try:
         logger.info(f"Group Conversation Chain {session_emoji} started!")
@@ -93,7 +107,7 @@ async def process_group_conversation(
         if not skip_history:
             for member_uid in group_members:
                 member_context = client_contexts[member_uid]
-                store_message(
+                chat_history_service.store_message(
                     conf_uid=member_context.character_config.conf_uid,
                     history_uid=member_context.history_uid,
                     role="human",
@@ -189,7 +203,7 @@ def init_group_conversation_contexts(
 
 
 async def process_group_input(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, PartialTranscriber],
     initiator_context: ServiceContext,
     initiator_ws_send: WebSocketSend,
     broadcast_func: BroadcastFunc,
@@ -267,6 +281,8 @@ async def handle_group_member_turn(
         group_members=group_members,
     )
 
+    await tts_manager.flush()
+
     if tts_manager.task_list:
         await asyncio.gather(*tts_manager.task_list)
         await current_ws_send(json.dumps({"type": "backend-synth-complete"}))
@@ -291,7 +307,7 @@ async def handle_group_member_turn(
 
         for member_uid in group_members:
             member_context = client_contexts[member_uid]
-            store_message(
+            chat_history_service.store_message(
                 conf_uid=member_context.character_config.conf_uid,
                 history_uid=member_context.history_uid,
                 role="ai",
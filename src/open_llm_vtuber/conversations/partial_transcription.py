@@ -0,0 +1,111 @@
+import asyncio
+import json
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from ..asr.asr_interface import ASRInterface, ASRStream
+from .types import WebSocketSend
+
+
+class PartialTranscriber:
+    """
+    Transcribes an utterance while the user is still speaking.
+
+    Audio fed to it is decoded by a streaming ASR stream in a worker thread,
+    one batch at a time. Audio arriving while a batch is being decoded joins
+    the next batch, so a slow model falls behind by batches, not by frames.
+    Every new partial transcription is sent to the client as a
+    `user-input-partial` message. When the utterance ends only the audio not
+    decoded yet is left, so the final transcription is ready shortly after.
+    """
+
+    def __init__(
+        self,
+        asr_engine: ASRInterface,
+        stream: ASRStream,
+        websocket_send: WebSocketSend,
+    ):
+        self.asr_engine = asr_engine
+        self.stream = stream
+        self.websocket_send = websocket_send
+        # No more audio will be fed, set when the utterance has ended
+        self.closed = False
+        self.utterance: Optional[np.ndarray] = None
+        self._pending: List[np.ndarray] = []
+        self._worker: Optional[asyncio.Task] = None
+        self._failed = False
+
+    @classmethod
+    def start(
+        cls, asr_engine: Optional[ASRInterface], websocket_send: WebSocketSend
+    ) -> Optional["PartialTranscriber"]:
+        """A transcriber for a new utterance, None if the ASR engine cannot stream"""
+        stream = asr_engine.start_stream() if asr_engine else None
+        if stream is None:
+            return None
+        return cls(asr_engine, stream, websocket_send)
+
+    def feed(self, audio: np.ndarray) -> None:
+        """Queue the next float32 samples of the utterance for decoding"""
+        if self.closed or self._failed or not len(audio):
+            return
+        self._pending.append(audio)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._decode_pending())
+
+    async def _decode_pending(self) -> None:
+        while self._pending:
+            audio = np.concatenate(self._pending)
+            self._pending.clear()
+            try:
+                text = await asyncio.to_thread(self.stream.feed, audio)
+            except Exception as e:
+                logger.error(f"Streaming transcription failed: {e}")
+                self._failed = True
+                self._pending.clear()
+                return
+
+            if text is not None:
+                try:
+                    await self.websocket_send(
+                        json.dumps({"type": "user-input-partial", "text": text})
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to send partial transcription: {e}")
+
+    def close(self) -> None:
+        """The utterance has ended, ignore any further audio"""
+        self.closed = True
+
+    def end_utterance(self, audio: np.ndarray) -> "PartialTranscriber":
+        """
+        Close the transcriber with the complete utterance, which is
+        transcribed as a whole instead if streaming failed.
+        """
+        self.close()
+        self.utterance = audio
+        return self
+
+    async def transcribe(self) -> str:
+        """Wait for the final transcription of the utterance"""
+        if self._worker is not None:
+            await self._worker
+        if not self._failed:
+            try:
+                return await asyncio.to_thread(self.stream.finalize)
+            except Exception as e:
+                logger.error(f"Streaming transcription failed: {e}")
+
+        if self.utterance is None or not len(self.utterance):
+            return ""
+        logger.info("Transcribing audio input...")
+        return await self.asr_engine.async_transcribe_np(self.utterance)
+
+    def cancel(self) -> None:
+        """Stop decoding an utterance that is discarded"""
+        self.close()
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
@@ -13,9 +13,10 @@ from .conversation_utils import (
     cleanup_conversation,
     EMOJI_LIST,
 )
+from .partial_transcription import PartialTranscriber
 from .types import WebSocketSend
 from .tts_manager import TTSTaskManager
-from ..chat_history_manager import store_message
+from ..chat_history_service import chat_history_service
 from ..service_context import ServiceContext
 
 # Import necessary types from agent outputs
@@ -26,7 +27,7 @@ async def process_single_conversation(
     context: ServiceContext,
     websocket_send: WebSocketSend,
     client_uid: str,
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, PartialTranscriber],
     images: Optional[List[Dict[str, Any]]] = None,
     session_emoji: str = np.random.choice(EMOJI_LIST),
     metadata: Optional[Dict[str, Any]] = None,
@@ -46,7 +47,13 @@ async def process_single_conversation(
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(
+        audio_format=context.audio_stream_format,
+        websocket_send_bytes=context.send_bytes,
+        lookahead=context.character_config.tts_config.lookahead,
+        coalesce_max_chars=context.character_config.tts_config.coalesce_max_chars,
+        coalesce_deadline_ms=context.character_config.tts_config.coalesce_deadline_ms,
+    )
     full_response = ""  # Initialize full_response here
 
     try:
@@ -54,6 +61,15 @@ async def process_single_conversation(
         await send_conversation_start_signals(websocket_send)
         logger.info(f"New Conversation Chain {session_emoji} started!")
 
+        # Mask the time to the first reply audio with a filler clip
+        filler = context.backchannel_bank.pick() if context.backchannel_bank else None
+        if filler:
+            tts_manager.schedule_filler(
+                filler,
+                delay=context.character_config.backchannel_config.delay_ms / 1000,
+                websocket_send=websocket_send,
+            )
+
         # Process user input
         input_text = await process_user_input(
             user_input, context.asr_engine, websocket_send
@@ -70,7 +86,7 @@ async def process_single_conversation(
         # Store user message (check if we should skip storing to history)
         skip_history = metadata and metadata.get("skip_history", False)
         if context.history_uid and not skip_history:
-            store_message(
+            chat_history_service.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="human",
@@ -138,9 +154,12 @@ async def process_single_conversation(
         # --- End processing agent response ---
 
         # Wait for any pending TTS tasks
+        await tts_manager.flush()
         if tts_manager.task_list:
             await asyncio.gather(*tts_manager.task_list)
             await websocket_send(json.dumps({"type": "backend-synth-complete"}))
+        # The whole reply is queued, a filler would only come after it
+        tts_manager.cancel_filler()
 
         await finalize_conversation_turn(
             tts_manager=tts_manager,
@@ -149,7 +168,7 @@ async def process_single_conversation(
         )
 
         if context.history_uid and full_response:  # Check full_response before storing
-            store_message(
+            chat_history_service.store_message(
                 conf_uid=context.character_config.conf_uid,
                 history_uid=context.history_uid,
                 role="ai",
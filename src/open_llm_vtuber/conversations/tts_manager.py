@@ -1,31 +1,134 @@
 import asyncio
 import json
 import re
-import uuid
-from datetime import datetime
-from typing import List, Optional, Dict
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, List, Optional, Dict, Set, Tuple, Union
+import numpy as np
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
-from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
+from ..tts.tts_cache import tts_cache
+from ..tts.tts_interface import (
+    CancelToken,
+    TTSAudio,
+    TTSInterface,
+    set_cancel_token,
+)
+from ..utils.stream_audio import (
+    AudioStreamFormat,
+    StreamingAudioFrames,
+    prepare_audio_frame,
+    prepare_audio_payload,
+)
+from .backchannel import FillerClip
+from .tts_scheduler import get_tts_scheduler
 from .types import WebSocketSend
 
 
+@dataclass
+class SynthesisMetrics:
+    """Counters of synthesis work, to see how much is thrown away on interrupts"""
+
+    completed: int = 0
+    cancelled: int = 0
+    # Time spent synthesizing sentences that were delivered
+    synthesis_seconds: float = 0.0
+    # Time spent synthesizing sentences that were cancelled, including overrun
+    wasted_seconds: float = 0.0
+    # Time engine threads kept running after their sentence was cancelled
+    overrun_seconds: float = 0.0
+
+    def __post_init__(self):
+        # Overruns are reported from worker threads
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, cancelled: bool) -> None:
+        with self._lock:
+            if cancelled:
+                self.cancelled += 1
+                self.wasted_seconds += seconds
+            else:
+                self.completed += 1
+                self.synthesis_seconds += seconds
+
+    def record_overrun(self, seconds: float) -> None:
+        with self._lock:
+            self.overrun_seconds += seconds
+            self.wasted_seconds += seconds
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return asdict(self)
+
+
+synthesis_metrics = SynthesisMetrics()
+
+
+def _join_sentences(first: str, second: str) -> str:
+    """Join two sentences, with a space unless the text is CJK"""
+    if not first or not second:
+        return first or second
+    if first[-1].isascii() or second[0].isascii():
+        return f"{first} {second}"
+    return first + second
+
+
 class TTSTaskManager:
     """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        audio_format: Optional[AudioStreamFormat] = None,
+        websocket_send_bytes: Optional[Callable[[bytes], Awaitable[None]]] = None,
+        lookahead: int = 0,
+        coalesce_max_chars: int = 0,
+        coalesce_deadline_ms: int = 0,
+    ) -> None:
+        """
+        Args:
+            audio_format: Audio format negotiated by the client. Audio is sent
+                as binary frames if it asks for the binary transport.
+            websocket_send_bytes: WebSocket function to send binary messages,
+                required for the binary transport
+            lookahead: How many sentences past the next one to be sent may be
+                synthesized ahead of time, 0 for no limit
+            coalesce_max_chars: Consecutive short sentences are merged into one
+                synthesis of up to this many characters, 0 to disable
+            coalesce_deadline_ms: Longest time a sentence waits for the next
+                one to be merged with it
+        """
+        self._audio_format = audio_format or AudioStreamFormat()
+        self._send_bytes = websocket_send_bytes
+        if self._audio_format.is_binary and not self._send_bytes:
+            logger.warning("Binary audio requested without a bytes sender, using JSON")
+            self._audio_format = AudioStreamFormat()
         self.task_list: List[asyncio.Task] = []
         self._lock = asyncio.Lock()
-        # Queue to store ordered payloads
-        self._payload_queue: asyncio.Queue[Dict] = asyncio.Queue()
+        # Queue of (payload, sequence, is_last). A payload is a JSON payload or
+        # a binary audio frame; a streamed sentence puts several frames and
+        # marks the last one with is_last.
+        self._payload_queue: asyncio.Queue = asyncio.Queue()
         # Task to handle sending payloads in order
         self._sender_task: Optional[asyncio.Task] = None
         # Counter for maintaining order
         self._sequence_counter = 0
         self._next_sequence_to_send = 0
+        self._lookahead = lookahead
+        # Notified whenever _next_sequence_to_send advances
+        self._progress = asyncio.Condition()
+        self._coalesce_max_chars = coalesce_max_chars
+        self._coalesce_deadline = max(0, coalesce_deadline_ms) / 1000
+        # Sentences waiting to be merged, and the arguments to speak them with
+        self._pending: List[Tuple[str, DisplayText, Optional[Actions]]] = []
+        self._pending_target: Optional[tuple] = None
+        self._flush_timer: Optional[asyncio.Task] = None
+        # Filler clip waiting to be played, see schedule_filler
+        self._filler_task: Optional[asyncio.Task] = None
+        # Whether any payload of the reply has been sent
+        self._reply_started = False
 
     async def speak(
         self,
@@ -37,7 +140,16 @@ class TTSTaskManager:
         websocket_send: WebSocketSend,
     ) -> None:
         """
-        Queue a TTS task while maintaining order of delivery.
+        Queue a sentence for TTS while maintaining order of delivery.
+
+        With coalescing enabled, short sentences are held back for up to the
+        coalescing deadline and merged with the sentences that follow, so that
+        several of them cost one synthesis request. A sentence is only held
+        back while earlier ones are still on their way to the client, so the
+        wait overlaps with them; the first sentence of a reply is never
+        delayed. Actions are played when their clip starts, so a sentence
+        with actions is never merged into the sentences before it. Call
+        `flush` once the agent output has ended.
 
         Args:
             tts_text: Text to synthesize
@@ -47,6 +159,73 @@ class TTSTaskManager:
             tts_engine: TTS engine instance
             websocket_send: WebSocket send function
         """
+        target = (live2d_model, tts_engine, websocket_send)
+        if self._coalesce_max_chars <= 0:
+            await self._queue_sentence(tts_text, display_text, actions, *target)
+            return
+
+        if self._pending and (
+            self._pending_length() + len(tts_text) > self._coalesce_max_chars
+            or self._pending[0][1].name != display_text.name
+            or self._pending_target != target
+            or actions is not None
+        ):
+            await self.flush()
+
+        if not self._pending and (
+            len(tts_text) >= self._coalesce_max_chars
+            # Nothing is left to send, waiting would delay the audio
+            or self._next_sequence_to_send == self._sequence_counter
+        ):
+            await self._queue_sentence(tts_text, display_text, actions, *target)
+            return
+
+        self._pending.append((tts_text, display_text, actions))
+        self._pending_target = target
+        if len(self._pending) == 1:
+            self._flush_timer = asyncio.create_task(self._flush_after_deadline())
+
+    def _pending_length(self) -> int:
+        return sum(len(tts_text) for tts_text, _, _ in self._pending)
+
+    async def _flush_after_deadline(self) -> None:
+        await asyncio.sleep(self._coalesce_deadline)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Queue the sentences held back for coalescing as one TTS task"""
+        if self._flush_timer and self._flush_timer is not asyncio.current_task():
+            self._flush_timer.cancel()
+        self._flush_timer = None
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        # Only the first sentence of a group can have actions, see speak
+        tts_text, display_text, actions = pending[0]
+        for next_tts_text, next_display_text, _ in pending[1:]:
+            tts_text = _join_sentences(tts_text, next_tts_text)
+            display_text = DisplayText(
+                text=_join_sentences(display_text.text, next_display_text.text),
+                name=display_text.name,
+                avatar=display_text.avatar,
+            )
+        if len(pending) > 1:
+            logger.debug(f"Coalesced {len(pending)} sentences into one TTS task")
+        await self._queue_sentence(
+            tts_text, display_text, actions, *self._pending_target
+        )
+
+    async def _queue_sentence(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        live2d_model: Live2dModel,
+        tts_engine: TTSInterface,
+        websocket_send: WebSocketSend,
+    ) -> None:
+        """Queue a TTS task for one (possibly merged) sentence"""
         if len(re.sub(r'[\s.,!?，。！？\'"』」）】\s]+', "", tts_text)) == 0:
             logger.debug("Empty TTS text, sending silent display payload")
             # Get current sequence number for silent payload
@@ -89,30 +268,125 @@ class TTSTaskManager:
         )
         self.task_list.append(task)
 
+    def schedule_filler(
+        self, clip: FillerClip, delay: float, websocket_send: WebSocketSend
+    ) -> None:
+        """
+        Play a filler clip if no reply audio has been sent after `delay` seconds.
+
+        The clip is sent ahead of the reply sentences, and dropped if the reply
+        has started by the time it is ready to be sent.
+        """
+        self.cancel_filler()
+        self._filler_task = asyncio.create_task(
+            self._play_filler_after(clip, delay, websocket_send)
+        )
+
+    def cancel_filler(self) -> None:
+        """Stop a scheduled filler clip that has not been sent yet"""
+        if self._filler_task and not self._filler_task.done():
+            self._filler_task.cancel()
+        self._filler_task = None
+
+    async def _play_filler_after(
+        self, clip: FillerClip, delay: float, websocket_send: WebSocketSend
+    ) -> None:
+        await asyncio.sleep(delay)
+        if self._reply_started:
+            return
+        try:
+            if self._audio_format.is_binary:
+                payload = await asyncio.to_thread(
+                    prepare_audio_frame,
+                    audio_path=clip.audio,
+                    display_text=clip.display_text,
+                    actions=clip.actions,
+                    audio_format=self._audio_format,
+                )
+            else:
+                payload = await asyncio.to_thread(
+                    prepare_audio_payload,
+                    audio_path=clip.audio,
+                    display_text=clip.display_text,
+                    actions=clip.actions,
+                    audio_format=self._audio_format,
+                )
+        except Exception as e:
+            logger.error(f"Error preparing filler payload: {e}")
+            return
+        logger.debug(f"Playing filler: {clip.display_text.text}")
+        if not self._sender_task or self._sender_task.done():
+            self._sender_task = asyncio.create_task(
+                self._process_payload_queue(websocket_send)
+            )
+        # No sequence number: the sender plays it only before the reply
+        await self._payload_queue.put((payload, None, True))
+
     async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
         """
         Process and send payloads in correct order.
         Runs continuously until all payloads are processed.
+
+        The chunks of the sentence being played are sent as soon as they
+        arrive; chunks of later sentences wait until every earlier sentence
+        has been sent completely.
         """
-        buffered_payloads: Dict[int, Dict] = {}
+        buffered_payloads: Dict[int, List[Union[Dict, bytes]]] = {}
+        finished: Set[int] = set()
 
         while True:
             try:
                 # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+                payload, sequence_number, is_last = await self._payload_queue.get()
+                if sequence_number is None:
+                    # A filler clip, too late once the reply has started
+                    if not self._reply_started:
+                        await self._send_payload(payload, websocket_send)
+                    self._payload_queue.task_done()
+                    continue
+                buffered_payloads.setdefault(sequence_number, []).append(payload)
+                if is_last:
+                    finished.add(sequence_number)
 
                 # Send payloads in order
                 while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
+                    sequence = self._next_sequence_to_send
+                    for next_payload in buffered_payloads.pop(sequence):
+                        if not self._reply_started:
+                            self._reply_started = True
+                            self.cancel_filler()
+                        await self._send_payload(next_payload, websocket_send)
+                    if sequence not in finished:
+                        # Keep the slot open for the rest of the sentence
+                        buffered_payloads[sequence] = []
+                        break
+                    finished.discard(sequence)
                     self._next_sequence_to_send += 1
+                    async with self._progress:
+                        self._progress.notify_all()
 
                 self._payload_queue.task_done()
 
             except asyncio.CancelledError:
                 break
 
+    async def _send_payload(
+        self, payload: Union[Dict, bytes], websocket_send: WebSocketSend
+    ) -> None:
+        """
+        Send a JSON payload or a binary frame.
+
+        A failed send is logged and the payload dropped, so the sender keeps
+        advancing and the sentences waiting for it are not stuck forever.
+        """
+        try:
+            if isinstance(payload, bytes):
+                await self._send_bytes(payload)
+            else:
+                await websocket_send(json.dumps(payload))
+        except Exception as e:
+            logger.error(f"Failed to send TTS payload: {e}")
+
     async def _send_silent_payload(
         self,
         display_text: DisplayText,
@@ -125,7 +399,7 @@ class TTSTaskManager:
             display_text=display_text,
             actions=actions,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
+        await self._payload_queue.put((audio_payload, sequence_number, True))
 
     async def _process_tts(
         self,
@@ -135,18 +409,82 @@ class TTSTaskManager:
         live2d_model: Live2dModel,
         tts_engine: TTSInterface,
         sequence_number: int,
+    ) -> None:
+        """
+        Wait for a synthesis slot, then generate the audio and queue it.
+
+        Sentences beyond the look-ahead window wait until delivery catches up.
+        Slots of the engine are shared with every other conversation using it
+        and go to the sentence closest to being played first.
+        """
+        if self._lookahead > 0:
+            async with self._progress:
+                await self._progress.wait_for(
+                    lambda: sequence_number - self._next_sequence_to_send
+                    <= self._lookahead
+                )
+
+        scheduler = get_tts_scheduler(tts_engine)
+        async with scheduler.slot(lambda: sequence_number - self._next_sequence_to_send):
+            # Engines running in worker threads check the token between chunks
+            token = CancelToken(on_overrun=synthesis_metrics.record_overrun)
+            set_cancel_token(token)
+            start = time.monotonic()
+            try:
+                await self._synthesize(
+                    tts_text, display_text, actions, tts_engine, sequence_number
+                )
+            except asyncio.CancelledError:
+                token.cancel()
+                synthesis_metrics.record(time.monotonic() - start, cancelled=True)
+                logger.debug(f"🛑 Cancelled TTS for: '''{tts_text}'''")
+                raise
+            synthesis_metrics.record(time.monotonic() - start, cancelled=False)
+
+    async def _synthesize(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
-        audio_file_path = None
-        try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
-            payload = prepare_audio_payload(
-                audio_path=audio_file_path,
-                display_text=display_text,
-                actions=actions,
+        # Opus is only sent for whole sentences, see StreamingAudioFrames
+        if (
+            self._audio_format.is_binary
+            and self._audio_format.codec != "opus"
+            and tts_engine.supports_streaming
+        ):
+            await self._process_tts_stream(
+                tts_text, display_text, actions, tts_engine, sequence_number
             )
+            return
+        try:
+            audio = await self._generate_audio(tts_engine, tts_text)
+            if audio is None:
+                raise ValueError("TTS engine returned no audio")
+            # Decoding, encoding and the volume envelope are CPU-bound, keep
+            # them off the event loop
+            if self._audio_format.is_binary:
+                payload = await asyncio.to_thread(
+                    prepare_audio_frame,
+                    audio_path=audio,
+                    display_text=display_text,
+                    actions=actions,
+                    sequence=sequence_number,
+                    audio_format=self._audio_format,
+                )
+            else:
+                payload = await asyncio.to_thread(
+                    prepare_audio_payload,
+                    audio_path=audio,
+                    display_text=display_text,
+                    actions=actions,
+                    audio_format=self._audio_format,
+                )
             # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         except Exception as e:
             logger.error(f"Error preparing audio payload: {e}")
@@ -156,23 +494,98 @@ class TTSTaskManager:
                 display_text=display_text,
                 actions=actions,
             )
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
-        finally:
-            if audio_file_path:
-                tts_engine.remove_file(audio_file_path)
-                logger.debug("Audio cache file cleaned.")
+    async def _process_tts_stream(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
+    ) -> None:
+        """Queue the audio of a sentence chunk by chunk while it is synthesized"""
+        cache_key = tts_cache.key(tts_engine, tts_text) if tts_cache.enabled else None
+        cached = await tts_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            try:
+                payload = await asyncio.to_thread(
+                    prepare_audio_frame,
+                    audio_path=cached,
+                    display_text=display_text,
+                    actions=actions,
+                    sequence=sequence_number,
+                    audio_format=self._audio_format,
+                )
+                await self._payload_queue.put((payload, sequence_number, True))
+                return
+            except Exception as e:
+                logger.error(f"Error preparing cached audio payload: {e}")
 
-    async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
-        """Generate audio file from text"""
-        logger.debug(f"🏃Generating audio for '''{text}'''...")
-        return await tts_engine.async_generate_audio(
-            text=text,
-            file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
+        frames = StreamingAudioFrames(
+            sequence=sequence_number,
+            audio_format=self._audio_format,
+            display_text=display_text,
+            actions=actions,
         )
+        logger.debug(f"🏃Streaming audio for '''{tts_text}'''...")
+        chunks: List[TTSAudio] = []
+        try:
+            async for chunk in tts_engine.async_stream_audio(tts_text):
+                frame = await asyncio.to_thread(frames.encode_chunk, chunk)
+                await self._payload_queue.put((frame, sequence_number, False))
+                chunks.append(chunk)
+            if cache_key and chunks:
+                audio = self._join_chunks(chunks)
+                if audio is not None:
+                    await tts_cache.put(cache_key, audio)
+        except Exception as e:
+            logger.error(f"Error streaming audio: {e}")
+        # Always close the sentence, so the client shows its text and the
+        # following sentences are not held back
+        await self._payload_queue.put((frames.encode_end(), sequence_number, True))
+
+    @staticmethod
+    def _join_chunks(chunks: List[TTSAudio]) -> Optional[TTSAudio]:
+        """Join streamed PCM chunks into one clip, None if they are not PCM"""
+        first = chunks[0]
+        if len(chunks) == 1:
+            return first
+        if any(
+            chunk.samples is None
+            or chunk.sample_rate != first.sample_rate
+            or chunk.channels != first.channels
+            for chunk in chunks
+        ):
+            return None
+        return TTSAudio(
+            samples=np.concatenate([np.asarray(chunk.samples) for chunk in chunks]),
+            sample_rate=first.sample_rate,
+            channels=first.channels,
+        )
+
+    async def _generate_audio(
+        self, tts_engine: TTSInterface, text: str
+    ) -> Optional[TTSAudio]:
+        """Generate audio from text in memory, reusing cached audio"""
+        logger.debug(f"🏃Generating audio for '''{text}'''...")
+        return await tts_cache.get_or_generate(tts_engine, text)
+
+    async def wait_until_sent(self) -> None:
+        """Wait until every queued payload has been sent, after the TTS tasks are done"""
+        await self._payload_queue.join()
 
     def clear(self) -> None:
-        """Clear all pending tasks and reset state"""
+        """Cancel all pending and running TTS tasks and reset state"""
+        self.cancel_filler()
+        self._reply_started = False
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._pending.clear()
+        for task in self.task_list:
+            if not task.done():
+                task.cancel()
         self.task_list.clear()
         if self._sender_task:
             self._sender_task.cancel()
@@ -0,0 +1,106 @@
+import asyncio
+import itertools
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List
+
+from ..tts.tts_interface import TTSInterface
+
+
+@dataclass
+class _Waiter:
+    """A synthesis request waiting for a free slot"""
+
+    priority: Callable[[], int]
+    order: int
+    future: asyncio.Future = field(repr=False)
+
+
+class TTSScheduler:
+    """
+    Limits how many sentences are synthesized at once by one TTS engine.
+
+    Requests beyond the limit wait, and whenever a slot frees up it goes to the
+    request with the lowest priority value. Priorities are evaluated when the
+    slot is handed out, so a sentence that became next-to-play while waiting
+    is served before sentences further in the future. Ties go to the request
+    that waited longest.
+    """
+
+    def __init__(self, max_concurrency: int = 2):
+        self.max_concurrency = max(1, max_concurrency)
+        self._running = 0
+        self._waiting: List[_Waiter] = []
+        self._order = itertools.count()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    @asynccontextmanager
+    async def slot(self, priority: Callable[[], int]) -> AsyncIterator[None]:
+        """
+        Hold a synthesis slot for the duration of the block.
+
+        Args:
+            priority: Returns the current priority of the request, lower
+                values are served first
+        """
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Callable[[], int]) -> None:
+        if self._running < self.max_concurrency and not self._waiting:
+            self._running += 1
+            return
+
+        waiter = _Waiter(
+            priority=priority,
+            order=next(self._order),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiting.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiting:
+                self._waiting.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed to us just before the cancellation
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._running -= 1
+        while self._waiting and self._running < self.max_concurrency:
+            waiter = min(self._waiting, key=lambda w: (w.priority(), w.order))
+            self._waiting.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._running += 1
+            waiter.future.set_result(None)
+
+
+# One scheduler per engine instance, shared by all conversations using it
+_schedulers: "weakref.WeakKeyDictionary[TTSInterface, TTSScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_tts_scheduler(tts_engine: TTSInterface) -> TTSScheduler:
+    """Get the scheduler of a TTS engine, creating it on first use"""
+    scheduler = _schedulers.get(tts_engine)
+    if scheduler is None:
+        scheduler = TTSScheduler(tts_engine.max_concurrency)
+        _schedulers[tts_engine] = scheduler
+    else:
+        scheduler.max_concurrency = max(1, tts_engine.max_concurrency)
+    return scheduler
@@ -1,8 +1,9 @@
 import os
 import json
+import asyncio
+from typing import Dict
 from uuid import uuid4
 import numpy as np
-from datetime import datetime
 from fastapi import APIRouter, WebSocket, UploadFile, File, Response
 from starlette.responses import JSONResponse
 from starlette.websockets import WebSocketDisconnect
@@ -10,6 +11,11 @@ from loguru import logger
 from .service_context import ServiceContext
 from .websocket_handler import WebSocketHandler
 from .proxy_handler import ProxyHandler
+from .tts.tts_cache import tts_cache
+from .conversations.tts_manager import TTSTaskManager, synthesis_metrics
+from .agent.output_types import DisplayText
+from .utils.sentence_divider import SentenceDivider
+from .utils.stream_audio import AudioStreamFormat, add_frame_fields, opus_available
 
 
 def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
@@ -198,57 +204,164 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
                 media_type="application/json",
             )
 
+    @router.get("/tts-cache/stats")
+    async def tts_cache_stats():
+        """Hit/miss statistics and size of the TTS audio cache"""
+        return JSONResponse(tts_cache.stats())
+
+    @router.get("/ready")
+    async def readiness():
+        """Whether the engines are loaded and warmed up, with warm-up durations"""
+        body = {
+            "ready": default_context_cache.ready,
+            "warm_up_ms": {
+                name: round(seconds * 1000)
+                for name, seconds in default_context_cache.warm_up_timings.items()
+            },
+        }
+        return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+    @router.get("/tts-metrics")
+    async def tts_metrics():
+        """Synthesis time spent on delivered and on cancelled sentences"""
+        return JSONResponse(synthesis_metrics.to_dict())
+
     @router.websocket("/tts-ws")
     async def tts_endpoint(websocket: WebSocket):
-        """WebSocket endpoint for TTS generation"""
+        """
+        WebSocket endpoint for TTS generation
+
+        Every `{"text": ..., "request_id": ..., "codec": ...}` message starts a
+        request, and several requests can run at once on one connection. The
+        text is split into sentences with the SentenceDivider, the sentences
+        are synthesized in parallel and their audio is streamed back in order
+        as binary audio frames (see `prepare_audio_frame`) with the
+        `request_id` in the header. `{"status": "complete", "request_id": ...}`
+        follows the last frame of a request. `{"type": "cancel", "request_id":
+        ...}` stops a request.
+        """
         await websocket.accept()
         logger.info("TTS WebSocket connection established")
+        requests: Dict[str, asyncio.Task] = {}
 
         try:
             while True:
                 data = await websocket.receive_json()
-                text = data.get("text")
-                if not text:
-                    continue
-
-                logger.info(f"Received text for TTS: {text}")
-
-                # Split text into sentences
-                sentences = [s.strip() for s in text.split(".") if s.strip()]
-
-                try:
-                    # Generate and send audio for each sentence
-                    for sentence in sentences:
-                        sentence = sentence + "."  # Add back the period
-                        file_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid4())[:8]}"
-                        audio_path = (
-                            await default_context_cache.tts_engine.async_generate_audio(
-                                text=sentence, file_name_no_ext=file_name
-                            )
-                        )
-                        logger.info(
-                            f"Generated audio for sentence: {sentence} at: {audio_path}"
-                        )
+                request_id = str(data.get("request_id") or uuid4())
 
+                if data.get("type") == "cancel":
+                    task = requests.get(request_id)
+                    if task:
+                        task.cancel()
                         await websocket.send_json(
-                            {
-                                "status": "partial",
-                                "audioPath": audio_path,
-                                "text": sentence,
-                            }
+                            {"status": "cancelled", "request_id": request_id}
                         )
+                    continue
 
-                    # Send completion signal
-                    await websocket.send_json({"status": "complete"})
+                text = data.get("text")
+                if not text:
+                    continue
+                codec = data.get("codec", "wav")
+                if codec not in ("wav", "pcm", "opus") or (
+                    codec == "opus" and not opus_available()
+                ):
+                    await websocket.send_json(
+                        {
+                            "status": "error",
+                            "request_id": request_id,
+                            "message": f"Unsupported codec: {codec}",
+                        }
+                    )
+                    continue
+                if request_id in requests:
+                    await websocket.send_json(
+                        {
+                            "status": "error",
+                            "request_id": request_id,
+                            "message": "Request ID already in use",
+                        }
+                    )
+                    continue
 
-                except Exception as e:
-                    logger.error(f"Error generating TTS: {e}")
-                    await websocket.send_json({"status": "error", "message": str(e)})
+                logger.info(f"Received text for TTS ({request_id}): {text}")
+                audio_format = AudioStreamFormat(
+                    transport="binary",
+                    codec=codec,
+                    bitrate_kbps=default_context_cache.system_config.opus_bitrate_kbps,
+                )
+                task = asyncio.create_task(
+                    _synthesize_tts_request(
+                        websocket, default_context_cache, request_id, text, audio_format
+                    )
+                )
+                requests[request_id] = task
+                task.add_done_callback(
+                    lambda _, rid=request_id: requests.pop(rid, None)
+                )
 
         except WebSocketDisconnect:
             logger.info("TTS WebSocket client disconnected")
         except Exception as e:
             logger.error(f"Error in TTS WebSocket connection: {e}")
             await websocket.close()
+        finally:
+            for task in list(requests.values()):
+                task.cancel()
 
     return router
+
+
+async def _synthesize_tts_request(
+    websocket: WebSocket,
+    context: ServiceContext,
+    request_id: str,
+    text: str,
+    audio_format: AudioStreamFormat,
+) -> None:
+    """Synthesize the sentences of one /tts-ws request and stream their audio"""
+
+    async def send_text(message: str) -> None:
+        payload = json.loads(message)
+        payload["request_id"] = request_id
+        await websocket.send_text(json.dumps(payload))
+
+    async def send_bytes(frame: bytes) -> None:
+        await websocket.send_bytes(add_frame_fields(frame, request_id=request_id))
+
+    async def text_stream():
+        yield text
+
+    tts_config = context.character_config.tts_config
+    tts_manager = TTSTaskManager(
+        audio_format=audio_format,
+        websocket_send_bytes=send_bytes,
+        lookahead=tts_config.lookahead,
+        coalesce_max_chars=tts_config.coalesce_max_chars,
+        coalesce_deadline_ms=tts_config.coalesce_deadline_ms,
+    )
+    divider = SentenceDivider(parse_tags=False)
+
+    try:
+        async for sentence in divider.process_stream(text_stream()):
+            await tts_manager.speak(
+                tts_text=sentence.text,
+                display_text=DisplayText(text=sentence.text),
+                actions=None,
+                live2d_model=context.live2d_model,
+                tts_engine=context.tts_engine,
+                websocket_send=send_text,
+            )
+        await tts_manager.flush()
+        if tts_manager.task_list:
+            await asyncio.gather(*tts_manager.task_list)
+        await tts_manager.wait_until_sent()
+        await websocket.send_json({"status": "complete", "request_id": request_id})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating TTS for request {request_id}: {e}")
+        await websocket.send_json(
+            {"status": "error", "request_id": request_id, "message": str(e)}
+        )
+    finally:
+        tts_manager.clear()
@@ -16,6 +16,9 @@ from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 
 from .routes import init_client_ws_route, init_webtool_routes, init_proxy_route
 from .service_context import ServiceContext
+from .chat_history_service import chat_history_service
+from .tts.tts_cache import tts_cache
+from .tts.http_client import close_http_clients
 from .config_manager.utils import Config
 
 
@@ -88,6 +91,12 @@ class WebSocketServer:
             allow_headers=["*"],
         )
 
+        tts_cache.configure(
+            memory_mb=config.system_config.tts_cache_memory_mb,
+            disk_mb=config.system_config.tts_cache_disk_mb,
+            cache_dir=config.system_config.tts_cache_dir,
+        )
+
         # Include routes, passing the context instance
         # The context will be populated during the initialize step
         self.app.include_router(
@@ -108,6 +117,13 @@ class WebSocketServer:
                 init_proxy_route(server_url=server_url),
             )
 
+        # Persist queued chat history writes before the server exits
+        self.app.add_event_handler("shutdown", chat_history_service.close)
+        self.app.add_event_handler("shutdown", close_http_clients)
+        self.app.add_event_handler(
+            "shutdown", self.default_context_cache.shutdown_tts_engine
+        )
+
         # Mount cache directory first (to ensure audio file access)
         if not os.path.exists("cache"):
             os.makedirs("cache")
@@ -1,6 +1,9 @@
 import os
 import json
-from typing import Callable
+import time
+import asyncio
+from typing import Callable, Dict, Set
+import numpy as np
 from loguru import logger
 from fastapi import WebSocket
 
@@ -21,9 +24,13 @@ from .mcpp.tool_adapter import ToolAdapter
 
 from .asr.asr_factory import ASRFactory
 from .tts.tts_factory import TTSFactory
+from .tts.tts_cache import engine_namespace
+from .tts.tts_process_pool import ProcessPoolTTSEngine
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
 from .translate.translate_factory import TranslateFactory
+from .utils.stream_audio import AudioStreamFormat, opus_available
+from .conversations.backchannel import BackchannelBank
 
 from .config_manager import (
     Config,
@@ -34,6 +41,7 @@ from .config_manager import (
     TTSConfig,
     VADConfig,
     TranslatorConfig,
+    BackchannelConfig,
     read_yaml,
     validate_config,
 )
@@ -51,10 +59,14 @@ class ServiceContext:
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
         self.tts_engine: TTSInterface = None
+        # False while tts_engine is shared with the context it was cached from
+        self.owns_tts_engine = False
         self.agent_engine: AgentInterface = None
         # translate_engine can be none if translation is disabled
         self.vad_engine: VADInterface | None = None
         self.translate_engine: TranslateInterface | None = None
+        # None if backchannel fillers are disabled
+        self.backchannel_bank: BackchannelBank | None = None
 
         self.mcp_server_registery: ServerRegistry | None = None
         self.tool_adapter: ToolAdapter | None = None
@@ -71,8 +83,21 @@ class ServiceContext:
         self.history_uid: str = ""  # Add history_uid field
         
         self.send_text: Callable = None
+        self.send_bytes: Callable = None
+        # Audio format negotiated by the client of this session
+        self.audio_stream_format: AudioStreamFormat = AudioStreamFormat()
+        # Sample format of binary microphone frames, None while the client
+        # sends microphone audio as JSON float arrays
+        self.mic_sample_format: str | None = None
         self.client_uid: str = None
 
+        # Engines initialized since the last warm-up ("asr", "tts", "vad")
+        self._engines_to_warm_up: Set[str] = set()
+        # Duration of the last warm-up of each engine, in seconds
+        self.warm_up_timings: Dict[str, float] = {}
+        # False while engines are loading or warming up
+        self.ready: bool = False
+
     def __str__(self):
         return (
             f"ServiceContext:\n"
@@ -193,6 +218,7 @@ class ServiceContext:
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        self.shutdown_tts_engine()
         logger.info("ServiceContext closed.")
 
     async def load_cache(
@@ -210,6 +236,8 @@ class ServiceContext:
         tool_adapter: ToolAdapter | None = None,
         send_text: Callable = None,
         client_uid: str = None,
+        send_bytes: Callable = None,
+        backchannel_bank: BackchannelBank | None = None,
     ) -> None:
         """
         Load the ServiceContext with the reference of the provided instances.
@@ -226,14 +254,21 @@ class ServiceContext:
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
+        self.owns_tts_engine = False
         self.vad_engine = vad_engine
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
+        self.backchannel_bank = backchannel_bank
         # Load potentially shared components by reference
         self.mcp_server_registery = mcp_server_registery
         self.tool_adapter = tool_adapter
         self.send_text = send_text
+        self.send_bytes = send_bytes
         self.client_uid = client_uid
+        # Clients that never negotiate get the legacy JSON/WAV format
+        self.audio_stream_format = AudioStreamFormat()
+        # The engines are shared with the context they come from, already warm
+        self.ready = True
 
         # Initialize session-specific MCP components
         await self._init_mcp_components(self.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp, self.character_config.agent_config.agent_settings.basic_memory_agent.mcp_enabled_servers)
@@ -248,6 +283,7 @@ class ServiceContext:
         Parameters:
         - config (Dict): The configuration dictionary.
         """
+        self.ready = False
         if not self.config:
             self.config = config
 
@@ -297,6 +333,86 @@ class ServiceContext:
         self.system_config = config.system_config or self.system_config
         self.character_config = config.character_config
 
+        if self.system_config.warm_up:
+            await self.warm_up()
+        self._engines_to_warm_up.clear()
+        await self.init_backchannel(config.character_config.backchannel_config)
+        self.ready = True
+
+    async def warm_up(self) -> None:
+        """
+        Run a short synthetic request through every newly initialized engine.
+
+        The first request to a model pays for lazy loading, graph compilation
+        and memory allocation. Paying it here keeps it out of the first reply
+        after the server starts or the character config is switched. A failed
+        warm-up is logged and otherwise ignored.
+
+        The engines are called through their synchronous methods: at boot this
+        runs in an event loop that is closed before the server starts, and no
+        async client of an engine may be bound to it.
+        """
+        warm_ups = {
+            "asr": self._warm_up_asr,
+            "tts": self._warm_up_tts,
+            "vad": self._warm_up_vad,
+        }
+        engines = sorted(self._engines_to_warm_up)
+        self._engines_to_warm_up.clear()
+
+        async def run(name: str) -> None:
+            start = time.perf_counter()
+            try:
+                await warm_ups[name]()
+            except Exception as e:
+                logger.warning(f"{name.upper()} warm-up failed: {e}")
+                return
+            self.warm_up_timings[name] = time.perf_counter() - start
+            logger.info(
+                f"{name.upper()} warmed up in {self.warm_up_timings[name] * 1000:.0f} ms"
+            )
+
+        await asyncio.gather(*(run(name) for name in engines))
+
+    async def _warm_up_asr(self) -> None:
+        # Half a second of silence at 16 kHz
+        silence = np.zeros(8000, dtype=np.float32)
+        await asyncio.to_thread(self.asr_engine.transcribe_np, silence)
+
+    async def _warm_up_tts(self) -> None:
+        # Every worker process loads its own model, so warm up all of them
+        requests = (
+            self.tts_engine.workers
+            if isinstance(self.tts_engine, ProcessPoolTTSEngine)
+            else 1
+        )
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.tts_engine.generate_audio_data, "Hello.")
+                for _ in range(requests)
+            )
+        )
+        if any(audio is None for audio in results):
+            raise ValueError("TTS engine returned no audio")
+
+    async def _warm_up_vad(self) -> None:
+        # A few windows of silence through a throwaway session, which shares the
+        # loaded model but not the audio context and state of the live engine
+        vad = self.vad_engine.new_session()
+        silence = [0.0] * 2048
+        await asyncio.to_thread(lambda: list(vad.detect_speech(silence)))
+
+    def negotiated_audio_format(self) -> AudioStreamFormat:
+        """Codec and bitrate offered to a client that negotiates without naming a
+        codec, from the system config"""
+        codec = self.system_config.audio_codec
+        if codec == "opus" and not opus_available():
+            logger.warning("libsndfile cannot encode Opus, sending speech as wav")
+            codec = "wav"
+        return AudioStreamFormat(
+            codec=codec, bitrate_kbps=self.system_config.opus_bitrate_kbps
+        )
+
     def init_live2d(self, live2d_model_name: str) -> None:
         logger.info(f"Initializing Live2D: {live2d_model_name}")
         try:
@@ -313,6 +429,7 @@ class ServiceContext:
                 asr_config.asr_model,
                 **getattr(asr_config, asr_config.asr_model).model_dump(),
             )
+            self._engines_to_warm_up.add("asr")
             # saving config should be done after successful initialization
             self.character_config.asr_config = asr_config
         else:
@@ -321,15 +438,51 @@ class ServiceContext:
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+            engine_config = getattr(
+                tts_config, tts_config.tts_model.lower()
+            ).model_dump()
+            use_process_pool = tts_config.process_workers > 0
+            if (
+                use_process_pool
+                and tts_config.tts_model not in ProcessPoolTTSEngine.LOCAL_ENGINES
+            ):
+                logger.warning(
+                    f"process_workers is ignored for {tts_config.tts_model}, "
+                    "worker processes are only used for local engines"
+                )
+                use_process_pool = False
+
+            # Stopped once the new engine is up, unless it is shared
+            previous_engine = self.tts_engine if self.owns_tts_engine else None
+            if use_process_pool:
+                self.tts_engine = ProcessPoolTTSEngine(
+                    tts_config.tts_model,
+                    engine_config,
+                    workers=tts_config.process_workers,
+                )
+            else:
+                self.tts_engine = TTSFactory.get_tts_engine(
+                    tts_config.tts_model, **engine_config
+                )
+                self.tts_engine.max_concurrency = tts_config.max_concurrency
+            self.tts_engine.cache_namespace = engine_namespace(
+                tts_config.tts_model, engine_config
             )
+            self.owns_tts_engine = True
+            if isinstance(previous_engine, ProcessPoolTTSEngine):
+                previous_engine.shutdown()
+            self._engines_to_warm_up.add("tts")
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
         else:
             logger.info("TTS already initialized with the same config.")
 
+    def shutdown_tts_engine(self) -> None:
+        """Stop the TTS worker processes, if this context started them"""
+        if self.owns_tts_engine and isinstance(self.tts_engine, ProcessPoolTTSEngine):
+            self.tts_engine.shutdown()
+        self.owns_tts_engine = False
+
     def init_vad(self, vad_config: VADConfig) -> None:
         if vad_config.vad_model is None:
             logger.info("VAD is disabled.")
@@ -342,11 +495,39 @@ class ServiceContext:
                 vad_config.vad_model,
                 **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
             )
+            self._engines_to_warm_up.add("vad")
             # saving config should be done after successful initialization
             self.character_config.vad_config = vad_config
         else:
             logger.info("VAD already initialized with the same config.")
 
+    async def init_backchannel(self, backchannel_config: BackchannelConfig) -> None:
+        """Synthesize the filler clips of the character, if enabled"""
+        if not backchannel_config.enabled or not self.tts_engine:
+            self.backchannel_bank = None
+            return
+
+        source = (
+            self.tts_engine,
+            self.character_config.live2d_model_name,
+            self.character_config.character_name,
+            self.character_config.avatar,
+            tuple(backchannel_config.fillers),
+        )
+        if self.backchannel_bank and self.backchannel_bank.source == source:
+            logger.info("Backchannel fillers already synthesized.")
+            return
+
+        logger.info(f"Synthesizing {len(backchannel_config.fillers)} filler clips")
+        self.backchannel_bank = await BackchannelBank.build(
+            fillers=backchannel_config.fillers,
+            tts_engine=self.tts_engine,
+            live2d_model=self.live2d_model,
+            character_name=self.character_config.character_name,
+            avatar=self.character_config.avatar,
+            source=source,
+        )
+
     async def init_agent(self, agent_config: AgentConfig, persona_prompt: str) -> None:
         """Initialize or update the LLM engine based on agent configuration."""
         logger.info(f"Initializing Agent: {agent_config.conversation_agent_choice}")
@@ -435,6 +616,7 @@ class ServiceContext:
             if (
                 prompt_name == "group_conversation_prompt"
                 or prompt_name == "proactive_speak_prompt"
+                or prompt_name == "memory_summary_prompt"
             ):
                 continue
 
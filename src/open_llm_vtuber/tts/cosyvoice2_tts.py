@@ -1,6 +1,8 @@
+import os
+
 from gradio_client import Client, handle_file
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio, iterate_in_thread
 
 
 class TTSEngine(TTSInterface):
@@ -30,6 +32,8 @@ class TTSEngine(TTSInterface):
         self.seed = seed
         self.speed = speed
         self.api_name = api_name
+        # Streaming mode of the gradio app yields one audio file per segment
+        self.supports_streaming = stream
 
     def generate_audio(self, text, file_name_no_ext=None):
         if file_name_no_ext is not None:
@@ -37,7 +41,12 @@ class TTSEngine(TTSInterface):
                 "Warning: customizing the temp file name with file_name_no_ext is not supported by cosyvoice2TTS and will be ignored."
             )
 
-        result_wav_path = self.client.predict(
+        result_wav_path = self.client.predict(**self._request(text))
+
+        return result_wav_path
+
+    def _request(self, text) -> dict:
+        return dict(
             tts_text=text,
             mode_checkbox_group=self.mode_checkbox_group,
             sft_dropdown=self.sft_dropdown,
@@ -51,4 +60,26 @@ class TTSEngine(TTSInterface):
             api_name=self.api_name,
         )
 
-        return result_wav_path
+    def _stream_segments(self, text):
+        """Yield the audio segments of a streaming job as they are produced"""
+        job = self.client.submit(**self._request(text))
+        for segment_path in job:
+            if not segment_path:
+                continue
+            with open(segment_path, "rb") as f:
+                data = f.read()
+            self.remove_file(segment_path, verbose=False)
+            yield TTSAudio(
+                data=data, format=os.path.splitext(segment_path)[1].lstrip(".") or "wav"
+            )
+
+    async def async_stream_audio(self, text):
+        if not self.stream:
+            async for chunk in super().async_stream_audio(text):
+                yield chunk
+            return
+        try:
+            async for chunk in iterate_in_thread(self._stream_segments, text):
+                yield chunk
+        except Exception as e:
+            logger.error(f"CosyVoice2 TTS failed to stream audio: {e}")
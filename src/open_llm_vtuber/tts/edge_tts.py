@@ -3,7 +3,7 @@ import os
 
 import edge_tts
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio, decode_audio_stream
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -14,6 +14,10 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
+    supports_streaming = True
+    # edge-tts returns 24 kHz mono mp3
+    sample_rate = 24000
+
     def __init__(self, voice="en-US-AvaMultilingualNeural"):
         self.voice = voice
 
@@ -37,17 +41,61 @@ class TTSEngine(TTSInterface):
         str: the path to the generated audio file
 
         """
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
+
+    def generate_audio_data(self, text):
+        """Generate mp3 audio in memory."""
+        try:
+            communicate = edge_tts.Communicate(text, self.voice)
+            audio = b"".join(
+                chunk["data"]
+                for chunk in communicate.stream_sync()
+                if chunk["type"] == "audio"
+            )
+        except Exception as e:
+            logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
+            logger.critical("It's possible that edge-tts is blocked in your region.")
+            return None
 
+        return TTSAudio(data=audio, format=self.file_extension)
+
+    async def async_generate_audio_data(self, text):
+        """Generate mp3 audio in memory without blocking a thread."""
         try:
             communicate = edge_tts.Communicate(text, self.voice)
-            communicate.save_sync(file_name)
+            chunks = []
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    chunks.append(chunk["data"])
         except Exception as e:
             logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
             logger.critical("It's possible that edge-tts is blocked in your region.")
             return None
 
-        return file_name
+        return TTSAudio(data=b"".join(chunks), format=self.file_extension)
+
+    async def async_stream_audio(self, text):
+        """Stream PCM audio, decoding the mp3 stream of edge-tts as it arrives."""
+
+        async def mp3_chunks():
+            communicate = edge_tts.Communicate(text, self.voice)
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    yield chunk["data"]
+
+        try:
+            async for chunk in decode_audio_stream(
+                mp3_chunks(), input_format="mp3", sample_rate=self.sample_rate
+            ):
+                yield chunk
+        except FileNotFoundError:
+            logger.warning("ffmpeg not found, edge-tts audio will not be streamed.")
+            audio = await self.async_generate_audio_data(text)
+            if audio is not None:
+                yield audio
+        except Exception as e:
+            logger.critical(f"\nError: edge-tts unable to stream audio: {e}")
+            logger.critical("It's possible that edge-tts is blocked in your region.")
 
 
 # en-US-AvaMultilingualNeural
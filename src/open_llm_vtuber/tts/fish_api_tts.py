@@ -1,7 +1,13 @@
 from typing import Literal
 from fish_audio_sdk import Session, TTSRequest
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import get_http_client
+from .tts_interface import (
+    TTSInterface,
+    TTSAudio,
+    async_pcm_chunks,
+    read_cancellable,
+)
 
 
 class TTSEngine(TTSInterface):
@@ -10,6 +16,8 @@ class TTSEngine(TTSInterface):
     """
 
     file_extension: str = "wav"
+    supports_streaming = True
+    stream_sample_rate = 44100
 
     def __init__(
         self,
@@ -39,22 +47,76 @@ class TTSEngine(TTSInterface):
 
         self.reference_id = reference_id
         self.latency = latency
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
         self.session = Session(apikey=api_key, base_url=base_url)
 
     def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
 
+    def generate_audio_data(self, text):
         try:
-            with open(file_name, "wb") as f:
-                for chunk in self.session.tts(
+            audio = read_cancellable(
+                self.session.tts(
                     TTSRequest(
-                        text=text, reference_id=self.reference_id, latency=self.latency
+                        text=text,
+                        reference_id=self.reference_id,
+                        latency=self.latency,
+                        format=self.file_extension,
                     )
-                ):
-                    f.write(chunk)
+                )
+            )
 
         except Exception as e:
             logger.critical(f"\nError: Fish TTS API fail to generate audio: {e}")
             return None
 
-        return file_name
+        return TTSAudio(data=audio, format=self.file_extension)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        return self.save_audio_data(
+            await self.async_generate_audio_data(text), file_name_no_ext
+        )
+
+    async def async_generate_audio_data(self, text):
+        try:
+            audio = b"".join(
+                [chunk async for chunk in self._aiter_audio(text, self.file_extension)]
+            )
+        except Exception as e:
+            logger.critical(f"\nError: Fish TTS API fail to generate audio: {e}")
+            return None
+
+        return TTSAudio(data=audio, format=self.file_extension)
+
+    async def async_stream_audio(self, text):
+        try:
+            async for chunk in async_pcm_chunks(
+                self._aiter_audio(
+                    text, "pcm", sample_rate=self.stream_sample_rate
+                ),
+                self.stream_sample_rate,
+            ):
+                yield chunk
+        except Exception as e:
+            logger.critical(f"\nError: Fish TTS API fail to stream audio: {e}")
+
+    async def _aiter_audio(self, text, audio_format, **options):
+        """Stream the audio of a sentence from the API on the shared HTTP client"""
+        request = TTSRequest(
+            text=text,
+            reference_id=self.reference_id,
+            latency=self.latency,
+            format=audio_format,
+            **options,
+        )
+        client = get_http_client("fish_api_tts", self.max_concurrency)
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/v1/tts",
+            headers={"authorization": f"Bearer {self.api_key}"},
+            json=request.model_dump(mode="json"),
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                yield chunk
@@ -4,8 +4,8 @@
 
 import re
 import requests
-from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import get_http_client, response_audio
+from .tts_interface import TTSInterface, read_cancellable
 
 
 class TTSEngine(TTSInterface):
@@ -32,10 +32,26 @@ class TTSEngine(TTSInterface):
         self.streaming_mode = streaming_mode
 
     def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        return self.save_audio_data(
+            await self.async_generate_audio_data(text), file_name_no_ext
+        )
+
+    async def async_generate_audio_data(self, text):
+        client = get_http_client("gpt_sovits_tts", self.max_concurrency)
+        async with client.stream(
+            "GET", self.api_url, params=self._params(text)
+        ) as response:
+            return response_audio(
+                response.status_code, await response.aread(), self.media_type
+            )
+
+    def _params(self, text):
         cleaned_text = re.sub(r"\[.*?\]", "", text)
-        # Prepare the data for the POST request
-        data = {
+        # Prepare the query parameters of the request
+        return {
             "text": cleaned_text,
             "text_lang": self.text_lang,
             "ref_audio_path": self.ref_audio_path,
@@ -47,18 +63,13 @@ class TTSEngine(TTSInterface):
             "streaming_mode": self.streaming_mode,
         }
 
-        # Send POST request to the TTS API
-        response = requests.get(self.api_url, params=data, timeout=120)
-
-        # Check if the request was successful
-        if response.status_code == 200:
-            # Save the audio content to a file
-            with open(file_name, "wb") as audio_file:
-                audio_file.write(response.content)
-            return file_name
-        else:
-            # Handle errors or unsuccessful requests
-            logger.critical(
-                f"Error: Failed to generate audio. Status code: {response.status_code}"
+    def generate_audio_data(self, text):
+        # Send GET request to the TTS API
+        with requests.get(
+            self.api_url, params=self._params(text), timeout=120, stream=True
+        ) as response:
+            return response_audio(
+                response.status_code,
+                read_cancellable(response.iter_content(chunk_size=8192)),
+                self.media_type,
             )
-            return None
@@ -0,0 +1,73 @@
+import importlib.util
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+from .tts_interface import TTSAudio
+
+# HTTP/2 needs the optional h2 package (`pip install httpx[http2]`)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Synthesis of a long sentence by a slow server can take a while, but
+# connecting should not
+DEFAULT_TIMEOUT = httpx.Timeout(120.0, connect=10.0, pool=None)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: str, max_connections: int = 4) -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client of an API-based TTS engine.
+
+    Every engine type gets one client for the whole server, so connections
+    are kept alive and reused across sentences and sessions instead of being
+    opened per request. HTTP/2 is negotiated with servers that support it
+    when h2 is installed.
+
+    Args:
+        name: Engine type, such as "x_tts"
+        max_connections: Connection limit of the client, only used when the
+            client is created
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        max_connections = max(1, max_connections)
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        _clients[name] = client
+        logger.debug(
+            f"Created HTTP client for {name} "
+            f"(max {max_connections} connections, http2={HTTP2_AVAILABLE})"
+        )
+    return client
+
+
+def response_audio(
+    status_code: int, data: bytes, audio_format: str
+) -> Optional[TTSAudio]:
+    """
+    Get the audio of a synthesis response, whether it was read by the sync
+    (requests) or the async (httpx) client of an engine.
+
+    Returns:
+        TTSAudio | None: The audio, or None if the request failed
+    """
+    if status_code == 200:
+        return TTSAudio(data=data, format=audio_format)
+    logger.critical(f"Error: Failed to generate audio. Status code: {status_code}")
+    return None
+
+
+async def close_http_clients() -> None:
+    """Close the connections of all shared TTS HTTP clients"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -1,10 +1,20 @@
+import json
 import os
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import get_http_client
+from .tts_interface import (
+    TTSInterface,
+    TTSAudio,
+    async_pcm_chunks,
+    read_cancellable,
+)
 
 
 class TTSEngine(TTSInterface):
+    supports_streaming = True
+    sample_rate = 32000
+
     def __init__(
         self,
         group_id: str,
@@ -24,9 +34,42 @@ class TTSEngine(TTSInterface):
             os.makedirs(self.cache_dir)
 
     def generate_audio(self, text: str, file_name_no_ext=None) -> str:
-        import json
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        return self.save_audio_data(
+            await self.async_generate_audio_data(text), file_name_no_ext
+        )
 
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+    def generate_audio_data(self, text: str) -> TTSAudio | None:
+        try:
+            audio = read_cancellable(self._iter_audio(text, self.file_extension))
+            return TTSAudio(data=audio, format=self.file_extension)
+        except Exception as e:
+            logger.error(f"Exception in minimax_tts generate_audio: {e}")
+            return None
+
+    async def async_generate_audio_data(self, text: str) -> TTSAudio | None:
+        try:
+            audio = b"".join(
+                [chunk async for chunk in self._aiter_audio(text, self.file_extension)]
+            )
+            return TTSAudio(data=audio, format=self.file_extension)
+        except Exception as e:
+            logger.error(f"Exception in minimax_tts generate_audio: {e}")
+            return None
+
+    async def async_stream_audio(self, text: str):
+        try:
+            async for chunk in async_pcm_chunks(
+                self._aiter_audio(text, "pcm"), self.sample_rate
+            ):
+                yield chunk
+        except Exception as e:
+            logger.error(f"Exception in minimax_tts stream_audio: {e}")
+
+    def _request(self, text: str, audio_format: str) -> tuple[str, dict, dict]:
+        """Build the url, headers and body of a streaming synthesis request"""
         url = "https://api.minimax.chat/v1/t2a_v2?GroupId=" + self.group_id
         headers = {
             "accept": "application/json, text/plain, */*",
@@ -57,33 +100,50 @@ class TTSEngine(TTSInterface):
             },
             "pronunciation_dict": pronunciation_dict,
             "audio_setting": {
-                "sample_rate": 32000,
+                "sample_rate": self.sample_rate,
                 "bitrate": 128000,
-                "format": self.file_extension,
+                "format": audio_format,
                 "channel": 1,
             },
         }
+        return url, headers, body
 
+    @staticmethod
+    def _parse_event(line: str | bytes) -> bytes | None:
+        """Decode the audio of one server-sent event line, if it has any"""
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        if not line or line[:5] != b"data:":
+            return None
         try:
-            response = requests.request(
-                "POST", url, stream=True, headers=headers, data=json.dumps(body)
-            )
-            audio = b""
-            for chunk in response.raw:
-                if chunk:
-                    if chunk[:5] == b"data:":
-                        try:
-                            data = json.loads(chunk[5:])
-                            if "data" in data and "extra_info" not in data:
-                                if "audio" in data["data"]:
-                                    hex_audio = data["data"]["audio"]
-                                    decoded = bytes.fromhex(hex_audio)
-                                    audio += decoded
-                        except Exception as e:
-                            logger.error(f"Failed to parse audio chunk: {e}")
-            with open(file_name, "wb") as f:
-                f.write(audio)
-            return file_name
+            data = json.loads(line[5:])
         except Exception as e:
-            logger.error(f"Exception in minimax_tts generate_audio: {e}")
+            logger.error(f"Failed to parse audio chunk: {e}")
             return None
+        # The last event repeats the whole audio along with extra_info
+        if "data" in data and "extra_info" not in data:
+            hex_audio = data["data"].get("audio")
+            if hex_audio:
+                return bytes.fromhex(hex_audio)
+        return None
+
+    def _iter_audio(self, text: str, audio_format: str):
+        """Yield the decoded audio of each server-sent event as it arrives"""
+        url, headers, body = self._request(text, audio_format)
+        with requests.request(
+            "POST", url, stream=True, headers=headers, data=json.dumps(body)
+        ) as response:
+            for line in response.iter_lines():
+                audio = self._parse_event(line)
+                if audio:
+                    yield audio
+
+    async def _aiter_audio(self, text: str, audio_format: str):
+        """Async version of `_iter_audio` on the shared HTTP client"""
+        url, headers, body = self._request(text, audio_format)
+        client = get_http_client("minimax_tts", self.max_concurrency)
+        async with client.stream("POST", url, headers=headers, json=body) as response:
+            async for line in response.aiter_lines():
+                audio = self._parse_event(line)
+                if audio:
+                    yield audio
@@ -6,7 +6,13 @@ from pathlib import Path
 from loguru import logger
 from openai import OpenAI  # Use the official OpenAI library
 
-from .tts_interface import TTSInterface
+from .tts_interface import (
+    TTSInterface,
+    TTSAudio,
+    iterate_in_thread,
+    pcm_chunks,
+    read_cancellable,
+)
 
 # Add the current directory to sys.path for relative imports if needed
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,6 +26,10 @@ class TTSEngine(TTSInterface):
     API Reference: https://platform.openai.com/docs/api-reference/audio/createSpeech (for standard parameters)
     """
 
+    supports_streaming = True
+    # Sample rate of the raw "pcm" response format
+    stream_sample_rate = 24000
+
     def __init__(
         self,
         model="kokoro",  # Default model based on user example
@@ -115,6 +125,58 @@ class TTSEngine(TTSInterface):
 
         return str(speech_file_path)
 
+    def generate_audio_data(self, text, speed=1.0):
+        """
+        Generate speech audio in memory using OpenAI TTS.
+
+        Args:
+            text (str): The text to synthesize.
+            speed (float): The speed of the speech (0.25 to 4.0). Defaults to 1.0.
+
+        Returns:
+            TTSAudio: The generated audio, or None if generation failed.
+        """
+        if not self.client:
+            logger.error("OpenAI client not initialized. Cannot generate audio.")
+            return None
+
+        try:
+            with self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                response_format=self.file_extension,
+                speed=speed,
+            ) as response:
+                audio = read_cancellable(response.iter_bytes())
+        except Exception as e:
+            logger.critical(f"Error: OpenAI TTS unable to generate audio: {e}")
+            return None
+
+        return TTSAudio(data=audio, format=self.file_extension)
+
+    def _stream_pcm(self, text, speed=1.0):
+        """Request raw 16 bit PCM and yield it in chunks as it is received."""
+        with self.client.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+            speed=speed,
+        ) as response:
+            yield from pcm_chunks(response.iter_bytes(), self.stream_sample_rate)
+
+    async def async_stream_audio(self, text):
+        """Stream speech audio as PCM chunks while the server synthesizes it."""
+        if not self.client:
+            logger.error("OpenAI client not initialized. Cannot generate audio.")
+            return
+        try:
+            async for chunk in iterate_in_thread(self._stream_pcm, text):
+                yield chunk
+        except Exception as e:
+            logger.critical(f"Error: OpenAI TTS unable to stream audio: {e}")
+
 
 # Example usage (optional, for testing with the compatible endpoint)
 # if __name__ == '__main__':
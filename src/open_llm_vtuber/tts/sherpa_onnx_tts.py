@@ -1,10 +1,10 @@
 import sys
 import os
 
+import numpy as np
 import sherpa_onnx
-import soundfile as sf
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio, check_cancelled, is_cancelled
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -87,10 +87,28 @@ class TTSEngine(TTSInterface):
         Returns:
             str: The path to the generated audio file.
         """
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
 
+    def generate_audio_data(self, text):
+        """
+        Generate speech samples in memory using sherpa-onnx TTS.
+
+        Parameters:
+            text (str): The text to speak.
+
+        Returns:
+            TTSAudio: Float samples and their sample rate, or None on failure.
+        """
         try:
-            audio = self.tts.generate(text, sid=self.sid, speed=self.speed)
+            # The callback runs after every generated chunk; returning 0 stops
+            # generation when the synthesis was cancelled
+            audio = self.tts.generate(
+                text,
+                sid=self.sid,
+                speed=self.speed,
+                callback=lambda samples, progress: 0 if is_cancelled() else 1,
+            )
+            check_cancelled()
 
             if len(audio.samples) == 0:
                 logger.error(
@@ -98,15 +116,11 @@ class TTSEngine(TTSInterface):
                 )
                 return None
 
-            sf.write(
-                file_name,
-                audio.samples,
-                samplerate=audio.sample_rate,
-                subtype="PCM_16",
+            return TTSAudio(
+                samples=np.asarray(audio.samples, dtype=np.float32),
+                sample_rate=audio.sample_rate,
             )
 
-            return file_name
-
         except Exception as e:
             logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
             return None
@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from .tts_interface import TTSAudio, TTSInterface
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so that trivially different spellings share a cache entry"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def engine_namespace(engine_type: str, engine_config: dict) -> str:
+    """
+    Identify an engine configuration for cache keys.
+
+    Any change to the engine settings (model, speed, reference audio, ...)
+    yields a different namespace, so stale audio is never served.
+    """
+    config_json = json.dumps(engine_config, sort_keys=True, default=str)
+    config_hash = hashlib.sha256(config_json.encode("utf-8")).hexdigest()[:16]
+    return f"{engine_type}:{config_hash}"
+
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesized audio.
+
+    Entries are keyed by (engine type, engine config hash, voice, normalized
+    text). Lookups go to a bounded in-memory LRU first, then to a size-capped
+    directory on disk that survives restarts. Disk I/O runs in worker threads.
+    Concurrent requests for the same missing entry share one synthesis.
+
+    A tier with a size of 0 is disabled; with both disabled the cache is a
+    pass-through.
+    """
+
+    def __init__(
+        self,
+        memory_mb: float = 64,
+        disk_mb: float = 512,
+        cache_dir: str = "tts_cache",
+    ):
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, TTSAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (path, size), least recently used first
+        self._disk: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_loaded = False
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+        self.configure(memory_mb, disk_mb, cache_dir)
+
+    def configure(self, memory_mb: float, disk_mb: float, cache_dir: str) -> None:
+        """Set the tier sizes and the disk directory"""
+        with self._lock:
+            self._memory_limit = int(memory_mb * 1024 * 1024)
+            self._disk_limit = int(disk_mb * 1024 * 1024)
+            if getattr(self, "_cache_dir", None) != cache_dir:
+                self._disk.clear()
+                self._disk_bytes = 0
+                self._disk_loaded = False
+            self._cache_dir = cache_dir
+        self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._memory_limit > 0 or self._disk_limit > 0
+
+    # ==== Public API
+
+    def key(self, engine: TTSInterface, text: str) -> str:
+        """Get the cache key of a text spoken by an engine"""
+        namespace = engine.cache_namespace or (
+            f"{type(engine).__module__}.{type(engine).__qualname__}"
+        )
+        voice = getattr(engine, "voice", None) or getattr(engine, "voice_id", None)
+        key_json = json.dumps([namespace, voice, normalize_text(text)])
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    async def get_or_generate(
+        self, engine: TTSInterface, text: str
+    ) -> Optional[TTSAudio]:
+        """
+        Get the audio of a text from the cache, synthesizing it on a miss.
+
+        Returns:
+            TTSAudio | None: The audio, or None if synthesis failed
+        """
+        if not self.enabled:
+            return await engine.async_generate_audio_data(text)
+
+        key = self.key(engine, text)
+        audio = await self.get(key)
+        if audio is not None:
+            return audio
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Another task is already synthesizing the same text
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The task synthesizing it was interrupted, do it ourselves
+                return await engine.async_generate_audio_data(text)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            audio = await engine.async_generate_audio_data(text)
+            if audio is not None:
+                await self.put(key, audio)
+            future.set_result(audio)
+            return audio
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; avoid "never retrieved" warnings
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    async def get(self, key: str) -> Optional[TTSAudio]:
+        """Look up an entry in memory, then on disk"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return audio
+
+        audio = None
+        if self._disk_limit > 0:
+            audio = await asyncio.to_thread(self._read_disk, key)
+        with self._lock:
+            self._stats["disk_hits" if audio is not None else "misses"] += 1
+        if audio is not None:
+            self._put_memory(key, audio)
+        return audio
+
+    async def put(self, key: str, audio: TTSAudio) -> None:
+        """Store an entry in both tiers"""
+        if audio.data is None:
+            # Store rendered WAV so entries are always encoded audio files
+            audio = TTSAudio(data=audio.to_bytes(), format="wav")
+        self._put_memory(key, audio)
+        if self._disk_limit > 0:
+            await asyncio.to_thread(self._write_disk, key, audio)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and the current size of each tier"""
+        with self._lock:
+            lookups = (
+                self._stats["memory_hits"]
+                + self._stats["disk_hits"]
+                + self._stats["misses"]
+            )
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_limit_bytes": self._memory_limit,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "disk_limit_bytes": self._disk_limit,
+            }
+
+    # ==== Internals
+
+    def _put_memory(self, key: str, audio: TTSAudio) -> None:
+        size = len(audio.data)
+        if size > self._memory_limit:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old.data)
+            self._memory[key] = audio
+            self._memory_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both tiers fit their limits"""
+        removed = []
+        with self._lock:
+            while self._memory and self._memory_bytes > self._memory_limit:
+                _, audio = self._memory.popitem(last=False)
+                self._memory_bytes -= len(audio.data)
+                self._stats["evictions"] += 1
+            while self._disk and self._disk_bytes > self._disk_limit:
+                _, (path, size) = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self._stats["evictions"] += 1
+                removed.append(path)
+        for path in removed:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove TTS cache file {path}: {e}")
+
+    def _load_disk_index(self) -> None:
+        """Index the files left on disk by earlier runs, oldest first"""
+        if self._disk_loaded:
+            return
+        entries = []
+        if os.path.isdir(self._cache_dir):
+            for entry in os.scandir(self._cache_dir):
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                stat = entry.stat()
+                key = entry.name.split(".", 1)[0]
+                entries.append((stat.st_mtime, key, entry.path, stat.st_size))
+        entries.sort()
+        with self._lock:
+            if self._disk_loaded:
+                return
+            for _, key, path, size in entries:
+                self._disk[key] = (path, size)
+                self._disk_bytes += size
+            self._disk_loaded = True
+        if entries:
+            logger.info(
+                f"TTS cache: {len(entries)} entries ({self._disk_bytes} bytes) on disk"
+            )
+        self._evict()
+
+    def _read_disk(self, key: str) -> Optional[TTSAudio]:
+        self._load_disk_index()
+        with self._lock:
+            entry = self._disk.get(key)
+            if entry is None:
+                return None
+            self._disk.move_to_end(key)
+        path, _ = entry
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # The mtime orders entries by last use across restarts
+            os.utime(path, (time.time(), time.time()))
+        except OSError as e:
+            logger.warning(f"Failed to read TTS cache file {path}: {e}")
+            with self._lock:
+                if self._disk.pop(key, None) is not None:
+                    self._disk_bytes -= entry[1]
+            return None
+        return TTSAudio(data=data, format=os.path.splitext(path)[1].lstrip("."))
+
+    def _write_disk(self, key: str, audio: TTSAudio) -> None:
+        self._load_disk_index()
+        size = len(audio.data)
+        if size > self._disk_limit:
+            return
+        os.makedirs(self._cache_dir, exist_ok=True)
+        path = os.path.join(self._cache_dir, f"{key}.{audio.format or 'bin'}")
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio.data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache file {path}: {e}")
+            return
+        with self._lock:
+            old = self._disk.pop(key, None)
+            if old is not None:
+                self._disk_bytes -= old[1]
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+        if old is not None and old[0] != path:
+            try:
+                os.remove(old[0])
+            except OSError:
+                pass
+        self._evict()
+
+
+tts_cache = TTSCache()
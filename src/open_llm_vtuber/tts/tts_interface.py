@@ -1,11 +1,332 @@
 import abc
+import io
 import os
+import time
+import uuid
+import wave
 import asyncio
+import threading
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional
 
+import numpy as np
 from loguru import logger
 
 
+@dataclass
+class TTSAudio:
+    """
+    Audio synthesized in memory.
+
+    Either `data` holds an encoded audio file (wav, mp3, ...) in `format`, or
+    `samples` holds PCM samples (float in [-1, 1] or int16) at `sample_rate`.
+    """
+
+    data: Optional[bytes] = None
+    format: Optional[str] = None
+    samples: Optional[np.ndarray] = None
+    sample_rate: Optional[int] = None
+    channels: int = 1
+
+    def to_bytes(self) -> bytes:
+        """Get the audio as an encoded file, rendering samples as 16 bit WAV."""
+        if self.data is not None:
+            return self.data
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(self.pcm16())
+        return buffer.getvalue()
+
+    def pcm16(self) -> bytes:
+        """Get `samples` as little-endian 16 bit PCM bytes."""
+        samples = np.asarray(self.samples)
+        if samples.dtype.kind == "f":
+            samples = np.clip(samples, -1.0, 1.0) * 32767
+        return samples.astype("<i2").tobytes()
+
+    @property
+    def file_extension(self) -> str:
+        return self.format if self.data is not None else "wav"
+
+
+def pcm_chunks(
+    byte_chunks: Iterable[bytes],
+    sample_rate: int,
+    chunk_ms: int = 100,
+    channels: int = 1,
+) -> Iterator[TTSAudio]:
+    """
+    Regroup a stream of raw 16 bit PCM bytes into chunks of at least `chunk_ms`.
+
+    Network streams split audio at arbitrary byte offsets; this realigns them to
+    whole samples so every chunk can be decoded on its own.
+    """
+    min_bytes = max(2 * channels, sample_rate * 2 * channels * chunk_ms // 1000)
+    buffer = bytearray()
+    for data in byte_chunks:
+        buffer.extend(data)
+        if len(buffer) >= min_bytes:
+            yield _take_pcm(buffer, sample_rate, channels)
+    if len(buffer) >= 2 * channels:
+        yield _take_pcm(buffer, sample_rate, channels)
+
+
+async def async_pcm_chunks(
+    byte_chunks: AsyncIterator[bytes],
+    sample_rate: int,
+    chunk_ms: int = 100,
+    channels: int = 1,
+) -> AsyncIterator[TTSAudio]:
+    """Like `pcm_chunks`, for the byte stream of an async HTTP response."""
+    min_bytes = max(2 * channels, sample_rate * 2 * channels * chunk_ms // 1000)
+    buffer = bytearray()
+    async for data in byte_chunks:
+        buffer.extend(data)
+        if len(buffer) >= min_bytes:
+            yield _take_pcm(buffer, sample_rate, channels)
+    if len(buffer) >= 2 * channels:
+        yield _take_pcm(buffer, sample_rate, channels)
+
+
+def _take_pcm(buffer: bytearray, sample_rate: int, channels: int) -> TTSAudio:
+    """Remove the whole samples at the start of the buffer as a chunk"""
+    usable = len(buffer) - len(buffer) % (2 * channels)
+    chunk = TTSAudio(
+        samples=np.frombuffer(bytes(buffer[:usable]), dtype="<i2"),
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+    del buffer[:usable]
+    return chunk
+
+
+class TTSCancelled(asyncio.CancelledError):
+    """
+    Raised inside a TTS engine when the synthesis it is working on was cancelled.
+
+    It derives from CancelledError so it passes through the generic
+    `except Exception` error handling of the engines.
+    """
+
+
+class CancelToken:
+    """
+    Cooperative cancellation of one synthesis, shared with worker threads.
+
+    Cancelling the asyncio task of a synthesis cannot stop an engine that runs
+    in a worker thread. The token is set in a context variable before the
+    engine is called, so engines (and the helpers below) can check it between
+    chunks and stop early; `asyncio.to_thread` copies it into the thread.
+    """
+
+    def __init__(self, on_overrun: Optional[Callable[[float], None]] = None):
+        """
+        Args:
+            on_overrun: Called with the seconds a worker thread kept running
+                after the token was cancelled, once that thread stops
+        """
+        self._event = threading.Event()
+        self._on_overrun = on_overrun
+        self.cancelled_at: Optional[float] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        if not self._event.is_set():
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TTSCancelled()
+
+    def worker_stopped(self) -> None:
+        """Report that a worker thread using this token has returned"""
+        if self.cancelled_at is not None and self._on_overrun:
+            self._on_overrun(time.monotonic() - self.cancelled_at)
+
+
+_cancel_token: ContextVar[Optional[CancelToken]] = ContextVar(
+    "tts_cancel_token", default=None
+)
+
+
+def set_cancel_token(token: Optional[CancelToken]) -> None:
+    """Attach a cancel token to the synthesis running in the current task"""
+    _cancel_token.set(token)
+
+
+def is_cancelled() -> bool:
+    """Whether the synthesis running in this context was cancelled"""
+    token = _cancel_token.get()
+    return token is not None and token.cancelled
+
+
+def check_cancelled() -> None:
+    """
+    Raise TTSCancelled if the synthesis running in this context was cancelled.
+
+    Engines call this between chunks of work.
+    """
+    token = _cancel_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def read_cancellable(chunks: Iterable[bytes]) -> bytes:
+    """
+    Join the chunks of a streamed response, checking for cancellation between
+    chunks. Leaving the response early closes the connection, which aborts the
+    request on the server.
+    """
+    data = bytearray()
+    for chunk in chunks:
+        check_cancelled()
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _run_in_worker(func: Callable, *args):
+    """Run blocking engine code, reporting overruns of a cancelled token"""
+    try:
+        return func(*args)
+    finally:
+        token = _cancel_token.get()
+        if token is not None:
+            token.worker_stopped()
+
+
+async def iterate_in_thread(func: Callable[..., Iterable], *args) -> AsyncIterator:
+    """
+    Iterate a blocking generator (such as a streaming HTTP response of a sync
+    SDK) in a worker thread, yielding its items on the event loop as they arrive.
+
+    The generator is closed as soon as the consumer stops iterating or the
+    synthesis is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stopped = threading.Event()
+
+    def put(item) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop is already closed
+            pass
+
+    def produce() -> None:
+        items = None
+        try:
+            items = func(*args)
+            for item in items:
+                if stopped.is_set() or is_cancelled():
+                    break
+                put((item, None))
+        except BaseException as e:
+            put((None, e))
+        finally:
+            if items is not None and hasattr(items, "close"):
+                items.close()
+            put((done, None))
+
+    context = copy_context()
+    producer = loop.run_in_executor(None, context.run, _run_in_worker, produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+        await producer
+    finally:
+        stopped.set()
+
+
+async def decode_audio_stream(
+    chunks: AsyncIterator[bytes],
+    input_format: str,
+    sample_rate: int,
+    chunk_ms: int = 100,
+) -> AsyncIterator[TTSAudio]:
+    """
+    Decode a stream of compressed audio (e.g. mp3) to mono 16 bit PCM chunks
+    with an ffmpeg subprocess, yielding audio while the input is still arriving.
+
+    Raises:
+        FileNotFoundError: If ffmpeg is not installed
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-loglevel",
+        "error",
+        "-f",
+        input_format,
+        "-i",
+        "pipe:0",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+
+    async def feed() -> None:
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    chunk_bytes = sample_rate * 2 * chunk_ms // 1000
+    try:
+        while True:
+            try:
+                data = await process.stdout.readexactly(chunk_bytes)
+            except asyncio.IncompleteReadError as e:
+                data = e.partial[: len(e.partial) - len(e.partial) % 2]
+                if data:
+                    yield TTSAudio(
+                        samples=np.frombuffer(data, dtype="<i2"),
+                        sample_rate=sample_rate,
+                    )
+                break
+            yield TTSAudio(
+                samples=np.frombuffer(data, dtype="<i2"), sample_rate=sample_rate
+            )
+        # Surface errors of the input stream
+        await feeder
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+
 class TTSInterface(metaclass=abc.ABCMeta):
+    # Whether async_stream_audio yields audio before synthesis is complete
+    supports_streaming: bool = False
+    # Identifies the engine type and settings in TTS cache keys, see tts_cache
+    cache_namespace: Optional[str] = None
+    # Sentences synthesized at the same time, see conversations.tts_scheduler
+    max_concurrency: int = 2
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
@@ -39,6 +360,93 @@ class TTSInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        """
+        Generate speech audio in memory, without writing to the cache directory.
+
+        Engines that can produce audio in memory should override this. The
+        default implementation adapts the file-based `generate_audio`: it
+        generates a cache file, reads it back and removes it.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated audio, or None if generation failed
+        """
+        check_cancelled()
+        file_path = self.generate_audio(text, f"mem_{uuid.uuid4().hex}")
+        if not file_path:
+            return None
+        try:
+            check_cancelled()
+            with open(file_path, "rb") as f:
+                data = f.read()
+        finally:
+            self.remove_file(file_path, verbose=False)
+        file_format = os.path.splitext(file_path)[1].lstrip(".").lower() or None
+        return TTSAudio(data=data, format=file_format)
+
+    async def async_generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        """
+        Asynchronously generate speech audio in memory.
+
+        By default, this runs the synchronous generate_audio_data in a thread.
+        Subclasses can override this method to provide true async implementation.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated audio, or None if generation failed
+        """
+        return await asyncio.to_thread(_run_in_worker, self.generate_audio_data, text)
+
+    async def async_stream_audio(self, text: str) -> AsyncIterator[TTSAudio]:
+        """
+        Stream speech audio while it is being synthesized.
+
+        Every chunk is decodable on its own (PCM samples or a small audio file),
+        so it can be forwarded to the client as soon as it arrives. Engines whose
+        APIs stream should override this and set `supports_streaming`. By default
+        the whole audio is yielded as a single chunk.
+
+        text: str
+            the text to speak
+
+        Yields:
+        TTSAudio: the next chunk of audio
+        """
+        audio = await self.async_generate_audio_data(text)
+        if audio is not None:
+            yield audio
+
+    def save_audio_data(
+        self, audio: Optional[TTSAudio], file_name_no_ext=None
+    ) -> Optional[str]:
+        """
+        Write in-memory audio to a cache file.
+
+        Lets engines that implement `generate_audio_data` keep supporting the
+        file-based `generate_audio`.
+
+        audio: TTSAudio | None
+            the audio to write
+        file_name_no_ext: str
+            name of the file without extension
+
+        Returns:
+        str | None: the path to the written file, or None if there is no audio
+        """
+        if audio is None:
+            return None
+        file_name = self.generate_cache_file_name(
+            file_name_no_ext, audio.file_extension
+        )
+        with open(file_name, "wb") as f:
+            f.write(audio.to_bytes())
+        return file_name
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         """
         Remove a file from the file system.
@@ -0,0 +1,185 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .tts_interface import TTSAudio, TTSInterface
+
+# ==== Worker side
+
+# The engine of this worker process, loaded once by the pool initializer
+_worker_engine: Optional[TTSInterface] = None
+
+# (shared memory name, byte length, format, dtype, sample rate, channels)
+_AudioHandle = Tuple[str, int, Optional[str], Optional[str], Optional[int], int]
+
+
+def _init_worker(engine_type: str, engine_config: dict) -> None:
+    """Load the TTS model once when the worker process starts"""
+    from .tts_factory import TTSFactory
+
+    global _worker_engine
+    _worker_engine = TTSFactory.get_tts_engine(engine_type, **engine_config)
+    logger.info(f"TTS worker {os.getpid()} loaded {engine_type}")
+
+
+def _synthesize_in_worker(text: str) -> Optional[_AudioHandle]:
+    """
+    Synthesize a sentence and place the audio in a new shared memory block.
+
+    The block is handed over to the parent process, which unlinks it after
+    copying the audio out. Blocks that are never picked up are removed by the
+    resource tracker when the server exits.
+    """
+    audio = _worker_engine.generate_audio_data(text)
+    if audio is None:
+        return None
+
+    if audio.data is not None:
+        buffer = np.frombuffer(audio.data, dtype=np.uint8)
+        dtype = None
+    else:
+        buffer = np.ascontiguousarray(audio.samples)
+        dtype = buffer.dtype.str
+    size = max(1, buffer.nbytes)
+
+    block = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        block.buf[: buffer.nbytes] = buffer.view(np.uint8).reshape(-1)
+    finally:
+        block.close()
+    return (
+        block.name,
+        buffer.nbytes,
+        audio.format,
+        dtype,
+        audio.sample_rate,
+        audio.channels,
+    )
+
+
+def _read_shared_audio(handle: _AudioHandle) -> TTSAudio:
+    """Copy the audio out of a worker's shared memory block and free it"""
+    name, nbytes, audio_format, dtype, sample_rate, channels = handle
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(block.buf[:nbytes])
+    finally:
+        block.close()
+        block.unlink()
+    if dtype is None:
+        return TTSAudio(data=data, format=audio_format)
+    return TTSAudio(
+        samples=np.frombuffer(data, dtype=dtype),
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+
+
+def _discard_result(future: Future) -> None:
+    """Free the shared memory of a synthesis whose caller has gone away"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    handle = future.result()
+    if handle:
+        _read_shared_audio(handle)
+
+
+# ==== Server side
+
+
+class ProcessPoolTTSEngine(TTSInterface):
+    """
+    Runs a local TTS engine in a pool of worker processes.
+
+    CPU-bound engines called through `asyncio.to_thread` compete for the GIL
+    with the web server and the VAD loop. Here every worker process loads its
+    own copy of the model once, and the audio comes back through shared
+    memory instead of being pickled through the result pipe.
+
+    If a worker dies (for example the model crashes), the pool is replaced
+    and the sentence is retried once; the server keeps running either way.
+    """
+
+    # Engines that synthesize on the local CPU. The others call an HTTP API
+    # or a separate server, where a worker process only adds overhead.
+    LOCAL_ENGINES = frozenset(
+        {"sherpa_onnx_tts", "coqui_tts", "melo_tts", "bark_tts", "pyttsx3_tts"}
+    )
+
+    def __init__(self, engine_type: str, engine_config: dict, workers: int = 2):
+        self.engine_type = engine_type
+        self.engine_config = engine_config
+        self.workers = max(1, workers)
+        self.max_concurrency = self.workers
+        # Used in TTS cache keys like the attributes of the wrapped engine
+        self.voice = engine_config.get("voice") or engine_config.get("voice_id")
+        self._pool_lock = threading.Lock()
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        logger.info(
+            f"Starting {self.workers} TTS worker processes for {self.engine_type}"
+        )
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            # spawn: forking a server with running threads and loaded models
+            # is unsafe, and CUDA cannot be used in forked children
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.engine_type, self.engine_config),
+        )
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is not broken:
+                # Another caller already replaced it
+                return
+            logger.error(f"A TTS worker of {self.engine_type} died, restarting pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._create_pool()
+
+    async def async_generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                future = pool.submit(_synthesize_in_worker, text)
+                # Cancelling drops sentences that have not started yet
+                handle = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.add_done_callback(_discard_result)
+                raise
+            except BrokenProcessPool:
+                self._restart_pool(pool)
+                if attempt == 0:
+                    continue
+                logger.error(f"TTS worker died twice while synthesizing: {text}")
+                return None
+            return _read_shared_audio(handle) if handle else None
+
+    def generate_audio_data(self, text: str) -> Optional[TTSAudio]:
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                handle = pool.submit(_synthesize_in_worker, text).result()
+            except BrokenProcessPool:
+                self._restart_pool(pool)
+                if attempt == 0:
+                    continue
+                logger.error(f"TTS worker died twice while synthesizing: {text}")
+                return None
+            return _read_shared_audio(handle) if handle else None
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> Optional[str]:
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,6 @@
 import requests
-from loguru import logger
-from .tts_interface import TTSInterface
+from .http_client import get_http_client, response_audio
+from .tts_interface import TTSInterface, read_cancellable
 
 
 class TTSEngine(TTSInterface):
@@ -17,27 +17,37 @@ class TTSEngine(TTSInterface):
         self.file_extension = "wav"
 
     def generate_audio(self, text, file_name_no_ext=None):
-        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        return self.save_audio_data(self.generate_audio_data(text), file_name_no_ext)
 
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        return self.save_audio_data(
+            await self.async_generate_audio_data(text), file_name_no_ext
+        )
+
+    def _payload(self, text):
         # Prepare the data for the POST request
-        data = {
+        return {
             "text": text,
             "speaker_wav": self.speaker_wav,
             "language": self.language,
         }
 
-        # Send POST request to the TTS API
-        response = requests.post(self.api_url, json=data, timeout=120)
+    async def async_generate_audio_data(self, text):
+        client = get_http_client("x_tts", self.max_concurrency)
+        async with client.stream(
+            "POST", self.api_url, json=self._payload(text)
+        ) as response:
+            return response_audio(
+                response.status_code, await response.aread(), self.file_extension
+            )
 
-        # Check if the request was successful
-        if response.status_code == 200:
-            # Save the audio content to a file
-            with open(file_name, "wb") as audio_file:
-                audio_file.write(response.content)
-            return file_name
-        else:
-            # Handle errors or unsuccessful requests
-            logger.critical(
-                f"Error: Failed to generate audio. Status code: {response.status_code}"
+    def generate_audio_data(self, text):
+        # Send POST request to the TTS API
+        with requests.post(
+            self.api_url, json=self._payload(text), timeout=120, stream=True
+        ) as response:
+            return response_audio(
+                response.status_code,
+                read_cancellable(response.iter_content(chunk_size=8192)),
+                self.file_extension,
             )
-            return None
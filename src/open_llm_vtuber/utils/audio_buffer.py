@@ -0,0 +1,125 @@
+from typing import Literal
+
+import numpy as np
+from loguru import logger
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
+
+class AudioBuffer:
+    """
+    Accumulates the float32 samples of one utterance from many small frames.
+
+    Samples are copied into a preallocated array whose capacity doubles when
+    it is full, so appending is amortized O(1) instead of reallocating and
+    copying everything received so far like `np.append`. `take` hands the
+    utterance out as a view of that array, without a copy.
+
+    The buffer holds at most `max_seconds` of audio. Past that, the overflow
+    policy decides which audio is kept:
+
+    - "drop_oldest": the most recent `max_seconds`, dropping the start
+    - "drop_newest": the first `max_seconds`, ignoring what comes after
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        max_seconds: float = 60.0,
+        overflow: OverflowPolicy = "drop_oldest",
+        initial_seconds: float = 2.0,
+    ):
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_seconds * sample_rate)
+        self.overflow = overflow
+        self.initial_samples = max(1, int(initial_seconds * sample_rate))
+        self.dropped_samples = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Storage is allocated on the first append, so an idle client costs
+        # nothing and a taken utterance is never overwritten
+        self._data = np.empty(0, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def seconds(self) -> float:
+        return len(self) / self.sample_rate
+
+    def append(self, samples) -> None:
+        """
+        Append samples to the utterance.
+
+        Args:
+            samples: Mono audio, cast to float32 while it is copied in
+        """
+        samples = np.asarray(samples).reshape(-1)
+        if len(samples) == 0:
+            return
+
+        overflow = len(self) + len(samples) - self.max_samples
+        if overflow > 0:
+            self.dropped_samples += overflow
+            if self.overflow == "drop_newest":
+                samples = samples[: len(samples) - overflow]
+            elif overflow >= len(self):
+                samples = samples[len(samples) - self.max_samples :]
+                self._start = self._end
+            else:
+                self._start += overflow
+
+        self._reserve(len(samples))
+        self._data[self._end : self._end + len(samples)] = samples
+        self._end += len(samples)
+
+    def _reserve(self, count: int) -> None:
+        """Make room for `count` more samples after the end"""
+        if self._end + count <= len(self._data):
+            return
+        length = len(self)
+        needed = length + count
+        if needed <= len(self._data) // 2:
+            # Plenty of room once the dropped start is reclaimed
+            self._data[:length] = self._data[self._start : self._end]
+        else:
+            # Room for at least as much again, so copies stay amortized O(1)
+            capacity = max(len(self._data), self.initial_samples)
+            while capacity < 2 * needed:
+                capacity *= 2
+            capacity = min(capacity, 2 * self.max_samples)
+            data = np.empty(capacity, dtype=np.float32)
+            data[:length] = self._data[self._start : self._end]
+            self._data = data
+        self._start, self._end = 0, length
+
+    def view(self) -> np.ndarray:
+        """The samples received so far, as a view that later appends may change"""
+        return self._data[self._start : self._end]
+
+    def take(self) -> np.ndarray:
+        """
+        Hand out the utterance and start a new one.
+
+        Returns:
+            np.ndarray: The float32 samples, a view of the buffer's storage
+            that the buffer no longer writes to
+        """
+        samples = self.view()
+        if self.dropped_samples:
+            logger.warning(
+                f"Utterance over the {self.max_samples / self.sample_rate:.0f}s limit, "
+                f"{self.dropped_samples / self.sample_rate:.1f}s of audio dropped "
+                f"({self.overflow})"
+            )
+        self.dropped_samples = 0
+        self._reset()
+        return samples
+
+    def clear(self) -> None:
+        """Discard the utterance"""
+        self.dropped_samples = 0
+        self._reset()
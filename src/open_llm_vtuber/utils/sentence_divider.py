@@ -304,6 +304,7 @@ class SentenceDivider:
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
         valid_tags: List[str] = None,
+        parse_tags: bool = True,
     ):
         """
         Initialize the SentenceDivider.
@@ -312,10 +313,12 @@ class SentenceDivider:
             faster_first_response: Whether to split first sentence at commas
             segment_method: Method for segmenting sentences
             valid_tags: List of valid tag names to detect
+            parse_tags: Whether to detect tags at all. If False, tags are
+                kept in the sentences as plain text
         """
         self.faster_first_response = faster_first_response
         self.segment_method = segment_method
-        self.valid_tags = valid_tags or ["think"]
+        self.valid_tags = (valid_tags or ["think"]) if parse_tags else []
         self._is_first_sentence = True
         self._buffer = ""
         # Replace active_tags dict with a stack to handle nesting
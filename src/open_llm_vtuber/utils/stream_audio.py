@@ -1,45 +1,284 @@
 import base64
+import io
+import json
+import struct
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Literal
+
+import numpy as np
+import soundfile as sf
+from numpy.lib.stride_tricks import sliding_window_view
 from pydub import AudioSegment
-from pydub.utils import make_chunks
 from ..agent.output_types import Actions
 from ..agent.output_types import DisplayText
+from ..tts.tts_interface import TTSAudio
+
+
+@dataclass
+class AudioStreamFormat:
+    """How audio is sent to a client, negotiated per session.
+
+    - transport "json": the legacy `audio` message with base64 WAV inside JSON.
+    - transport "binary": one binary WebSocket message per sentence, see
+      `prepare_audio_frame`.
+
+    The codec is "wav", "pcm" (binary transport only) or "opus", an Ogg Opus
+    file encoded at about `bitrate_kbps` per channel.
+    """
+
+    transport: Literal["json", "binary"] = "json"
+    codec: Literal["wav", "pcm", "opus"] = "wav"
+    bitrate_kbps: int = 32
+
+    @property
+    def is_binary(self) -> bool:
+        return self.transport == "binary"
+
+
+# Binary audio frame: a 4 byte big-endian header length, the UTF-8 JSON header,
+# then the raw audio bytes. Header and audio travel in a single WebSocket
+# message so other messages can never be interleaved between them.
+AUDIO_FRAME_HEADER = struct.Struct(">I")
+
+# Sample formats of binary microphone frames sent by clients, little-endian
+MIC_SAMPLE_FORMATS = {"int16": np.dtype("<i2"), "float32": np.dtype("<f4")}
+
+# Sample rates the Opus encoder accepts, other audio is resampled
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+@lru_cache(maxsize=None)
+def opus_available() -> bool:
+    """Whether the installed libsndfile can write Ogg Opus (1.1.0 or newer)"""
+    try:
+        return "OPUS" in sf.available_subtypes("OGG")
+    except Exception:
+        return False
+
+
+def opus_sample_rate(sample_rate: int) -> int:
+    """The Opus sample rate audio of the given rate is encoded at"""
+    return next((rate for rate in OPUS_SAMPLE_RATES if rate >= sample_rate), 48000)
+
+
+def encode_opus(audio: AudioSegment, bitrate_kbps: int = 32) -> bytes:
+    """
+    Encode audio as an Ogg Opus file.
+
+    Parameters:
+        audio (AudioSegment): The audio to encode.
+        bitrate_kbps (int): Target bitrate per channel in kbit/s.
+
+    Returns:
+        bytes: The Ogg Opus file.
+    """
+    sample_rate = opus_sample_rate(audio.frame_rate)
+    if sample_rate != audio.frame_rate:
+        audio = audio.set_frame_rate(sample_rate)
+    if audio.sample_width != 2:
+        audio = audio.set_sample_width(2)
+    samples = np.frombuffer(audio.raw_data, dtype="<i2").reshape(-1, audio.channels)
+    # libsndfile maps its compression level linearly onto 256 to 6 kbit/s per
+    # channel
+    level = min(1.0, max(0.0, (256 - bitrate_kbps) / 250))
+    buffer = io.BytesIO()
+    sf.write(
+        buffer,
+        samples,
+        sample_rate,
+        format="OGG",
+        subtype="OPUS",
+        compression_level=level,
+    )
+    return buffer.getvalue()
+
+
+def pcm_to_array(pcm: bytes, sample_width: int) -> np.ndarray:
+    """
+    Decode little-endian signed PCM bytes into an array of integer samples.
+
+    Parameters:
+        pcm (bytes): Raw PCM data, channels interleaved.
+        sample_width (int): Bytes per sample (1, 2, 3 or 4).
+
+    Returns:
+        np.ndarray: The samples, channels still interleaved.
+    """
+    if sample_width == 3:
+        # No 24 bit dtype: place each sample in the upper bytes of an int32
+        raw = np.frombuffer(pcm, dtype=np.uint8)
+        raw = raw[: len(raw) - len(raw) % 3].reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        return padded.view("<i4").reshape(-1) >> 8
+    dtype = {1: np.int8, 2: "<i2", 4: "<i4"}.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+    return np.frombuffer(pcm, dtype=dtype, count=len(pcm) // sample_width)
+
+
+def get_volume_envelope(
+    samples: np.ndarray,
+    sample_rate: int,
+    channels: int = 1,
+    chunk_length_ms: int = 20,
+    peak_hold_ms: int = 0,
+    normalize: bool = True,
+) -> list:
+    """
+    Calculate the normalized volume (RMS) envelope of PCM samples for lip sync.
+
+    The samples are reshaped into one row per chunk and the RMS of every chunk
+    is computed in a single vectorized pass. A trailing partial chunk gets its
+    own value, like the last chunk of `pydub.utils.make_chunks`.
+
+    Parameters:
+        samples (np.ndarray): PCM samples, channels interleaved.
+        sample_rate (int): Sample rate of the audio in Hz.
+        channels (int): Number of interleaved channels.
+        chunk_length_ms (int): The length of each chunk in milliseconds.
+        peak_hold_ms (int): If longer than a chunk, every value is raised to the
+            highest value within this many milliseconds before it, so the
+            mouth does not flutter shut between syllables.
+        normalize (bool): Scale the envelope so its loudest chunk is 1. If
+            False, the raw RMS values are returned and silence is allowed.
+
+    Returns:
+        list: Normalized volumes for each chunk.
+    """
+    values_per_chunk = (
+        max(1, round(sample_rate * chunk_length_ms / 1000)) * channels
+    )
+    # float32 is plenty for a normalized envelope and much faster than float64
+    samples = np.asarray(samples, dtype=np.float32)
+    full_chunks = len(samples) // values_per_chunk
+    split = full_chunks * values_per_chunk
+
+    frames = samples[:split].reshape(full_chunks, values_per_chunk)
+    volumes = np.sqrt(np.einsum("ij,ij->i", frames, frames) / values_per_chunk)
+    if split < len(samples):
+        tail = samples[split:]
+        volumes = np.append(volumes, np.sqrt(np.dot(tail, tail) / len(tail)))
+
+    if normalize:
+        max_volume = volumes.max() if len(volumes) else 0
+        if max_volume == 0:
+            raise ValueError("Audio is empty or all zero.")
+        volumes /= max_volume
+
+    hold_chunks = peak_hold_ms // chunk_length_ms if chunk_length_ms else 0
+    if hold_chunks > 1:
+        padded = np.concatenate([np.zeros(hold_chunks - 1), volumes])
+        volumes = sliding_window_view(padded, hold_chunks).max(axis=1)
+
+    return volumes.tolist()
 
 
-def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
+def _get_volume_by_chunks(
+    audio: AudioSegment, chunk_length_ms: int, peak_hold_ms: int = 0
+) -> list:
     """
     Calculate the normalized volume (RMS) for each chunk of the audio.
 
     Parameters:
         audio (AudioSegment): The audio segment to process.
         chunk_length_ms (int): The length of each audio chunk in milliseconds.
+        peak_hold_ms (int): Peak-hold window, see `get_volume_envelope`.
 
     Returns:
         list: Normalized volumes for each chunk.
     """
-    chunks = make_chunks(audio, chunk_length_ms)
-    volumes = [chunk.rms for chunk in chunks]
-    max_volume = max(volumes)
-    if max_volume == 0:
-        raise ValueError("Audio is empty or all zero.")
-    return [volume / max_volume for volume in volumes]
+    return get_volume_envelope(
+        pcm_to_array(audio.raw_data, audio.sample_width),
+        sample_rate=audio.frame_rate,
+        channels=audio.channels,
+        chunk_length_ms=chunk_length_ms,
+        peak_hold_ms=peak_hold_ms,
+    )
+
+
+def load_audio(audio: str | TTSAudio) -> AudioSegment:
+    """
+    Decode generated audio, from a file path or from memory.
+
+    Parameters:
+        audio (str | TTSAudio): Path to an audio file, or audio generated in memory.
+
+    Returns:
+        AudioSegment: The decoded audio.
+    """
+    if isinstance(audio, str):
+        return AudioSegment.from_file(audio)
+    if audio.data is None:
+        return AudioSegment(
+            data=audio.pcm16(),
+            sample_width=2,
+            frame_rate=audio.sample_rate,
+            channels=audio.channels,
+        )
+    return AudioSegment.from_file(io.BytesIO(audio.data), format=audio.format)
+
+
+def _to_wav_bytes(audio: str | TTSAudio, segment: AudioSegment) -> bytes:
+    """Get WAV bytes for the payload, reusing in-memory WAV data as is"""
+    if isinstance(audio, TTSAudio) and audio.data is not None and audio.format == "wav":
+        return audio.data
+    return segment.export(format="wav").read()
+
+
+def _encode_audio(
+    audio: str | TTSAudio, segment: AudioSegment, audio_format: AudioStreamFormat
+) -> bytes:
+    """Encode decoded audio with the codec of the client"""
+    if audio_format.codec == "wav":
+        return _to_wav_bytes(audio, segment)
+    if audio_format.codec == "opus":
+        return encode_opus(segment, audio_format.bitrate_kbps)
+    return segment.raw_data
+
+
+def _frame_audio_format(
+    segment: AudioSegment, audio_format: AudioStreamFormat, audio_bytes: bytes
+) -> dict:
+    """The `audio_format` field of a binary frame header"""
+    opus = audio_format.codec == "opus"
+    return {
+        "codec": audio_format.codec,
+        "sample_rate": (
+            opus_sample_rate(segment.frame_rate) if opus else segment.frame_rate
+        ),
+        "channels": segment.channels,
+        "sample_width": 2 if opus else segment.sample_width,
+        "byte_length": len(audio_bytes),
+    }
 
 
 def prepare_audio_payload(
-    audio_path: str | None,
+    audio_path: str | TTSAudio | None,
     chunk_length_ms: int = 20,
     display_text: DisplayText = None,
     actions: Actions = None,
     forwarded: bool = False,
+    peak_hold_ms: int = 0,
+    audio_format: AudioStreamFormat | None = None,
 ) -> dict[str, any]:
     """
     Prepares the audio payload for sending to a broadcast endpoint.
     If audio_path is None, returns a payload with audio=None for silent display.
 
+    The audio is base64 WAV, unless the client negotiated the "opus" codec. The
+    payload then holds base64 Ogg Opus and an `audio_format` field naming the
+    codec.
+
     Parameters:
-        audio_path (str | None): The path to the audio file to be processed, or None for silent display
+        audio_path (str | TTSAudio | None): The path to the audio file to be processed,
+            audio generated in memory, or None for silent display
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
+        peak_hold_ms (int): Peak-hold window of the volume envelope, 0 to disable
+        audio_format (AudioStreamFormat, optional): Negotiated format of the client
 
     Returns:
         dict: The audio payload to be sent
@@ -59,15 +298,16 @@ def prepare_audio_payload(
             "forwarded": forwarded,
         }
 
+    audio_format = audio_format or AudioStreamFormat()
     try:
-        audio = AudioSegment.from_file(audio_path)
-        audio_bytes = audio.export(format="wav").read()
+        audio = load_audio(audio_path)
+        audio_bytes = _encode_audio(audio_path, audio, audio_format)
     except Exception as e:
         raise ValueError(
             f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
         )
     audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-    volumes = _get_volume_by_chunks(audio, chunk_length_ms)
+    volumes = _get_volume_by_chunks(audio, chunk_length_ms, peak_hold_ms)
 
     payload = {
         "type": "audio",
@@ -78,9 +318,206 @@ def prepare_audio_payload(
         "actions": actions.to_dict() if actions else None,
         "forwarded": forwarded,
     }
+    if audio_format.codec != "wav":
+        payload["audio_format"] = {"codec": audio_format.codec}
 
     return payload
 
 
+def encode_audio_frame(header: dict, audio_bytes: bytes) -> bytes:
+    """Pack a JSON header and raw audio bytes into one binary audio frame"""
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    return AUDIO_FRAME_HEADER.pack(len(header_bytes)) + header_bytes + audio_bytes
+
+
+def decode_audio_frame(frame: bytes) -> tuple[dict, int]:
+    """Split a binary audio frame into its JSON header and the offset of the audio"""
+    (header_length,) = AUDIO_FRAME_HEADER.unpack_from(frame)
+    start = AUDIO_FRAME_HEADER.size
+    header = json.loads(frame[start : start + header_length])
+    return header, start + header_length
+
+
+def add_frame_fields(frame: bytes, **fields) -> bytes:
+    """Add fields to the JSON header of an encoded binary audio frame"""
+    header, audio_start = decode_audio_frame(frame)
+    header.update(fields)
+    return encode_audio_frame(header, frame[audio_start:])
+
+
+def decode_mic_frame(frame: bytes, sample_format: str) -> tuple[dict, np.ndarray]:
+    """
+    Decode a binary microphone frame sent by a client.
+
+    The frame has the layout of the audio frames sent to clients: the header
+    holds the message `type` ("mic-audio-data" or "raw-audio-data"), the audio
+    is mono little-endian PCM in the sample format the client negotiated.
+    float32 samples are used in place, without a copy, int16 samples are
+    scaled to the [-1, 1] floats of the JSON messages.
+
+    Parameters:
+        frame (bytes): The binary WebSocket message
+        sample_format (str): "int16" or "float32", see `MIC_SAMPLE_FORMATS`
+
+    Returns:
+        tuple[dict, np.ndarray]: The header and the float32 samples
+    """
+    header, audio_start = decode_audio_frame(frame)
+    samples = np.frombuffer(
+        frame, dtype=MIC_SAMPLE_FORMATS[sample_format], offset=audio_start
+    )
+    if sample_format == "int16":
+        samples = samples.astype(np.float32) / 32767
+    return header, samples
+
+
+def prepare_audio_frame(
+    audio_path: str | TTSAudio,
+    chunk_length_ms: int = 20,
+    display_text: DisplayText = None,
+    actions: Actions = None,
+    forwarded: bool = False,
+    sequence: int | None = None,
+    audio_format: AudioStreamFormat | None = None,
+    peak_hold_ms: int = 0,
+) -> bytes:
+    """
+    Prepares a binary audio frame for a client that negotiated the binary transport.
+
+    The header carries the same fields as the JSON `audio` payload (with `audio`
+    set to None) plus `sequence` and `audio_format`. The audio is sent as raw
+    little-endian PCM (codec "pcm"), as a WAV file (codec "wav") or as an Ogg
+    Opus file (codec "opus"), without the base64 and JSON string overhead of
+    `prepare_audio_payload`.
+
+    Parameters:
+        audio_path (str | TTSAudio): The path to the audio file to be processed,
+            or audio generated in memory
+        chunk_length_ms (int): The length of each audio chunk in milliseconds
+        display_text (DisplayText, optional): Text to be displayed with the audio
+        actions (Actions, optional): Actions associated with the audio
+        sequence (int, optional): Position of the sentence in the response
+        audio_format (AudioStreamFormat, optional): Negotiated format of the client
+        peak_hold_ms (int): Peak-hold window of the volume envelope, 0 to disable
+
+    Returns:
+        bytes: The binary frame to be sent
+    """
+    if isinstance(display_text, DisplayText):
+        display_text = display_text.to_dict()
+    audio_format = audio_format or AudioStreamFormat(transport="binary", codec="pcm")
+
+    try:
+        audio = load_audio(audio_path)
+        audio_bytes = _encode_audio(audio_path, audio, audio_format)
+    except Exception as e:
+        raise ValueError(f"Error loading generated audio file '{audio_path}': {e}")
+    volumes = _get_volume_by_chunks(audio, chunk_length_ms, peak_hold_ms)
+
+    header = {
+        "type": "audio",
+        "audio": None,
+        "volumes": volumes,
+        "slice_length": chunk_length_ms,
+        "display_text": display_text,
+        "actions": actions.to_dict() if actions else None,
+        "forwarded": forwarded,
+        "sequence": sequence,
+        "audio_format": _frame_audio_format(audio, audio_format, audio_bytes),
+    }
+    return encode_audio_frame(header, audio_bytes)
+
+
+class StreamingAudioFrames:
+    """
+    Encodes the chunks of one sentence that is streamed while it is synthesized.
+
+    Every chunk becomes a binary audio frame like `prepare_audio_frame`, with a
+    `stream` field `{"index": i, "final": false}` in the header. The display text
+    and actions only go with the first chunk. Once synthesis is done,
+    `encode_end` produces a final frame without audio that tells the client the
+    sentence is complete.
+
+    The whole sentence is never available, so volumes are normalized against
+    the loudest chunk seen so far instead of the loudest chunk of the sentence.
+    Chunks are never sent as "opus": an Ogg Opus file per chunk would repeat
+    the stream headers every ~100 ms, so they go out as "pcm" instead. Send
+    Opus for whole sentences with `prepare_audio_frame`.
+    """
+
+    def __init__(
+        self,
+        sequence: int,
+        audio_format: AudioStreamFormat | None = None,
+        display_text: DisplayText = None,
+        actions: Actions = None,
+        chunk_length_ms: int = 20,
+        forwarded: bool = False,
+    ):
+        if isinstance(display_text, DisplayText):
+            display_text = display_text.to_dict()
+        self.sequence = sequence
+        self.audio_format = audio_format or AudioStreamFormat(
+            transport="binary", codec="pcm"
+        )
+        if self.audio_format.codec == "opus":
+            self.audio_format = replace(self.audio_format, codec="pcm")
+        self.codec = self.audio_format.codec
+        self.display_text = display_text
+        self.actions = actions.to_dict() if actions else None
+        self.chunk_length_ms = chunk_length_ms
+        self.forwarded = forwarded
+        self.index = 0
+        self._peak = 0.0
+
+    def _header(self, volumes: list, audio_format: dict | None, final: bool) -> dict:
+        first = self.index == 0
+        return {
+            "type": "audio",
+            "audio": None,
+            "volumes": volumes,
+            "slice_length": self.chunk_length_ms,
+            "display_text": self.display_text if first else None,
+            "actions": self.actions if first else None,
+            "forwarded": self.forwarded,
+            "sequence": self.sequence,
+            "audio_format": audio_format,
+            "stream": {"index": self.index, "final": final},
+        }
+
+    def encode_chunk(self, chunk: TTSAudio) -> bytes:
+        """Encode one synthesized chunk of the sentence as a binary frame"""
+        audio = load_audio(chunk)
+        audio_bytes = _encode_audio(chunk, audio, self.audio_format)
+
+        volumes = np.asarray(
+            get_volume_envelope(
+                pcm_to_array(audio.raw_data, audio.sample_width),
+                sample_rate=audio.frame_rate,
+                channels=audio.channels,
+                chunk_length_ms=self.chunk_length_ms,
+                normalize=False,
+            )
+        )
+        if len(volumes):
+            self._peak = max(self._peak, float(volumes.max()))
+        if self._peak > 0:
+            volumes = volumes / self._peak
+
+        header = self._header(
+            volumes.tolist(),
+            _frame_audio_format(audio, self.audio_format, audio_bytes),
+            final=False,
+        )
+        self.index += 1
+        return encode_audio_frame(header, audio_bytes)
+
+    def encode_end(self) -> bytes:
+        """Encode the frame that marks the end of the sentence"""
+        header = self._header([], None, final=True)
+        self.index += 1
+        return encode_audio_frame(header, b"")
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 from collections import deque
 from enum import Enum
 
@@ -46,34 +47,126 @@ class VADEngine(VADInterface):
         self.window_size_samples = 512 if self.config.target_sr == 16000 else 256
         # 512 / 16000 = 0.032s
 
+        self.network = self._find_network()
+        self.reset_states()
+
     def load_vad_model(self):
         logger.info("Loading Silero-VAD model...")
         return load_silero_vad()
 
-    def detect_speech(self, audio_data: list[float]):
-        audio_np = np.array(audio_data, dtype=np.float32)
-        for i in range(0, len(audio_np), self.window_size_samples):
-            chunk_np = audio_np[i : i + self.window_size_samples]
-            if len(chunk_np) < self.window_size_samples:
-                break
-            chunk = torch.Tensor(chunk_np)
-
+    def _find_network(self):
+        """
+        The network behind the JIT wrapper of silero-vad 5 and 6: a stateless
+        STFT and conv encoder over each window plus `context_size_samples` of
+        the audio before it, and a decoder whose LSTM cell carries state
+        between windows. Everything but the LSTM cell runs over all windows
+        of a chunk in one batch.
+
+        These are internals of the model, so other releases or an ONNX model
+        may not have them. Returns None then, and the model is called once
+        per window instead.
+        """
+        name = "_model" if self.config.target_sr == 16000 else "_model_8k"
+        network = getattr(self.model, name, None)
+        decoder = getattr(network, "decoder", None)
+        if (
+            network is None
+            or decoder is None
+            or not all(
+                hasattr(network, attribute)
+                for attribute in ("context_size_samples", "run_extractors", "encoder")
+            )
+            or not all(hasattr(decoder, attribute) for attribute in ("rnn", "decoder"))
+        ):
+            logger.warning(
+                "Silero-VAD model does not have the expected layers, "
+                "running it once per window instead of batched"
+            )
+            return None
+        return network
+
+    def new_session(self) -> "VADEngine":
+        """
+        Create a VAD for another audio stream.
+
+        The new engine shares the loaded model with this one, but has its own
+        audio context, LSTM state and state machine with its speech buffers,
+        so concurrent streams are segmented independently.
+        """
+        session_engine = copy.copy(self)
+        if self.network is None:
+            # The state lives inside the model when it is called per window
+            session_engine.model = self.load_vad_model()
+        session_engine.state = StateMachine(self.config)
+        session_engine.reset_states()
+        return session_engine
+
+    def reset_states(self) -> None:
+        """Forget the audio context and the LSTM state of the model"""
+        if self.network is None:
+            self.model.reset_states()
+            return
+        self.context = np.zeros(self.network.context_size_samples, dtype=np.float32)
+        self.rnn_state = (torch.zeros(1, 128), torch.zeros(1, 128))
+
+    def speech_probs(self, audio_np: np.ndarray) -> np.ndarray:
+        """
+        Speech probability of every window of the audio, the values of
+        calling the model once per window up to float rounding.
+
+        Args:
+            audio_np: Float32 audio, a whole number of windows long
+
+        Returns:
+            np.ndarray: One probability per window
+        """
+        window = self.window_size_samples
+        if self.network is None:
+            windows = torch.from_numpy(audio_np).reshape(-1, window)
             with torch.no_grad():
-                speech_prob = self.model(chunk, self.config.target_sr).item()
+                probs = [self.model(w, self.config.target_sr).item() for w in windows]
+            return np.array(probs, dtype=np.float32)
+
+        context_size = self.network.context_size_samples
+        frames = np.concatenate([self.context, audio_np])
+        decoder = self.network.decoder
+
+        with torch.no_grad():
+            # Overlapping views of [context + window], no copies
+            windows = torch.from_numpy(frames).unfold(0, window + context_size, window)
+            features = self.network.encoder(self.network.run_extractors(windows))
+            features = features.squeeze(-1)
+
+            hidden = []
+            for i in range(len(features)):
+                self.rnn_state = decoder.rnn(features[i : i + 1], self.rnn_state)
+                hidden.append(self.rnn_state[0])
+            out = decoder.decoder(torch.cat(hidden).unsqueeze(-1))
 
+        self.context = frames[-context_size:].copy()
+        return out.squeeze(1).mean(1).numpy()
+
+    def detect_speech(self, audio_data: list[float]):
+        audio_np = np.asarray(audio_data, dtype=np.float32)
+        # An incomplete window at the end of the chunk is dropped
+        num_windows = len(audio_np) // self.window_size_samples
+        if num_windows == 0:
+            return
+        audio_np = audio_np[: num_windows * self.window_size_samples]
+
+        speech_probs = self.speech_probs(audio_np)
+        int_windows = audio_np.reshape(num_windows, -1) * 32767
+        dbs = StateMachine.calculate_db(int_windows)
+        int16_windows = int_windows.astype(np.int16)
+
+        for speech_prob, db, int16_window in zip(speech_probs, dbs, int16_windows):
             if speech_prob:
-                # print(speech_prob)
-                iter = self.state.get_result(speech_prob, chunk_np)
+                iter = self.state.get_result(speech_prob, db, int16_window.tobytes())
 
                 for probs, dbs, chunk in iter:  # detected a sequence of voice bytes
-                    # rounded_probs = [round(x, 2) for x in probs]
-                    # rounded_dbs = [round(y, 2) for y in dbs]
-
                     audio_chunk = bytes(chunk)
                     yield audio_chunk
 
-        del audio_np
-
 
 # Define state enumeration
 class State(Enum):
@@ -103,9 +196,11 @@ class StateMachine:
         self.pre_buffer = deque(maxlen=20)
 
     @classmethod
-    def calculate_db(cls, audio_data: np.ndarray) -> float:
-        rms = np.sqrt(np.mean(np.square(audio_data)))
-        return 20 * np.log10(rms + 1e-7) if rms > 0 else -np.inf
+    def calculate_db(cls, audio_data: np.ndarray) -> np.ndarray:
+        """Level in dB of the last axis, -inf for silence"""
+        rms = np.sqrt(np.mean(np.square(audio_data), axis=-1))
+        with np.errstate(divide="ignore"):
+            return np.where(rms > 0, 20 * np.log10(rms + 1e-7), -np.inf)
 
     def update(self, chunk_bytes, prob, db):
         self.probs.append(prob)
@@ -124,11 +219,7 @@ class StateMachine:
         smoothed_db = np.mean(self.db_window)
         return smoothed_prob, smoothed_db
 
-    def process(self, prob, float_chunk_np: np.ndarray):
-        int_chunk_np = float_chunk_np * 32767
-        chunk_bytes = int_chunk_np.astype(np.int16).tobytes()
-        db = self.calculate_db(int_chunk_np)
-
+    def process(self, prob, db, chunk_bytes: bytes):
         # Obtain the smoothed prob and db
         smoothed_prob, smoothed_db = self.get_smoothed_values(prob, db)
 
@@ -184,8 +275,8 @@ class StateMachine:
                         self.reset_buffers()
                     self.pre_buffer.clear()
 
-    def get_result(self, input_num, chunk_np):
-        yield from self.process(input_num, chunk_np)
+    def get_result(self, input_num, db, chunk_bytes):
+        yield from self.process(input_num, db, chunk_bytes)
 
 
 async def vad_main():
@@ -10,3 +10,16 @@ class VADInterface(ABC):
         :return: Returns a sequence of audio bytes containing human voice if voice activity is detected
         """
         pass
+
+    def new_session(self) -> "VADInterface":
+        """
+        Get a VAD instance for a new audio stream, such as a client session.
+
+        Engines that keep per-stream state (recurrent model state, speech
+        buffers) should override this to return a new instance that shares
+        the loaded model but not the state. By default the engine is shared.
+
+        Returns:
+            VADInterface - The VAD to use for the new stream
+        """
+        return self
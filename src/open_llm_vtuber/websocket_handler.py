@@ -14,19 +14,26 @@ from .chat_group import (
     broadcast_to_group,
 )
 from .message_handler import message_handler
-from .utils.stream_audio import prepare_audio_payload
-from .chat_history_manager import (
-    create_new_history,
-    get_history,
-    delete_history,
-    get_history_list,
+from .asr.asr_interface import ASRInterface
+from .utils.audio_buffer import AudioBuffer
+from .utils.stream_audio import (
+    MIC_SAMPLE_FORMATS,
+    AudioStreamFormat,
+    decode_mic_frame,
+    opus_available,
+    prepare_audio_payload,
 )
+from .chat_history_service import chat_history_service
 from .config_manager.utils import scan_config_alts_directory, scan_bg_directory
 from .conversations.conversation_handler import (
     handle_conversation_trigger,
     handle_group_interrupt,
     handle_individual_interrupt,
 )
+from .conversations.partial_transcription import PartialTranscriber
+
+# Page size of a history request with a cursor but no limit
+HISTORY_PAGE_SIZE = 50
 
 
 class MessageType(Enum):
@@ -51,9 +58,14 @@ class WSMessage(TypedDict, total=False):
     type: str
     action: Optional[str]
     text: Optional[str]
-    audio: Optional[List[float]]
+    audio: Optional[List[float] | np.ndarray]
     images: Optional[List[str]]
     history_uid: Optional[str]
+    cursor: Optional[int]
+    limit: Optional[int]
+    transport: Optional[str]
+    codec: Optional[str]
+    sample_format: Optional[str]
     file: Optional[str]
     display_text: Optional[dict]
 
@@ -68,7 +80,11 @@ class WebSocketHandler:
         self.chat_group_manager = ChatGroupManager()
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
-        self.received_data_buffers: Dict[str, np.ndarray] = {}
+        self.received_data_buffers: Dict[str, AudioBuffer] = {}
+        # Utterances transcribed while they are spoken, if the ASR can stream
+        self.partial_transcribers: Dict[str, PartialTranscriber] = {}
+        # Last raw-audio-data chunk, the start of speech the VAD detects late
+        self.previous_raw_chunks: Dict[str, np.ndarray] = {}
 
         # Message handlers mapping
         self._message_handlers = self._init_message_handlers()
@@ -95,6 +111,8 @@ class WebSocketHandler:
             "audio-play-start": self._handle_audio_play_start,
             "request-init-config": self._handle_init_config_request,
             "heartbeat": self._handle_heartbeat,
+            "set-audio-format": self._handle_set_audio_format,
+            "set-mic-format": self._handle_set_mic_format,
         }
 
     async def handle_new_connection(
@@ -111,7 +129,9 @@ class WebSocketHandler:
             Exception: If initialization fails
         """
         try:
-            session_service_context = await self._init_service_context(websocket.send_text, client_uid)
+            session_service_context = await self._init_service_context(
+                websocket.send_text, client_uid, websocket.send_bytes
+            )
 
             await self._store_client_data(
                 websocket, client_uid, session_service_context
@@ -139,7 +159,12 @@ class WebSocketHandler:
         """Store client data and initialize group status"""
         self.client_connections[client_uid] = websocket
         self.client_contexts[client_uid] = session_service_context
-        self.received_data_buffers[client_uid] = np.array([])
+        system_config = session_service_context.system_config
+        self.received_data_buffers[client_uid] = AudioBuffer(
+            sample_rate=ASRInterface.SAMPLE_RATE,
+            max_seconds=system_config.mic_buffer_max_seconds,
+            overflow=system_config.mic_buffer_overflow,
+        )
 
         self.chat_group_manager.client_group_map[client_uid] = ""
         await self.send_group_update(websocket, client_uid)
@@ -173,7 +198,9 @@ class WebSocketHandler:
         # Start microphone
         await websocket.send_text(json.dumps({"type": "control", "text": "start-mic"}))
 
-    async def _init_service_context(self, send_text: Callable, client_uid: str) -> ServiceContext:
+    async def _init_service_context(
+        self, send_text: Callable, client_uid: str, send_bytes: Callable = None
+    ) -> ServiceContext:
         """Initialize service context for a new session by cloning the default context"""
         session_service_context = ServiceContext()
         await session_service_context.load_cache(
@@ -187,13 +214,21 @@ class WebSocketHandler:
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
-            vad_engine=self.default_context_cache.vad_engine,
-            agent_engine=self.default_context_cache.agent_engine,
+            # Each session gets its own VAD stream state on top of the shared model
+            vad_engine=self.default_context_cache.vad_engine.new_session()
+            if self.default_context_cache.vad_engine
+            else None,
+            # Each session gets its own agent state on top of the shared LLM
+            agent_engine=self.default_context_cache.agent_engine.new_session()
+            if self.default_context_cache.agent_engine
+            else None,
             translate_engine=self.default_context_cache.translate_engine,
+            backchannel_bank=self.default_context_cache.backchannel_bank,
             mcp_server_registery=self.default_context_cache.mcp_server_registery,
             tool_adapter=self.default_context_cache.tool_adapter,
             send_text=send_text,
             client_uid=client_uid,
+            send_bytes=send_bytes,
         )
         return session_service_context
 
@@ -210,7 +245,15 @@ class WebSocketHandler:
         try:
             while True:
                 try:
-                    data = await websocket.receive_json()
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    if message.get("bytes") is not None:
+                        await self._handle_binary_message(
+                            websocket, client_uid, message["bytes"]
+                        )
+                        continue
+                    data = json.loads(message["text"])
                     message_handler.handle_message(client_uid, data)
                     await self._route_message(websocket, client_uid, data)
                 except WebSocketDisconnect:
@@ -232,6 +275,35 @@ class WebSocketHandler:
             logger.error(f"Fatal error in WebSocket communication: {e}")
             raise
 
+    async def _handle_binary_message(
+        self, websocket: WebSocket, client_uid: str, frame: bytes
+    ) -> None:
+        """
+        Handle a binary WebSocket message, a microphone audio frame
+
+        Clients that negotiated a sample format with `set-mic-format` send
+        `mic-audio-data` and `raw-audio-data` as binary frames, which are
+        routed like their JSON counterparts with the decoded samples as `audio`.
+
+        Args:
+            websocket: The WebSocket connection
+            client_uid: Client identifier
+            frame: The binary message, see `decode_mic_frame`
+        """
+        sample_format = self.client_contexts[client_uid].mic_sample_format
+        if sample_format is None:
+            logger.warning(f"Binary message from {client_uid} before set-mic-format")
+            return
+
+        header, samples = decode_mic_frame(frame, sample_format)
+        msg_type = header.get("type")
+        if msg_type not in ("mic-audio-data", "raw-audio-data"):
+            logger.warning(f"Unknown binary message type: {msg_type}")
+            return
+        await self._route_message(
+            websocket, client_uid, {"type": msg_type, "audio": samples}
+        )
+
     async def _route_message(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -295,8 +367,10 @@ class WebSocketHandler:
 
         # Clean up other client data
         self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        context = self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self.previous_raw_chunks.pop(client_uid, None)
+        self._discard_partial_transcription(client_uid)
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
             if task and not task.done():
@@ -304,7 +378,6 @@ class WebSocketHandler:
             self.current_conversation_tasks.pop(client_uid, None)
 
         # Call context close to clean up resources (e.g., MCPClient)
-        context = self.client_contexts.get(client_uid)
         if context:
             await context.close()
 
@@ -377,7 +450,9 @@ class WebSocketHandler:
     ) -> None:
         """Handle request for chat history list"""
         context = self.client_contexts[client_uid]
-        histories = get_history_list(context.character_config.conf_uid)
+        histories = await chat_history_service.get_history_list(
+            context.character_config.conf_uid
+        )
         await websocket.send_text(
             json.dumps({"type": "history-list", "histories": histories})
         )
@@ -385,29 +460,70 @@ class WebSocketHandler:
     async def _handle_fetch_history(
         self, websocket: WebSocket, client_uid: str, data: dict
     ):
-        """Handle fetching and setting specific chat history"""
+        """Handle fetching and setting specific chat history
+
+        Without a `limit` or `cursor` the whole history is sent at once. With a
+        `limit` the history is sent one page at a time, newest messages first;
+        the response carries a `next_cursor` to pass back as `cursor` for the
+        next (older) page, or null once the oldest message was sent. A `cursor`
+        without a `limit` gets pages of the default size. Agent memory is only
+        loaded for the first page.
+        """
         history_uid = data.get("history_uid")
         if not history_uid:
             return
 
         context = self.client_contexts[client_uid]
-        # Update history_uid in service context
-        context.history_uid = history_uid
-        context.agent_engine.set_memory_from_history(
-            conf_uid=context.character_config.conf_uid,
-            history_uid=history_uid,
-        )
+        conf_uid = context.character_config.conf_uid
+        limit = data.get("limit")
+        cursor = data.get("cursor")
+
+        if cursor is None:
+            # Update history_uid in service context
+            context.history_uid = history_uid
+            await context.agent_engine.async_set_memory_from_history(
+                conf_uid=conf_uid, history_uid=history_uid
+            )
+
+        if limit is None and cursor is None:
+            messages = [
+                msg
+                for msg in await chat_history_service.get_history(
+                    conf_uid, history_uid
+                )
+                if msg["role"] != "system"
+            ]
+            await websocket.send_text(
+                json.dumps({"type": "history-data", "messages": messages})
+            )
+            return
 
-        messages = [
-            msg
-            for msg in get_history(
-                context.character_config.conf_uid,
-                history_uid,
+        if limit is None:
+            limit = HISTORY_PAGE_SIZE
+        if (
+            not isinstance(limit, int)
+            or limit <= 0
+            or (cursor is not None and (not isinstance(cursor, int) or cursor < 0))
+        ):
+            await websocket.send_text(
+                json.dumps({"type": "error", "message": "Invalid history page request"})
             )
-            if msg["role"] != "system"
-        ]
+            return
+
+        page, next_cursor = await chat_history_service.get_history_page(
+            conf_uid, history_uid, cursor=cursor, limit=limit, include_system=False
+        )
         await websocket.send_text(
-            json.dumps({"type": "history-data", "messages": messages})
+            json.dumps(
+                {
+                    "type": "history-data",
+                    "history_uid": history_uid,
+                    "messages": page,
+                    "cursor": cursor,
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None,
+                }
+            )
         )
 
     async def _handle_create_history(
@@ -415,12 +531,13 @@ class WebSocketHandler:
     ) -> None:
         """Handle creation of new chat history"""
         context = self.client_contexts[client_uid]
-        history_uid = create_new_history(context.character_config.conf_uid)
+        history_uid = await chat_history_service.create_new_history(
+            context.character_config.conf_uid
+        )
         if history_uid:
             context.history_uid = history_uid
-            context.agent_engine.set_memory_from_history(
-                conf_uid=context.character_config.conf_uid,
-                history_uid=history_uid,
+            await context.agent_engine.async_set_memory_from_history(
+                conf_uid=context.character_config.conf_uid, history_uid=history_uid
             )
             await websocket.send_text(
                 json.dumps(
@@ -440,7 +557,7 @@ class WebSocketHandler:
             return
 
         context = self.client_contexts[client_uid]
-        success = delete_history(
+        success = await chat_history_service.delete_history(
             context.character_config.conf_uid,
             history_uid,
         )
@@ -461,11 +578,34 @@ class WebSocketHandler:
     ) -> None:
         """Handle incoming audio data"""
         audio_data = data.get("audio", [])
-        if audio_data:
-            self.received_data_buffers[client_uid] = np.append(
-                self.received_data_buffers[client_uid],
-                np.array(audio_data, dtype=np.float32),
-            )
+        if len(audio_data):
+            audio_data = np.asarray(audio_data, dtype=np.float32)
+            self.received_data_buffers[client_uid].append(audio_data)
+
+            transcriber = self.partial_transcribers.get(client_uid)
+            # A closed transcriber belongs to an utterance that has ended
+            if transcriber is None or transcriber.closed:
+                transcriber = self._start_partial_transcription(websocket, client_uid)
+            if transcriber:
+                transcriber.feed(audio_data)
+
+    def _start_partial_transcription(
+        self, websocket: WebSocket, client_uid: str
+    ) -> Optional[PartialTranscriber]:
+        """Start transcribing a new utterance, if the ASR engine can stream"""
+        self._discard_partial_transcription(client_uid)
+        transcriber = PartialTranscriber.start(
+            self.client_contexts[client_uid].asr_engine, websocket.send_text
+        )
+        if transcriber:
+            self.partial_transcribers[client_uid] = transcriber
+        return transcriber
+
+    def _discard_partial_transcription(self, client_uid: str) -> None:
+        """Stop transcribing an utterance that will not be used"""
+        transcriber = self.partial_transcribers.pop(client_uid, None)
+        if transcriber:
+            transcriber.cancel()
 
     async def _handle_raw_audio_data(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
@@ -473,24 +613,45 @@ class WebSocketHandler:
         """Handle incoming raw audio data for VAD processing"""
         context = self.client_contexts[client_uid]
         chunk = data.get("audio", [])
-        if chunk:
+        if len(chunk):
+            chunk = np.asarray(chunk, dtype=np.float32)
+            transcriber = self.partial_transcribers.get(client_uid)
+            speech_ended = segment_received = False
             for audio_bytes in context.vad_engine.detect_speech(chunk):
                 if audio_bytes == b"<|PAUSE|>":
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "interrupt"})
                     )
+                    # Transcribe from the previous chunk on, the VAD reports
+                    # speech a few windows after it started
+                    transcriber = self._start_partial_transcription(
+                        websocket, client_uid
+                    )
+                    if transcriber and client_uid in self.previous_raw_chunks:
+                        transcriber.feed(self.previous_raw_chunks[client_uid])
+                    speech_ended = segment_received = False
                 elif audio_bytes == b"<|RESUME|>":
-                    pass
+                    speech_ended = True
                 elif len(audio_bytes) > 1024:
                     # Detected audio activity (voice)
-                    self.received_data_buffers[client_uid] = np.append(
-                        self.received_data_buffers[client_uid],
-                        np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32),
+                    self.received_data_buffers[client_uid].append(
+                        np.frombuffer(audio_bytes, dtype=np.int16)
                     )
+                    segment_received = True
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "mic-audio-end"})
                     )
 
+            if transcriber:
+                transcriber.feed(chunk)
+                if segment_received:
+                    # Kept for mic-audio-end, which finishes the transcription
+                    transcriber.close()
+                elif speech_ended:
+                    # Too short to be an utterance
+                    self._discard_partial_transcription(client_uid)
+            self.previous_raw_chunks[client_uid] = chunk
+
     async def _handle_conversation_trigger(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -505,6 +666,7 @@ class WebSocketHandler:
             client_connections=self.client_connections,
             chat_group_manager=self.chat_group_manager,
             received_data_buffers=self.received_data_buffers,
+            partial_transcribers=self.partial_transcribers,
             current_conversation_tasks=self.current_conversation_tasks,
             broadcast_to_group=self.broadcast_to_group,
         )
@@ -591,3 +753,65 @@ class WebSocketHandler:
             await websocket.send_json({"type": "heartbeat-ack"})
         except Exception as e:
             logger.error(f"Error sending heartbeat acknowledgment: {e}")
+
+    async def _handle_set_audio_format(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """Handle negotiation of how audio is sent to the client
+
+        The client asks for a transport ("json" or "binary") and a codec
+        ("wav", "pcm" or "opus"), which defaults to `audio_codec` of the system
+        config. The server answers with an `audio-format` message holding the
+        format it will use from now on, which falls back to the legacy JSON
+        format for anything it does not support.
+        """
+        context = self.client_contexts[client_uid]
+        default_format = context.negotiated_audio_format()
+        transport = data.get("transport", "json")
+        codec = data.get("codec", default_format.codec)
+
+        supported_codecs = {"json": ["wav", "opus"], "binary": ["pcm", "wav", "opus"]}
+        if codec == "opus" and not opus_available():
+            logger.warning(f"Opus requested by {client_uid}, but cannot be encoded")
+            codec = None
+        if codec not in supported_codecs.get(transport, []):
+            logger.warning(
+                f"Unsupported audio format {transport}/{codec} requested by "
+                f"{client_uid}, using json/wav"
+            )
+            transport, codec = "json", "wav"
+
+        context.audio_stream_format = AudioStreamFormat(
+            transport=transport,
+            codec=codec,
+            bitrate_kbps=default_format.bitrate_kbps,
+        )
+        await websocket.send_text(
+            json.dumps({"type": "audio-format", "transport": transport, "codec": codec})
+        )
+
+    async def _handle_set_mic_format(
+        self, websocket: WebSocket, client_uid: str, data: WSMessage
+    ) -> None:
+        """Handle negotiation of how the client sends microphone audio
+
+        Microphone audio arrives as JSON float arrays in `mic-audio-data` and
+        `raw-audio-data` messages. After connecting, a client can ask for a
+        `sample_format` ("int16" or "float32") to send the same audio as
+        binary frames of little-endian PCM instead, see `decode_mic_frame`.
+        The server answers with a `mic-format` message holding the sample
+        format it accepted, or null if the client has to keep sending JSON.
+        """
+        context = self.client_contexts[client_uid]
+        sample_format = data.get("sample_format")
+        if sample_format not in MIC_SAMPLE_FORMATS:
+            logger.warning(
+                f"Unsupported microphone sample format {sample_format} requested "
+                f"by {client_uid}, using JSON"
+            )
+            sample_format = None
+
+        context.mic_sample_format = sample_format
+        await websocket.send_text(
+            json.dumps({"type": "mic-format", "sample_format": sample_format})
+        )
@@ -3,8 +3,9 @@ const recorder = new AudioRecorder();
 
 // Audio context and buffers
 let audioContext = null;
+// Decoded audio of the current TTS request, in the order the frames arrived
 let audioBuffers = [];
-let pendingAudioPaths = new Set();
+let currentRequestId = null;
 let currentAudioPath = null;
 let ws = null;
 
@@ -115,6 +116,7 @@ stopRecordingBtn.addEventListener('click', async () => {
 function connectWebSocket() {
     const wsProtocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
     ws = new WebSocket(`${wsProtocol}://${window.location.host}/tts-ws`);
+    ws.binaryType = 'arraybuffer';
     
     ws.onopen = () => {
         console.log('WebSocket connected');
@@ -131,48 +133,40 @@ function connectWebSocket() {
     };
 
     ws.onmessage = async (event) => {
-        const response = JSON.parse(event.data);
-        
-        if (response.status === 'partial') {
+        if (event.data instanceof ArrayBuffer) {
+            // Binary audio frame: 4 byte header length, JSON header, audio bytes
+            const view = new DataView(event.data);
+            const headerLength = view.getUint32(0);
+            const header = JSON.parse(
+                new TextDecoder().decode(new Uint8Array(event.data, 4, headerLength))
+            );
+            if (header.request_id !== currentRequestId || !header.audio_format) {
+                return;
+            }
             ttsStatus.textContent = 'Generating audio...';
             ttsStatus.className = 'status';
-            
+
+            const audioBytes = event.data.slice(4 + headerLength);
+            // Frames arrive in order, decoding may finish out of order
+            audioBuffers.push(audioContext.decodeAudioData(audioBytes));
+            return;
+        }
+
+        const response = JSON.parse(event.data);
+        if (response.request_id !== currentRequestId) {
+            return;
+        }
+
+        if (response.status === 'complete') {
             try {
-                const audioPath = response.audioPath.split('/').pop();
-                pendingAudioPaths.add(audioPath);
-                
-                if (audioContext.state === 'suspended') {
-                    await audioContext.resume();
-                }
-                
-                // Use retry mechanism for fetching audio
-                const audioResponse = await fetchWithRetry(`${API_BASE_URL}/cache/${audioPath}`);
-                const arrayBuffer = await audioResponse.arrayBuffer();
-                
-                if (arrayBuffer.byteLength === 0) {
-                    throw new Error('Empty audio data received');
+                const decodedBuffers = await Promise.all(audioBuffers);
+                if (decodedBuffers.length === 0) {
+                    throw new Error('No audio received');
                 }
-                
-                const audioBuffer = await audioContext.decodeAudioData(arrayBuffer);
-                audioBuffers.push(audioBuffer);
-                pendingAudioPaths.delete(audioPath);
-            } catch (error) {
-                console.error('Error loading audio:', error);
-                ttsStatus.textContent = 'Error loading audio: ' + error.message;
-                ttsStatus.className = 'status error';
-                pendingAudioPaths.clear();
-            }
-        } else if (response.status === 'complete') {
-            // Wait for any pending audio loads to complete
-            if (pendingAudioPaths.size > 0) {
-                ttsStatus.textContent = 'Finalizing audio...';
-                await new Promise(resolve => setTimeout(resolve, 500));
-            }
 
-            try {
                 // Combine all audio buffers
                 const targetSampleRate = 16000;
-                const totalLength = audioBuffers.reduce((acc, buffer) => {
+                const totalLength = decodedBuffers.reduce((acc, buffer) => {
                     // Calculate resampled length if needed
                     const ratio = targetSampleRate / buffer.sampleRate;
                     return acc + Math.ceil(buffer.length * ratio);
@@ -185,7 +179,7 @@ function connectWebSocket() {
                 );
                 
                 let offset = 0;
-                for (const buffer of audioBuffers) {
+                for (const buffer of decodedBuffers) {
                     // Resample if needed
                     let channelData = buffer.getChannelData(0);
                     if (buffer.sampleRate !== targetSampleRate) {
@@ -216,13 +210,13 @@ function connectWebSocket() {
             } finally {
                 // Clear buffers
                 audioBuffers = [];
-                pendingAudioPaths.clear();
+                currentRequestId = null;
             }
         } else if (response.status === 'error') {
             ttsStatus.textContent = 'Error: ' + response.message;
             ttsStatus.className = 'status error';
             audioBuffers = [];
-            pendingAudioPaths.clear();
+            currentRequestId = null;
         }
     };
 
@@ -234,7 +228,7 @@ function connectWebSocket() {
         
         // Clean up any pending audio resources
         audioBuffers = [];
-        pendingAudioPaths.clear();
+        currentRequestId = null;
         if (currentAudioPath) {
             URL.revokeObjectURL(currentAudioPath);
             currentAudioPath = null;
@@ -250,7 +244,7 @@ function connectWebSocket() {
         
         // Clean up audio resources on error
         audioBuffers = [];
-        pendingAudioPaths.clear();
+        currentRequestId = null;
         if (currentAudioPath) {
             URL.revokeObjectURL(currentAudioPath);
             currentAudioPath = null;
@@ -341,7 +335,13 @@ generateSpeechBtn.addEventListener('click', () => {
     }
 
     if (ws && ws.readyState === WebSocket.OPEN) {
-        ws.send(JSON.stringify({ text }));
+        // Stop an earlier, unfinished request, its audio is ignored from now on
+        if (currentRequestId) {
+            ws.send(JSON.stringify({ type: 'cancel', request_id: currentRequestId }));
+        }
+        currentRequestId = `tts-${Date.now()}`;
+        audioBuffers = [];
+        ws.send(JSON.stringify({ text, request_id: currentRequestId, codec: 'wav' }));
         ttsStatus.textContent = 'Generating audio...';
         ttsStatus.className = 'status';
     } else {
@@ -376,23 +376,7 @@ window.addEventListener('beforeunload', () => {
     }
     // Clear any pending audio buffers
     audioBuffers = [];
-    pendingAudioPaths.clear();
 });
 
 // Initialize WebSocket connection
 connectWebSocket();
-
-async function fetchWithRetry(url, maxRetries = 3, retryDelay = 1000) {
-    for (let i = 0; i < maxRetries; i++) {
-        try {
-            const response = await fetch(url);
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return response;
-        } catch (error) {
-            if (i === maxRetries - 1) throw error;
-            await new Promise(resolve => setTimeout(resolve, retryDelay));
-        }
-    }
-}
\ No newline at end of file